@@ -0,0 +1 @@
+"""Cálculos del análisis de fútbol que no dependen de Streamlit."""
@@ -0,0 +1,205 @@
+"""Consultas del análisis desde la línea de comandos, sin Streamlit.
+
+Ejemplos (desde la raíz del proyecto):
+
+    python -m analytics historico --desde 1990 --hasta 2010
+    python -m analytics equipo Ecuador
+    python -m analytics torneos "FIFA World Cup" "Copa América"
+    python -m analytics continentes Sudamérica Europa --torneo "FIFA World Cup qualification"
+    python -m analytics primer-gol --continente Europa
+    python -m analytics penales --por decade --csv
+    python -m analytics minutos --equipo Brazil --ancho 15
+    python -m analytics tiempos --log logs/render.jsonl
+"""
+import argparse
+import difflib
+import sys
+
+import pandas as pd
+
+from analytics.first_goal import first_goal_by_continent, first_goal_by_team, first_goal_years
+from analytics.goal_minutes import goal_minute_distribution
+from analytics.historical import historical_periods, historical_summary
+from analytics.instrumentation import LOG_PATH, summarize_log
+from analytics.loading import build_bundle, memory_report
+from analytics.rankings import MIN_PARTIDOS_TORNEO, best_teams
+from analytics.shootouts import DESGLOSES, shootout_breakdown
+from analytics.team_profile import team_periods, team_record, top_rivals
+from analytics.tournaments import tournament_stats
+
+
+def _periodo(args, años):
+    return (args.desde if args.desde is not None else int(años.min()),
+            args.hasta if args.hasta is not None else int(años.max()))
+
+
+def _historico(datos, args):
+    start_year, end_year = _periodo(args, historical_periods(datos.years))
+    resumen = historical_summary(datos.years, start_year, end_year)
+    generales = pd.Series({
+        'partidos': resumen['partidos'],
+        'promedio_goles': round(resumen['promedio_goles'], 2),
+        'pct_victorias_local': round(resumen['pct_victorias_local'], 1),
+        'marcador_mas_comun': '%d-%d' % resumen['marcador_mas_comun'],
+    })
+    return [generales.to_frame('valor'), resumen['por_año']]
+
+
+def _equipo(datos, args):
+    start_year, end_year = _periodo(args, team_periods(datos.years))
+    record = team_record(datos.team_matches, args.nombre, start_year, end_year)
+    resultados = pd.DataFrame({'local': record['local'], 'visitante': record['visitante']})
+    return [resultados, top_rivals(datos.team_matches, args.nombre, start_year, end_year, args.top)]
+
+
+def _torneos(datos, args):
+    return [tournament_stats(datos.aggregates['tournament_year'], args.torneos).set_index('Torneo')]
+
+
+def _continentes(datos, args):
+    continents = datos.continents
+    tablas = [pd.DataFrame({c: continents.summary(c, args.torneo) for c in args.continentes})]
+    for continente in args.continentes:
+        miembros = continents.mask(continents.membership, continente)
+        for lado in ('local', 'visitante'):
+            mejores = best_teams(datos.team_matches, lado, miembros, args.min_partidos, args.top, args.torneo)
+            tablas.append(mejores.assign(continente=continente, lado=lado))
+    return tablas
+
+
+def _primer_gol(datos, args):
+    if args.equipo is not None:
+        resultados = first_goal_by_team(datos, args.equipo)
+        return [] if resultados is None else list(resultados)
+    start_year, end_year = _periodo(args, pd.Index(first_goal_years(datos)))
+    return list(first_goal_by_continent(datos, args.continente, start_year, end_year))
+
+
+def _penales(datos, args):
+    return [shootout_breakdown(datos, args.por, args.bootstrap)]
+
+
+def _minutos(datos, args):
+    lado = {'local': True, 'visitante': False}.get(args.lado)
+    penal, en_contra = {
+        None: (None, None), 'jugada': (False, False), 'penal': (True, None), 'en-contra': (None, True),
+    }[args.tipo]
+    return [goal_minute_distribution(datos, args.equipo, args.torneo, args.decada, lado,
+                                     penal, en_contra, args.ancho)]
+
+
+def _memoria(datos, args):
+    return [memory_report(datos)]
+
+
+def _tiempos(datos, args):
+    return [summarize_log(args.log)]
+
+
+# Argumentos que nombran un equipo, torneo o continente -> tipo de nombre
+_NOMBRES = {
+    'nombre': 'equipo', 'equipo': 'equipo',
+    'torneo': 'torneo', 'torneos': 'torneo',
+    'continente': 'continente', 'continentes': 'continente',
+}
+
+
+def _validar_nombres(parser, datos, args):
+    """Termina con un error de argparse si algún nombre no existe en los datos."""
+    validos = {
+        'equipo': list(datos.teams),
+        'torneo': list(datos.results['tournament'].cat.categories),
+        'continente': list(datos.continents.names),
+    }
+    for argumento, tipo in _NOMBRES.items():
+        valor = getattr(args, argumento, None)
+        if valor is None:
+            continue
+        for nombre in ([valor] if isinstance(valor, str) else valor):
+            if nombre in validos[tipo]:
+                continue
+            parecidos = difflib.get_close_matches(nombre, validos[tipo], n=3)
+            sugerencia = f" (¿quisiste decir {', '.join(repr(p) for p in parecidos)}?)" if parecidos else ""
+            parser.error(f"{tipo} desconocido: {nombre!r}{sugerencia}")
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog='python -m analytics', description=__doc__.splitlines()[0])
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument('--csv', action='store_true', help='imprimir las tablas en CSV')
+
+    def comando(nombre, ayuda):
+        return comandos.add_parser(nombre, help=ayuda, parents=[comun])
+
+    def periodo(sub):
+        sub.add_argument('--desde', type=int)
+        sub.add_argument('--hasta', type=int)
+
+    sub = comando('historico', 'métricas generales y partidos por año')
+    periodo(sub)
+    sub.set_defaults(f=_historico)
+
+    sub = comando('equipo', 'récord de un equipo y sus rivales más frecuentes')
+    sub.add_argument('nombre')
+    sub.add_argument('--top', type=int, default=10)
+    periodo(sub)
+    sub.set_defaults(f=_equipo)
+
+    sub = comando('torneos', 'estadísticas de goles por torneo')
+    sub.add_argument('torneos', nargs='+')
+    sub.set_defaults(f=_torneos)
+
+    sub = comando('continentes', 'comparativa de continentes en un torneo')
+    sub.add_argument('continentes', nargs='+')
+    sub.add_argument('--torneo', required=True)
+    sub.add_argument('--min-partidos', type=int, default=MIN_PARTIDOS_TORNEO)
+    sub.add_argument('--top', type=int, default=1)
+    sub.set_defaults(f=_continentes)
+
+    sub = comando('primer-gol', 'resultado de quien marca primero')
+    grupo = sub.add_mutually_exclusive_group(required=True)
+    grupo.add_argument('--continente')
+    grupo.add_argument('--equipo')
+    periodo(sub)
+    sub.set_defaults(f=_primer_gol)
+
+    sub = comando('penales', 'ventaja de tirar primero en las tandas')
+    sub.add_argument('--por', choices=DESGLOSES, default='continent')
+    sub.add_argument('--bootstrap', type=int, default=1000)
+    sub.set_defaults(f=_penales)
+
+    sub = comando('minutos', 'distribución de los goles por minuto')
+    sub.add_argument('--equipo')
+    sub.add_argument('--torneo')
+    sub.add_argument('--decada', type=int)
+    sub.add_argument('--lado', choices=['local', 'visitante'])
+    sub.add_argument('--tipo', choices=['jugada', 'penal', 'en-contra'])
+    sub.add_argument('--ancho', type=int, default=5)
+    sub.set_defaults(f=_minutos)
+
+    sub = comando('memoria', 'memoria ocupada por cada dataset')
+    sub.set_defaults(f=_memoria)
+
+    sub = comando('tiempos', 'resumen del log de tiempos y cachés de la app')
+    sub.add_argument('--log', default=LOG_PATH)
+    sub.set_defaults(f=_tiempos, sin_datos=True)
+    return parser
+
+
+def main(argv=None):
+    parser = _parser()
+    args = parser.parse_args(argv)
+    datos = None if getattr(args, 'sin_datos', False) else build_bundle()
+    if datos is not None:
+        _validar_nombres(parser, datos, args)
+    for tabla in args.f(datos, args):
+        if args.csv:
+            tabla.to_csv(sys.stdout)
+        else:
+            print(tabla.to_string())
+        print()
+
+
+if __name__ == '__main__':
+    main()
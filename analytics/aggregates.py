@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from analytics.scorelines import tournament_group
+
+RESULTADOS = ['Victoria Local', 'Empate', 'Victoria Visitante']
+
+# Columnas de agregados que se combinan con el máximo en lugar de sumarse
+_MAXIMOS = {'tournament_year': ['max_goles']}
+
+
+def scoreline_cells(results):
+    """Partidos por (year, grupo de torneo, neutral, home_score, away_score).
+
+    Es la forma dispersa del tensor de marcadores (ver analytics.scorelines).
+    """
+    torneos = results['tournament'].cat.categories
+    grupos = pd.Series([tournament_group(t) for t in torneos], dtype=object)
+    tabla = pd.DataFrame({
+        'year': results['year'].to_numpy(),
+        'grupo': grupos.to_numpy()[results['tournament'].cat.codes.to_numpy()],
+        'neutral': results['neutral'].to_numpy(),
+        'home_score': results['home_score'].to_numpy(),
+        'away_score': results['away_score'].to_numpy(),
+    })
+    return tabla.groupby(list(tabla.columns)).size().rename('partidos').to_frame()
+
+
+def per_team_year(results):
+    """Partidos, V/E/D y goles a favor y en contra por equipo y año.
+
+    Indexado por (team, year) con el equipo como texto; alimenta la parte
+    por equipo del cubo por año (ver analytics.year_cube). Se agrupa por
+    códigos enteros para no materializar un texto por fila.
+    """
+    local, visitante = results['home_team'].cat, results['away_team'].cat
+    nombres = local.categories.union(visitante.categories)
+    equipo = np.concatenate([nombres.get_indexer(local.categories)[local.codes.to_numpy()],
+                             nombres.get_indexer(visitante.categories)[visitante.codes.to_numpy()]])
+    años = np.tile(results['year'].to_numpy().astype(np.int64), 2)
+    primer_año = int(años.min()) if len(años) else 0
+    n_años = int(años.max()) - primer_año + 1 if len(años) else 1
+    celdas, inversa = np.unique(equipo * n_años + (años - primer_año), return_inverse=True)
+
+    goles_local = results['home_score'].to_numpy().astype(np.int64)
+    goles_visitante = results['away_score'].to_numpy().astype(np.int64)
+    goles = np.concatenate([goles_local, goles_visitante])
+    contra = np.concatenate([goles_visitante, goles_local])
+    valores = {
+        'partidos': None,
+        'victorias': goles > contra,
+        'empates': goles == contra,
+        'derrotas': goles < contra,
+        'goles': goles,
+        'goles_contra': contra,
+    }
+    indice = pd.MultiIndex.from_arrays([nombres[celdas // n_años], celdas % n_años + primer_año],
+                                       names=['team', 'year'])
+    return pd.DataFrame({m: np.bincount(inversa, weights=v, minlength=len(celdas)).astype(np.int64)
+                         for m, v in valores.items()}, index=indice)
+
+
+def per_tournament_year(results):
+    """Partidos, goles, máximo de goles, porterías imbatidas y resultados por torneo y año.
+
+    Indexado por (tournament, year) con el torneo como texto. Porterías
+    imbatidas cuenta los partidos en que al menos un equipo no recibió goles.
+    """
+    local = results['home_score'].to_numpy().astype(np.int64)
+    visitante = results['away_score'].to_numpy().astype(np.int64)
+    resultado = results['resultado'].astype(str).to_numpy()
+    tabla = pd.DataFrame({
+        'tournament': results['tournament'].astype(str).to_numpy(),
+        'year': results['year'].to_numpy(),
+        'partidos': 1,
+        'goles': local + visitante,
+        'max_goles': local + visitante,
+        'porterias_imbatidas': ((local == 0) | (visitante == 0)).astype(np.int64),
+        **{r: (resultado == r).astype(np.int64) for r in RESULTADOS},
+    })
+    columnas = {c: 'sum' for c in tabla.columns[2:]}
+    columnas['max_goles'] = 'max'
+    return tabla.groupby(['tournament', 'year']).agg(columnas).astype(np.int64)
+
+
+def per_tournament_goals(results):
+    """Cantidad de partidos por torneo y goles totales del partido."""
+    goles = results['home_score'].to_numpy().astype(np.int64) + results['away_score'].to_numpy()
+    tabla = pd.DataFrame({'tournament': results['tournament'].astype(str).to_numpy(), 'goles': goles})
+    return tabla.groupby(['tournament', 'goles']).size().rename('partidos').to_frame()
+
+
+def results_aggregates(results):
+    """Agregados derivados de results que se mantienen de forma incremental.
+
+    scoreline_cells alimenta el tensor de marcadores (goal_patterns) y,
+    junto con team_year, el cubo por año (resultados históricos y equipos);
+    tournament_year y tournament_goals la comparativa de torneos.
+    """
+    return {
+        'scoreline_cells': scoreline_cells(results),
+        'team_year': per_team_year(results),
+        'tournament_year': per_tournament_year(results),
+        'tournament_goals': per_tournament_goals(results),
+    }
+
+
+def merge_aggregates(viejos, nuevos):
+    """Suma los agregados de las filas nuevas a los ya guardados.
+
+    Las tablas son conteos o sumas, así que el delta se aplica sumando
+    alineado por índice; las claves nuevas (un torneo o un año nuevo) se
+    agregan. Las columnas de _MAXIMOS se combinan con el máximo.
+    """
+    combinados = {}
+    for nombre in viejos:
+        tabla = viejos[nombre].add(nuevos[nombre], fill_value=0)
+        for columna in _MAXIMOS.get(nombre, []):
+            tabla[columna] = pd.concat([viejos[nombre][columna], nuevos[nombre][columna]], axis=1).max(axis=1)
+        combinados[nombre] = tabla.astype(np.int64)
+    return combinados
@@ -0,0 +1,119 @@
+import numpy as np
+
+# Máximo de puntos individuales que se envían por caja
+MAX_PUNTOS = 500
+
+# Con más valores distintos que esto, los estratos de la muestra son bins por cuantiles
+_MAX_ESTRATOS = 50
+
+
+def stratified_sample(valores, max_puntos=MAX_PUNTOS, seed=0):
+    """Muestra de a lo sumo ~`max_puntos` valores, estratificada por valor.
+
+    Cada estrato (cada valor distinto, o un bin por cuantiles si hay muchos)
+    aporta en proporción a su tamaño y al menos un punto, así que los valores
+    raros, como las goleadas, siempre aparecen. Si hay pocos valores se
+    devuelven todos.
+    """
+    valores = np.asarray(valores)
+    if len(valores) <= max_puntos:
+        return valores
+    distintos = np.unique(valores)
+    if len(distintos) <= _MAX_ESTRATOS:
+        estrato = np.searchsorted(distintos, valores)
+    else:
+        bordes = np.quantile(valores, np.linspace(0, 1, _MAX_ESTRATOS + 1)[1:-1])
+        estrato = np.searchsorted(bordes, valores, side='right')
+    n_estratos = estrato.max() + 1
+    tamaños = np.bincount(estrato, minlength=n_estratos)
+    cuotas = np.maximum(np.floor(tamaños * max_puntos / len(valores)), 1).astype(np.int64)
+    cuotas = np.minimum(cuotas, tamaños)
+
+    rng = np.random.default_rng(seed)
+    # Orden aleatorio dentro de cada estrato y se toman los primeros `cuota`
+    orden = np.lexsort((rng.random(len(valores)), estrato))
+    posicion = np.arange(len(valores)) - np.repeat(np.cumsum(tamaños) - tamaños, tamaños)
+    elegidos = orden[posicion < np.repeat(cuotas, tamaños)]
+    return valores[np.sort(elegidos)]
+
+
+def box_summary(valores, max_puntos=MAX_PUNTOS, seed=0):
+    """Resumen de un box plot calculado en el servidor.
+
+    Cuartiles con interpolación lineal y bigotes hasta el dato más extremo
+    dentro de 1.5 IQR (igual que Plotly). Los atípicos se agrupan por valor
+    (valores y conteos) y `muestra` es una muestra estratificada acotada.
+    Devuelve None si no hay valores.
+    """
+    originales = np.asarray(valores)
+    validos = ~np.isnan(originales.astype(np.float64))
+    valores = originales[validos].astype(np.float64)
+    if len(valores) == 0:
+        return None
+    q1, mediana, q3 = np.percentile(valores, [25, 50, 75])
+    rango = q3 - q1
+    dentro = valores[(valores >= q1 - 1.5 * rango) & (valores <= q3 + 1.5 * rango)]
+    bigote_inf, bigote_sup = dentro.min(), dentro.max()
+    atipicos, conteos = np.unique(valores[(valores < bigote_inf) | (valores > bigote_sup)],
+                                  return_counts=True)
+    return {
+        'n': len(valores),
+        'q1': q1,
+        'mediana': mediana,
+        'q3': q3,
+        'media': valores.mean(),
+        'bigote_inf': bigote_inf,
+        'bigote_sup': bigote_sup,
+        'atipicos': atipicos,
+        'conteo_atipicos': conteos,
+        'muestra': stratified_sample(originales[validos], max_puntos, seed),
+    }
+
+
+def _percentiles_ponderados(valores, conteos, qs):
+    """Percentiles (interpolación lineal, como np.percentile) de `valores` repetidos `conteos` veces."""
+    acumulado = np.cumsum(conteos)
+    posiciones = np.asarray(qs) / 100 * (acumulado[-1] - 1)
+    bajo = valores[np.searchsorted(acumulado, np.floor(posiciones), side='right')]
+    alto = valores[np.searchsorted(acumulado, np.ceil(posiciones), side='right')]
+    return bajo + (alto - bajo) * (posiciones - np.floor(posiciones))
+
+
+def box_summary_counts(valores, conteos, max_puntos=MAX_PUNTOS):
+    """Lo mismo que box_summary pero a partir de un histograma (valor -> cantidad).
+
+    Da el mismo resumen que expandir el histograma y llamar a box_summary, sin
+    expandirlo: el costo depende de cuántos valores distintos hay y no de
+    cuántos partidos. La muestra toma de cada valor una cuota proporcional a
+    su cantidad (al menos uno).
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    conteos = np.asarray(conteos, dtype=np.int64)
+    orden = np.argsort(valores)
+    valores, conteos = valores[orden], conteos[orden]
+    presentes = conteos > 0
+    valores, conteos = valores[presentes], conteos[presentes]
+    n = conteos.sum()
+    if n == 0:
+        return None
+    q1, mediana, q3 = _percentiles_ponderados(valores, conteos, [25, 50, 75])
+    rango = q3 - q1
+    dentro = (valores >= q1 - 1.5 * rango) & (valores <= q3 + 1.5 * rango)
+    bigote_inf, bigote_sup = valores[dentro].min(), valores[dentro].max()
+    fuera = (valores < bigote_inf) | (valores > bigote_sup)
+    if n <= max_puntos:
+        cuotas = conteos
+    else:
+        cuotas = np.minimum(np.maximum(np.floor(conteos * max_puntos / n), 1).astype(np.int64), conteos)
+    return {
+        'n': int(n),
+        'q1': q1,
+        'mediana': mediana,
+        'q3': q3,
+        'media': (valores * conteos).sum() / n,
+        'bigote_inf': bigote_inf,
+        'bigote_sup': bigote_sup,
+        'atipicos': valores[fuera],
+        'conteo_atipicos': conteos[fuera],
+        'muestra': np.repeat(valores, cuotas),
+    }
@@ -0,0 +1,59 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from functools import wraps
+
+from analytics import instrumentation
+
+# Todas las funciones decoradas, para poder vaciar sus cachés juntas
+_MEMOIZADAS = []
+
+
+def memoize_per_data(maxsize=32, tabla=None):
+    """Memoiza `f(datos, *args)` con un LRU propio para cada objeto `datos`.
+
+    La caché vive mientras viva `datos` (se guarda con una referencia débil),
+    así que cuando se recargan los datos los resultados viejos se descartan
+    solos. `datos` debe poder referenciarse débilmente y ser hasheable por
+    identidad; los demás argumentos deben ser hasheables.
+
+    Dentro de una medición (ver analytics.instrumentation.medir) cada llamada
+    se anota como acierto o fallo de caché; `tabla` es el atributo de `datos`
+    cuyas filas se anotan como tamaño de la entrada cuando `datos` no es un
+    DataFrame.
+    """
+    def decorador(f):
+        cachés = weakref.WeakKeyDictionary()
+        lock = threading.Lock()
+
+        @wraps(f)
+        def wrapper(datos, *args):
+            with lock:
+                caché = cachés.setdefault(datos, OrderedDict())
+                if args in caché:
+                    caché.move_to_end(args)
+                    if instrumentation.activa():
+                        instrumentation.registrar(f.__qualname__, 'hit', 0.0)
+                    return caché[args]
+            inicio = time.perf_counter()
+            valor = f(datos, *args)
+            if instrumentation.activa():
+                instrumentation.registrar(f.__qualname__, 'miss', time.perf_counter() - inicio,
+                                          instrumentation.filas_de(datos, tabla), valor)
+            with lock:
+                caché[args] = valor
+                if len(caché) > maxsize:
+                    caché.popitem(last=False)
+            return valor
+
+        wrapper.cache_clear = lambda: cachés.clear()
+        _MEMOIZADAS.append(wrapper)
+        return wrapper
+    return decorador
+
+
+def clear_all_caches():
+    """Vacía la caché de todas las funciones memoizadas con memoize_per_data."""
+    for f in _MEMOIZADAS:
+        f.cache_clear()
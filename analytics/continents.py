@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_TORNEO = ['partidos', 'partidos_local', 'victorias_local', 'victorias_visitante', 'empates',
+                   'victorias_local_propias', 'victorias_visitante_propias', 'goles_favor']
+
+
+@dataclass(frozen=True, eq=False)
+class Continents:
+    """Pertenencia de cada equipo a los continentes y agregados por torneo.
+
+    Un país puede estar en más de un continente (Armenia, Chipre... figuran
+    en Europa y en Asia), por eso cada equipo guarda una máscara de bits:
+    el bit `c` indica que pertenece al continente `names[c]`.
+
+    `por_torneo` está indexado por (continente, torneo) y cuenta los partidos
+    del torneo con al menos un equipo del continente:
+    - partidos, victorias_local, victorias_visitante y empates: todos esos partidos.
+    - partidos_local: los que el continente jugó como local.
+    - victorias_*_propias y goles_favor: solo los del lado del continente.
+    """
+    names: pd.Index
+    membership: np.ndarray     # por código de equipo, bits de sus continentes
+    por_torneo: pd.DataFrame
+
+    def bit(self, nombre):
+        return np.uint8(1 << self.names.get_loc(nombre))
+
+    def of_teams(self, serie):
+        """Máscaras de continentes de una columna categórica de equipos (0 si no tiene)."""
+        return _de_equipos(self.membership, serie)
+
+    def mask(self, continentes, nombre):
+        """Filas cuya máscara de continentes incluye a `nombre`."""
+        return (continentes & self.bit(nombre)) != 0
+
+    def tournaments(self, nombre):
+        """Torneos en los que el continente jugó como local."""
+        tabla = self.por_torneo.loc[nombre]
+        return tabla.index[tabla['partidos_local'] > 0]
+
+    def common_tournaments(self, nombre1, nombre2):
+        """Torneos en los que ambos continentes jugaron como local, en orden alfabético."""
+        return sorted(set(self.tournaments(nombre1)) & set(self.tournaments(nombre2)))
+
+    def summary(self, nombre, torneo):
+        """Fila de `por_torneo` del continente en el torneo (ceros si no jugó)."""
+        try:
+            return self.por_torneo.loc[(nombre, torneo)]
+        except KeyError:
+            return pd.Series(0, index=COLUMNAS_TORNEO)
+
+
+def _de_equipos(membership, serie):
+    # El código -1 (sin equipo) cae en el 0 agregado al final
+    return np.append(membership, np.uint8(0))[serie.cat.codes.to_numpy()]
+
+
+def _membership(countries, n_equipos, names):
+    """Máscara de bits por código de equipo a partir de countries."""
+    membership = np.zeros(n_equipos, dtype=np.uint8)
+    equipo = countries['country'].cat.codes.to_numpy()
+    bits = np.left_shift(1, names.get_indexer(countries['continent'])).astype(np.uint8)
+    validos = equipo >= 0
+    np.bitwise_or.at(membership, equipo[validos], bits[validos])
+    return membership
+
+
+def _por_torneo(results, names):
+    """Agregados (continente, torneo) con un bincount por métrica y continente."""
+    torneos = results['tournament'].cat.categories
+    torneo = results['tournament'].cat.codes.to_numpy().astype(np.int64)
+    local = results['home_continents'].to_numpy()
+    visitante = results['away_continents'].to_numpy()
+    gl = results['home_score'].to_numpy().astype(np.int64)
+    gv = results['away_score'].to_numpy().astype(np.int64)
+    gana_local, gana_visitante, empate = gl > gv, gv > gl, gl == gv
+
+    def contar(mascara, pesos=None):
+        return np.bincount(torneo[mascara], weights=None if pesos is None else pesos[mascara],
+                           minlength=len(torneos)).astype(np.int64)
+
+    bloques = []
+    for c in range(len(names)):
+        es_local = (local & (1 << c)) != 0
+        es_visitante = (visitante & (1 << c)) != 0
+        juega = es_local | es_visitante
+        bloques.append(pd.DataFrame({
+            'partidos': contar(juega),
+            'partidos_local': contar(es_local),
+            'victorias_local': contar(juega & gana_local),
+            'victorias_visitante': contar(juega & gana_visitante),
+            'empates': contar(juega & empate),
+            'victorias_local_propias': contar(es_local & gana_local),
+            'victorias_visitante_propias': contar(es_visitante & gana_visitante),
+            'goles_favor': contar(es_local, gl) + contar(es_visitante, gv),
+        }, index=torneos, columns=COLUMNAS_TORNEO))
+
+    tabla = pd.concat(bloques, keys=names, names=['continente', 'torneo'])
+    return tabla[tabla['partidos'] > 0]
+
+
+def add_continent_columns(results, countries, n_equipos):
+    """Agrega a results las máscaras de continentes del local y del visitante.
+
+    Devuelve el objeto Continents con los agregados por torneo ya calculados.
+    """
+    names = pd.Index(sorted(countries['continent'].dropna().unique()))
+    membership = _membership(countries, n_equipos, names)
+    results['home_continents'] = _de_equipos(membership, results['home_team'])
+    results['away_continents'] = _de_equipos(membership, results['away_team'])
+    return Continents(names=names, membership=membership, por_torneo=_por_torneo(results, names))
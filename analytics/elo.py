@@ -0,0 +1,242 @@
+import hashlib
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.cache import memoize_per_data
+from analytics.scorelines import tournament_group
+from analytics.snapshot import CACHE_DIR, _escribir_arrow, _escribir_meta, _leer_arrow, _leer_meta
+
+# Rating de un equipo antes de su primer partido
+ELO_INICIAL = 1500.0
+
+# Puntos que se suman al local (si no es sede neutral) al calcular el resultado esperado
+VENTAJA_LOCAL = 100.0
+
+# Factor K por grupo de torneo (ver analytics.scorelines.GRUPOS_TORNEO)
+K_POR_GRUPO = {
+    'Amistosos': 20,
+    'Mundial': 60,
+    'Eliminatorias Mundial': 40,
+    'Copas continentales': 50,
+    'Otras eliminatorias': 40,
+    'Nations League': 40,
+    'Otros torneos': 30,
+}
+
+# Subir este número cuando cambien los parámetros o la fórmula: invalida los checkpoints
+ELO_VERSION = 1
+
+# Columnas de results que definen el cálculo; su hash identifica lo ya procesado
+_COLUMNAS_HUELLA = ['date', 'home_team', 'away_team', 'home_score', 'away_score', 'tournament', 'neutral']
+
+
+@dataclass(frozen=True, eq=False)
+class EloRatings:
+    """Ratings Elo de todo el histórico.
+
+    `antes_local`, `antes_visitante` y `cambio` están alineados con las filas
+    de results: ratings de cada equipo antes del partido y puntos que ganó el
+    local (el visitante pierde los mismos). `por_año` es el checkpoint de fin
+    de cada año (año x equipo) y `actual` el rating tras el último partido.
+    """
+    antes_local: np.ndarray
+    antes_visitante: np.ndarray
+    cambio: np.ndarray
+    por_año: pd.DataFrame
+    actual: pd.Series
+
+
+def _huella(results, n):
+    """sha1 de las columnas que definen el Elo en las primeras `n` filas."""
+    hashes = pd.util.hash_pandas_object(results[_COLUMNAS_HUELLA].iloc[:n], index=False)
+    return hashlib.sha1(hashes.to_numpy().tobytes()).hexdigest()
+
+
+def _factores(results):
+    """K por el multiplicador de diferencia de goles y resultado real (1, 0.5 o 0) de cada partido."""
+    torneos = results['tournament'].cat.categories
+    k_torneo = np.array([K_POR_GRUPO[tournament_group(t)] for t in torneos], dtype=np.float64)
+    k = k_torneo[results['tournament'].cat.codes.to_numpy()]
+    diferencia = results['home_score'].to_numpy().astype(np.int64) - results['away_score'].to_numpy()
+    margen = np.abs(diferencia)
+    multiplicador = np.select([margen <= 1, margen == 2], [1.0, 1.5], (11 + margen) / 8)
+    return k * multiplicador, (np.sign(diferencia) + 1) / 2
+
+
+def _reproducir(results, orden, ratings, antes_local, antes_visitante, cambio):
+    """Aplica los partidos de `orden` (posiciones de results) sobre `ratings`.
+
+    Llena las tres salidas en esas posiciones y devuelve los ratings finales.
+    El recorrido es un bucle sobre listas de Python: cada partido depende de
+    los ratings que dejó el anterior, así que no se puede vectorizar.
+    """
+    kg, real = _factores(results.iloc[orden])
+    local = results['home_team'].cat.codes.to_numpy()[orden].tolist()
+    visitante = results['away_team'].cat.codes.to_numpy()[orden].tolist()
+    ventaja = np.where(results['neutral'].to_numpy()[orden], 0.0, VENTAJA_LOCAL).tolist()
+    ratings = ratings.tolist()
+    salida_local, salida_visitante, salida_cambio = [], [], []
+    for l, v, vent, f, w in zip(local, visitante, ventaja, kg.tolist(), real.tolist()):
+        rl, rv = ratings[l], ratings[v]
+        esperado = 1.0 / (10.0 ** ((rv - rl - vent) / 400.0) + 1.0)
+        delta = f * (w - esperado)
+        ratings[l] = rl + delta
+        ratings[v] = rv - delta
+        salida_local.append(rl)
+        salida_visitante.append(rv)
+        salida_cambio.append(delta)
+    antes_local[orden] = salida_local
+    antes_visitante[orden] = salida_visitante
+    cambio[orden] = salida_cambio
+    return np.array(ratings)
+
+
+def _ratings_por_año(results, orden, ratings, antes_local, antes_visitante, cambio):
+    """Checkpoints de fin de año de los partidos de `orden`, partiendo de `ratings`.
+
+    Como los partidos ya están calculados no hace falta recorrerlos de nuevo:
+    el checkpoint de cada año es el último rating de cada equipo que jugó
+    hasta ese año. Devuelve un dict año -> ratings por código de equipo.
+    """
+    despues = pd.DataFrame({
+        'year': np.tile(results['year'].to_numpy()[orden], 2),
+        'equipo': np.concatenate([results['home_team'].cat.codes.to_numpy()[orden],
+                                  results['away_team'].cat.codes.to_numpy()[orden]]),
+        'rating': np.concatenate([antes_local[orden] + cambio[orden], antes_visitante[orden] - cambio[orden]]),
+        'paso': np.tile(np.arange(len(orden)), 2),
+    }).sort_values('paso', kind='stable')
+    ultimos = despues.groupby(['year', 'equipo'])['rating'].last().unstack()
+    ultimos = ultimos.reindex(columns=range(len(ratings)))
+    tabla = pd.concat([pd.DataFrame([ratings]), ultimos]).ffill().iloc[1:]
+    return {int(año): fila for año, fila in zip(tabla.index, tabla.to_numpy())}
+
+
+def compute_elo(results, previo=None):
+    """Calcula el Elo de todos los partidos de results en orden de fecha.
+
+    Con `previo` (un EloRatings de las primeras filas de results, que solo
+    creció al final) se parte del checkpoint del último año completo anterior
+    a los partidos nuevos y solo se vuelve a calcular desde ahí.
+    """
+    teams = results['home_team'].cat.categories
+    n = len(results)
+    fechas = results['date'].to_numpy()
+    orden = np.argsort(fechas, kind='stable')
+    antes_local, antes_visitante, cambio = (np.zeros(n) for _ in range(3))
+    ratings = np.full(len(teams), ELO_INICIAL)
+    por_año = {}
+    inicio = 0
+
+    if previo is not None and len(previo.cambio) < n:
+        viejos = len(previo.cambio)
+        primer_año_nuevo = int(results['year'].to_numpy()[viejos:].min())
+        checkpoints = previo.por_año.loc[:primer_año_nuevo - 1]
+        if len(checkpoints):
+            años = results['year'].to_numpy()[orden]
+            inicio = int(np.searchsorted(años, checkpoints.index[-1], side='right'))
+            ratings = checkpoints.iloc[-1].to_numpy()
+            por_año = dict(zip(checkpoints.index, checkpoints.to_numpy()))
+            hechos = orden[:inicio]
+            antes_local[hechos] = previo.antes_local[hechos]
+            antes_visitante[hechos] = previo.antes_visitante[hechos]
+            cambio[hechos] = previo.cambio[hechos]
+
+    base = ratings.copy()
+    final = _reproducir(results, orden[inicio:], ratings, antes_local, antes_visitante, cambio)
+    por_año.update(_ratings_por_año(results, orden[inicio:], base, antes_local, antes_visitante, cambio))
+    return EloRatings(
+        antes_local=antes_local,
+        antes_visitante=antes_visitante,
+        cambio=cambio,
+        por_año=pd.DataFrame.from_dict(por_año, orient='index', columns=teams).rename_axis('year'),
+        actual=pd.Series(final, index=teams, name='elo'),
+    )
+
+
+def _rutas(cache_dir):
+    base = os.path.join(cache_dir, 'elo')
+    return base + '.arrow', base + '.checkpoints.arrow', base + '.json'
+
+
+def _cargar(cache_dir):
+    ruta_partidos, ruta_checkpoints, ruta_meta = _rutas(cache_dir)
+    meta = _leer_meta(ruta_meta)
+    if meta is None or meta.get('version') != ELO_VERSION:
+        return None, None
+    try:
+        partidos = _leer_arrow(ruta_partidos)
+        por_año = _leer_arrow(ruta_checkpoints).set_index('year')
+    except OSError:
+        return None, None
+    actual = pd.Series(meta['actual'], name='elo')
+    previo = EloRatings(partidos['antes_local'].to_numpy(), partidos['antes_visitante'].to_numpy(),
+                        partidos['cambio'].to_numpy(), por_año, actual)
+    return previo, meta
+
+
+def _guardar(cache_dir, elo, huella):
+    ruta_partidos, ruta_checkpoints, ruta_meta = _rutas(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    _escribir_arrow(pd.DataFrame({'antes_local': elo.antes_local, 'antes_visitante': elo.antes_visitante,
+                                  'cambio': elo.cambio}), ruta_partidos)
+    por_año = elo.por_año.copy()
+    por_año.columns = por_año.columns.astype(str)
+    _escribir_arrow(por_año.reset_index(), ruta_checkpoints)
+    _escribir_meta(ruta_meta, {'version': ELO_VERSION, 'partidos': len(elo.cambio), 'huella': huella,
+                               'actual': elo.actual.to_dict()})
+
+
+def load_elo(results, cache_dir=CACHE_DIR):
+    """EloRatings de results, usando los checkpoints guardados en `cache_dir`.
+
+    Si lo guardado corresponde a todas las filas de results se lee sin
+    calcular nada; si results solo creció al final (la huella de las filas ya
+    procesadas no cambió) se continúa desde el checkpoint anual previo a los
+    partidos nuevos; si no, se recalcula todo el histórico.
+    """
+    previo, meta = _cargar(cache_dir)
+    if meta is not None:
+        procesados = meta['partidos']
+        if procesados > len(results) or meta['huella'] != _huella(results, procesados):
+            previo = None
+        elif procesados == len(results):
+            teams = results['home_team'].cat.categories
+            por_año = previo.por_año.reindex(columns=teams, fill_value=ELO_INICIAL)
+            actual = previo.actual.reindex(teams, fill_value=ELO_INICIAL)
+            return EloRatings(previo.antes_local, previo.antes_visitante, previo.cambio, por_año, actual)
+
+    if previo is not None:
+        teams = results['home_team'].cat.categories
+        previo = EloRatings(previo.antes_local, previo.antes_visitante, previo.cambio,
+                            previo.por_año.reindex(columns=teams, fill_value=ELO_INICIAL), previo.actual)
+    elo = compute_elo(results, previo)
+    # Si no se puede escribir seguimos sin checkpoints, como con los snapshots
+    try:
+        _guardar(cache_dir, elo, _huella(results, len(results)))
+    except OSError:
+        pass
+    return elo
+
+
+@memoize_per_data(maxsize=64)
+def team_rating_series(elo, team_matches, equipo, start_year, end_year):
+    """Rating del equipo después de cada uno de sus partidos del período.
+
+    Devuelve un DataFrame con date, rating, opponent y cambio (puntos ganados
+    o perdidos en el partido), en orden cronológico.
+    """
+    partidos = team_matches.of_team(equipo)
+    partidos = partidos[(partidos['year'] >= start_year) & (partidos['year'] <= end_year)]
+    ids = partidos['match_id'].to_numpy()
+    es_local = partidos['is_home'].to_numpy()
+    cambio = np.where(es_local, elo.cambio[ids], -elo.cambio[ids])
+    antes = np.where(es_local, elo.antes_local[ids], elo.antes_visitante[ids])
+    return pd.DataFrame({
+        'date': partidos['date'].to_numpy(),
+        'rating': antes + cambio,
+        'opponent': partidos['opponent'].to_numpy(),
+        'cambio': cambio,
+    })
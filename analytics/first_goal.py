@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from analytics.cache import memoize_per_data
+
+COLUMNAS = ['match_id', 'year', 'home_team', 'away_team', 'continents', 'scorer_is_home',
+            'minute', 'own_goal', 'penalty', 'resultado', 'scorer_won']
+
+
+@memoize_per_data(maxsize=1, tabla='goalscorers')
+def first_goal_table(datos):
+    """Tabla con el primer gol de cada partido que tuvo goles registrados.
+
+    Se calcula una vez por carga de datos con operaciones vectorizadas a
+    partir del MatchIndex: de qué lado fue el gol, en qué minuto, si fue en
+    contra o de penal, el resultado final y si el equipo que lo marcó ganó.
+    `continents` es la unión de las máscaras de continentes de los dos equipos.
+    """
+    results = datos.results
+    goles = datos.goalscorers
+    match_ids, filas = datos.matches.first_goal_rows()
+
+    local = results['home_team'].cat.codes.to_numpy()[match_ids]
+    marcador = goles['team'].cat.codes.to_numpy()[filas]
+    scorer_is_home = marcador == local
+
+    resultado = results['resultado'].array.take(match_ids)
+    # El equipo del primer gol ganó si fue el local con victoria local o el visitante con victoria visitante
+    scorer_won = np.where(scorer_is_home, resultado == 'Victoria Local', resultado == 'Victoria Visitante')
+
+    return pd.DataFrame({
+        'match_id': match_ids,
+        'year': results['year'].to_numpy()[match_ids],
+        'home_team': results['home_team'].array.take(match_ids),
+        'away_team': results['away_team'].array.take(match_ids),
+        'continents': (results['home_continents'].to_numpy()[match_ids]
+                       | results['away_continents'].to_numpy()[match_ids]),
+        'scorer_is_home': scorer_is_home,
+        'minute': goles['minute'].to_numpy()[filas],
+        'own_goal': goles['own_goal'].to_numpy()[filas],
+        'penalty': goles['penalty'].to_numpy()[filas],
+        'resultado': resultado,
+        'scorer_won': scorer_won,
+    }, columns=COLUMNAS)
+
+
+def first_goal_outcomes(primeros):
+    """Porcentaje de partidos ganados/perdidos por quien marcó primero, como local y como visitante.
+
+    `primeros` es cualquier subconjunto de `first_goal_table`. Devuelve dos
+    DataFrames con columnas Resultado y Porcentaje.
+    """
+    etiquetas = pd.Series(np.where(primeros['scorer_won'], 'Ganado', 'Perdido'))
+    es_local = primeros['scorer_is_home'].to_numpy()
+
+    def porcentajes(mascara):
+        tabla = etiquetas[mascara].value_counts(normalize=True).mul(100).round(2).reset_index()
+        tabla.columns = ['Resultado', 'Porcentaje']
+        return tabla
+
+    return porcentajes(es_local), porcentajes(~es_local)
+
+
+def first_goal_years(datos):
+    """Primer y último año con goles registrados (límites del selector de período)."""
+    años = datos.goalscorers['year']
+    return años.min(), años.max()
+
+
+def first_goal_teams(datos):
+    """Equipos con goles registrados, en orden de aparición en goalscorers."""
+    return datos.goalscorers['team'].unique().tolist()
+
+
+@memoize_per_data(maxsize=32)
+def first_goal_by_continent(datos, continente, start_year, end_year):
+    """`first_goal_outcomes` de los partidos del período con algún equipo del continente."""
+    primeros = first_goal_table(datos)
+    años = primeros['year'].to_numpy()
+    juega = datos.continents.mask(primeros['continents'].to_numpy(), continente)
+    return first_goal_outcomes(primeros[(años >= start_year) & (años <= end_year) & juega])
+
+
+@memoize_per_data(maxsize=32)
+def first_goal_by_team(datos, equipo):
+    """`first_goal_outcomes` de los partidos del equipo, o None si no tiene partidos con goles."""
+    primeros = first_goal_table(datos)
+    equipo_id = primeros['home_team'].cat.categories.get_indexer([equipo])[0]
+    juega = ((primeros['home_team'].cat.codes.to_numpy() == equipo_id)
+             | (primeros['away_team'].cat.codes.to_numpy() == equipo_id))
+    if equipo_id < 0 or not juega.any():
+        return None
+    return first_goal_outcomes(primeros[juega])
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.cache import memoize_per_data
+
+
+@dataclass(frozen=True, eq=False)
+class GoalMinutes:
+    """Goles con minuto conocido, codificados como arreglos enteros.
+
+    Cada consulta arma una máscara sobre estos arreglos y hace un solo
+    bincount por minuto, sin volver a tocar el DataFrame de goleadores.
+    `team` es el equipo al que se le anotó el gol (en los goles en contra, el
+    beneficiado) y `is_home` indica si ese equipo era el local.
+    """
+    minute: np.ndarray        # minuto de cada gol (1 .. max_minute)
+    team: np.ndarray          # código de equipo
+    tournament: np.ndarray    # código de torneo (-1 si el partido no está en results)
+    decade: np.ndarray
+    is_home: np.ndarray
+    penalty: np.ndarray
+    own_goal: np.ndarray
+    teams: pd.Index
+    tournaments: pd.Index
+    max_minute: int
+
+    def mask(self, team=None, tournament=None, decade=None, is_home=None, penalty=None, own_goal=None):
+        """Máscara de los goles que cumplen todos los filtros indicados (None = sin filtro)."""
+        mascara = np.ones(len(self.minute), dtype=bool)
+        if team is not None:
+            mascara &= self.team == self.teams.get_loc(team)
+        if tournament is not None:
+            mascara &= self.tournament == self.tournaments.get_loc(tournament)
+        for columna, valor in (('decade', decade), ('is_home', is_home),
+                               ('penalty', penalty), ('own_goal', own_goal)):
+            if valor is not None:
+                mascara &= getattr(self, columna) == valor
+        return mascara
+
+    def histogram(self, **filtros):
+        """Goles por minuto (posición m = minuto m) de los goles filtrados."""
+        return np.bincount(self.minute[self.mask(**filtros)], minlength=self.max_minute + 1)
+
+
+@memoize_per_data(maxsize=1, tabla='goalscorers')
+def goal_minutes(datos):
+    """Construye (una vez por carga de datos) los arreglos de GoalMinutes."""
+    goles = datos.goalscorers
+    con_minuto = goles['minute'].notna().to_numpy()
+    goles = goles[con_minuto]
+
+    match_id = goles['match_id'].to_numpy()
+    torneos = datos.results['tournament']
+    codigo_torneo = np.where(match_id >= 0, torneos.cat.codes.to_numpy()[np.maximum(match_id, 0)], -1)
+    equipo = goles['team'].cat.codes.to_numpy()
+    minuto = goles['minute'].to_numpy().astype(np.int64)
+
+    return GoalMinutes(
+        minute=minuto,
+        team=equipo,
+        tournament=codigo_torneo,
+        decade=(goles['year'].to_numpy() // 10) * 10,
+        is_home=equipo == goles['home_team'].cat.codes.to_numpy(),
+        penalty=goles['penalty'].to_numpy(),
+        own_goal=goles['own_goal'].to_numpy(),
+        teams=goles['team'].cat.categories,
+        tournaments=torneos.cat.categories,
+        max_minute=int(minuto.max()),
+    )
+
+
+@memoize_per_data(maxsize=1)
+def goal_minute_filters(datos):
+    """Valores posibles de cada filtro: equipos, torneos y décadas con goles (ordenados)."""
+    minutos = goal_minutes(datos)
+    torneos = minutos.tournament[minutos.tournament >= 0]
+    return {
+        'equipos': sorted(minutos.teams[np.unique(minutos.team)]),
+        'torneos': sorted(minutos.tournaments[np.unique(torneos)]),
+        'decadas': np.unique(minutos.decade).tolist(),
+    }
+
+
+@memoize_per_data(maxsize=64)
+def goal_minute_distribution(datos, team=None, tournament=None, decade=None, is_home=None,
+                             penalty=None, own_goal=None, ancho=1):
+    """Distribución de los goles filtrados en intervalos de `ancho` minutos.
+
+    Devuelve un DataFrame indexado por el primer minuto de cada intervalo con
+    las columnas goles, porcentaje y acumulado (porcentaje acumulado hasta el
+    final del intervalo).
+    """
+    minutos = goal_minutes(datos)
+    conteo = minutos.histogram(team=team, tournament=tournament, decade=decade, is_home=is_home,
+                               penalty=penalty, own_goal=own_goal)[1:]
+    # Rellenar hasta un múltiplo de `ancho` y sumar por intervalo
+    conteo = np.pad(conteo, (0, -len(conteo) % ancho)).reshape(-1, ancho).sum(axis=1)
+    total = conteo.sum()
+    porcentaje = conteo / total * 100 if total else np.zeros(len(conteo))
+    return pd.DataFrame({
+        'goles': conteo,
+        'porcentaje': porcentaje,
+        'acumulado': np.cumsum(porcentaje),
+    }, index=pd.Index(np.arange(len(conteo)) * ancho + 1, name='minuto'))
+
+
+def half_goals_minute(distribucion):
+    """Último minuto del intervalo en el que se alcanza la mitad de los goles."""
+    inicio = distribucion.index.to_numpy()
+    ancho = int(inicio[1] - inicio[0]) if len(inicio) > 1 else 1
+    intervalo = np.searchsorted(distribucion['acumulado'].to_numpy(), 50)
+    return int(inicio[intervalo]) + ancho - 1
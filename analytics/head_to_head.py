@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.cache import memoize_per_data
+from analytics.instrumentation import instrumentar
+from analytics.team_matches import VICTORIA
+
+
+@dataclass(frozen=True, eq=False)
+class HeadToHead:
+    """Agregado disperso equipo x rival con sumas acumuladas por año.
+
+    Solo se guardan los pares (equipo, rival) que se enfrentaron alguna vez.
+    Las filas del par `p` son `pair_offsets[p]:pair_offsets[p + 1]`, una por
+    año con partidos y en orden de año, y `acumulado[m][fila]` es el total de
+    la métrica `m` desde el primer año hasta el de esa fila. Los pares del
+    equipo `t` son `team_offsets[t]:team_offsets[t + 1]`.
+    """
+    teams: pd.Index
+    pair_opponent: np.ndarray
+    pair_offsets: np.ndarray
+    team_offsets: np.ndarray
+    clave: np.ndarray
+    primer_año: int
+    n_años: int
+    acumulado: dict
+
+    def rivals(self, team_id, start_year, end_year):
+        """Totales contra cada rival en [start_year, end_year] (restando dos acumulados)."""
+        # Las claves de un par solo cubren sus años: fuera del rango caerían en el par vecino
+        start_year = max(start_year, self.primer_año)
+        end_year = min(end_year, self.primer_año + self.n_años - 1)
+        if start_year > end_year:
+            return pd.DataFrame({m: np.zeros(0, dtype=np.int64) for m in self.acumulado},
+                                index=pd.Index([], name='rival'))
+        pares = np.arange(self.team_offsets[team_id], self.team_offsets[team_id + 1])  # índices de par
+        inicio_par = self.pair_offsets[pares]
+        base = pares * self.n_años - self.primer_año
+
+        # Última fila con año <= end_year y última con año < start_year de cada par
+        hasta = np.searchsorted(self.clave, base + end_year, side='right') - 1
+        antes = np.searchsorted(self.clave, base + start_year, side='left') - 1
+        hay_hasta = hasta >= inicio_par
+        hay_antes = antes >= inicio_par
+
+        totales = {}
+        for metrica, acumulado in self.acumulado.items():
+            totales[metrica] = (
+                np.where(hay_hasta, acumulado[np.maximum(hasta, 0)], 0)
+                - np.where(hay_antes, acumulado[np.maximum(antes, 0)], 0)
+            )
+        tabla = pd.DataFrame(totales, index=pd.Index(self.teams[self.pair_opponent[pares]], name='rival'))
+        return tabla[tabla['partidos'] > 0]
+
+
+@memoize_per_data(maxsize=1, tabla='table')
+def head_to_head(team_matches):
+    """Construye (una vez por carga de datos) el agregado equipo x rival."""
+    tabla = team_matches.table
+    teams = tabla['team'].cat.categories
+    n_equipos = len(teams)
+    años = tabla['year'].to_numpy().astype(np.int64)
+    primer_año = int(años.min())
+    n_años = int(años.max()) - primer_año + 1
+
+    equipo = tabla['team'].cat.codes.to_numpy().astype(np.int64)
+    rival = tabla['opponent'].cat.codes.to_numpy().astype(np.int64)
+    celda = (equipo * n_equipos + rival) * n_años + (años - primer_año)
+
+    # Suma por (equipo, rival, año); np.unique deja las celdas ordenadas
+    celdas, inversa = np.unique(celda, return_inverse=True)
+    valores = {
+        'partidos': np.ones(len(tabla), dtype=np.int64),
+        'victorias': (tabla['result'].to_numpy() == VICTORIA).astype(np.int64),
+        'goles_favor': tabla['goals_for'].to_numpy().astype(np.int64),
+        'goles_contra': tabla['goals_against'].to_numpy().astype(np.int64),
+    }
+    por_celda = {m: np.bincount(inversa, weights=v, minlength=len(celdas)).astype(np.int64)
+                 for m, v in valores.items()}
+
+    par = celdas // n_años
+    pares, pair_offsets = np.unique(par, return_index=True)
+    pair_offsets = np.append(pair_offsets, len(celdas))
+    id_par = np.repeat(np.arange(len(pares)), np.diff(pair_offsets))
+
+    # Acumulado dentro de cada par: cumsum global menos lo acumulado antes del par
+    acumulado = {}
+    for metrica, v in por_celda.items():
+        total = np.cumsum(v)
+        previo = np.concatenate([[0], total[pair_offsets[1:-1] - 1]])
+        acumulado[metrica] = total - previo[id_par]
+
+    team_offsets = np.zeros(n_equipos + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pares // n_equipos, minlength=n_equipos), out=team_offsets[1:])
+
+    return HeadToHead(
+        teams=teams,
+        pair_opponent=pares % n_equipos,
+        pair_offsets=pair_offsets,
+        team_offsets=team_offsets,
+        clave=id_par * n_años + celdas % n_años,
+        primer_año=primer_año,
+        n_años=n_años,
+        acumulado=acumulado,
+    )
+
+
+@instrumentar(tabla='table')
+def rivals_table(team_matches, equipo, start_year, end_year):
+    """Tabla de rivales de `equipo` en el período, con las columnas que usa el tab."""
+    h2h = head_to_head(team_matches)
+    team_id = h2h.teams.get_indexer([equipo])[0]
+    if team_id < 0:
+        return pd.DataFrame(columns=['rival', 'total_matches', 'victories', 'win_rate',
+                                     'goals_favor', 'goals_against'])
+    rivales = h2h.rivals(team_id, start_year, end_year).reset_index()
+    return pd.DataFrame({
+        'rival': rivales['rival'],
+        'total_matches': rivales['partidos'],
+        'victories': rivales['victorias'],
+        'win_rate': rivales['victorias'] / rivales['partidos'] * 100,
+        'goals_favor': rivales['goles_favor'],
+        'goals_against': rivales['goles_contra'],
+    })
@@ -0,0 +1,28 @@
+from analytics.aggregates import RESULTADOS
+from analytics.instrumentation import instrumentar
+
+
+def historical_periods(cubo):
+    """Años que se pueden elegir en el selector de período (`cubo` es DataBundle.years)."""
+    return cubo.años_con_partidos()
+
+
+@instrumentar()
+def historical_summary(cubo, start_year, end_year):
+    """Métricas generales del período y partidos por año y resultado.
+
+    Devuelve un dict con partidos, promedio_goles, pct_victorias_local,
+    marcador_mas_comun (goles local, goles visitante) y por_año, un DataFrame
+    indexado por año con una columna por cada valor de RESULTADOS.
+    """
+    resumen = cubo.resumen_partidos(start_year, end_year)
+    por_año = cubo.por_año(cubo.por_resultado, start_year, end_year)
+    por_año.columns = RESULTADOS
+    partidos = resumen['partidos']
+    return {
+        'partidos': partidos,
+        'promedio_goles': resumen['goles'] / partidos,
+        'pct_victorias_local': resumen['Victoria Local'] / partidos * 100,
+        'marcador_mas_comun': cubo.marcador_mas_comun(start_year, end_year),
+        'por_año': por_año,
+    }
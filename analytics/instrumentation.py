@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, is_dataclass
+from datetime import datetime, timezone
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+# Log por defecto de las mediciones de la app (ver debug_panel)
+LOG_PATH = os.path.join('.', 'logs', 'render.jsonl')
+
+# Al superar este tamaño el log se rota: el actual pasa a `<ruta>.1` (se pisa el anterior)
+MAX_LOG_MB = 10
+
+# Mediciones en curso de cada hilo (Streamlit corre cada sesión en su propio hilo)
+_local = threading.local()
+
+
+@dataclass
+class Calculo:
+    """Una llamada a un cálculo instrumentado dentro de una medición."""
+    funcion: str
+    cache: str            # 'hit', 'miss' o 'none' si la función no tiene caché
+    tiempo_s: float
+    filas_entrada: int    # tamaño de la tabla de entrada, no filas recorridas (0 si fue un acierto)
+    memoria_mb: float     # memoria del resultado calculado (0 si fue un acierto de caché)
+
+
+@dataclass
+class Medicion:
+    """Tiempo total y cálculos hechos durante un bloque (un tab, la carga de datos...)."""
+    nombre: str
+    inicio: str
+    tiempo_s: float = 0.0
+    calculos: list = field(default_factory=list)
+    extra: dict = field(default_factory=dict)
+
+    @property
+    def aciertos(self):
+        return sum(c.cache == 'hit' for c in self.calculos)
+
+    @property
+    def fallos(self):
+        return sum(c.cache == 'miss' for c in self.calculos)
+
+    @property
+    def filas_entrada(self):
+        return sum(c.filas_entrada for c in self.calculos)
+
+    @property
+    def memoria_mb(self):
+        return sum(c.memoria_mb for c in self.calculos)
+
+    def resumen(self):
+        """Diccionario plano con los totales, apto para JSON."""
+        return {
+            'nombre': self.nombre, 'inicio': self.inicio, 'tiempo_s': self.tiempo_s,
+            'aciertos': self.aciertos, 'fallos': self.fallos, 'filas_entrada': self.filas_entrada,
+            'memoria_mb': self.memoria_mb, **self.extra,
+        }
+
+
+def _pila():
+    if not hasattr(_local, 'pila'):
+        _local.pila = []
+    return _local.pila
+
+
+def memoria_mb(valor):
+    """Memoria (MB) de DataFrames, Series, arreglos y textos, también dentro de tuplas, dicts y dataclasses."""
+    if isinstance(valor, (str, bytes)):
+        return len(valor) / 1e6
+    if isinstance(valor, pd.DataFrame):
+        return valor.memory_usage(deep=True).sum() / 1e6
+    if isinstance(valor, (pd.Series, pd.Index)):
+        return valor.memory_usage(deep=True) / 1e6
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes / 1e6
+    if isinstance(valor, (tuple, list)):
+        return sum(memoria_mb(v) for v in valor)
+    if isinstance(valor, dict):
+        return sum(memoria_mb(v) for v in valor.values())
+    if is_dataclass(valor) and not isinstance(valor, type):
+        return sum(memoria_mb(v) for v in vars(valor).values())
+    return 0.0
+
+
+def filas_de(datos, tabla=None):
+    """Filas de `datos` si es un DataFrame, o de su atributo `tabla` (p. ej. un DataBundle).
+
+    Es el tamaño de la entrada del cálculo, no cuántas filas recorrió: un
+    cálculo que solo lee un bloque o un agregado cuenta la tabla entera.
+    """
+    if tabla is not None:
+        datos = getattr(datos, tabla)
+    return len(datos) if isinstance(datos, pd.DataFrame) else 0
+
+
+def activa():
+    """True si hay una medición en curso en este hilo."""
+    return bool(_pila())
+
+
+def registrar(funcion, cache, tiempo_s, filas_entrada=0, resultado=None):
+    """Agrega un cálculo a todas las mediciones en curso en este hilo (no hace nada si no hay)."""
+    pila = _pila()
+    if not pila:
+        return
+    calculo = Calculo(funcion, cache, tiempo_s, filas_entrada,
+                      memoria_mb(resultado) if resultado is not None else 0.0)
+    for medicion in pila:
+        medicion.calculos.append(calculo)
+
+
+@contextmanager
+def medir(nombre, **extra):
+    """Mide el bloque y junta los cálculos instrumentados que se hagan dentro.
+
+    Las mediciones se pueden anidar: cada cálculo se anota en todas las que
+    estén abiertas. Fuera de una medición los cálculos no se instrumentan.
+    """
+    medicion = Medicion(nombre, datetime.now(timezone.utc).isoformat(timespec='seconds'), extra=extra)
+    pila = _pila()
+    pila.append(medicion)
+    inicio = time.perf_counter()
+    try:
+        yield medicion
+    finally:
+        medicion.tiempo_s = time.perf_counter() - inicio
+        pila.remove(medicion)
+
+
+def instrumentar(tabla=None):
+    """Anota cada llamada a `f(datos, ...)` en las mediciones en curso (cálculos sin caché).
+
+    `tabla` indica el atributo de `datos` cuyas filas se anotan como tamaño
+    de la entrada cuando `datos` no es un DataFrame.
+    """
+    def decorador(f):
+        @wraps(f)
+        def wrapper(datos, *args, **kwargs):
+            if not activa():
+                return f(datos, *args, **kwargs)
+            inicio = time.perf_counter()
+            valor = f(datos, *args, **kwargs)
+            registrar(f.__qualname__, 'none', time.perf_counter() - inicio, filas_de(datos, tabla), valor)
+            return valor
+        return wrapper
+    return decorador
+
+
+def append_log(mediciones, ruta, max_mb=MAX_LOG_MB):
+    """Agrega una línea JSON por medición al archivo `ruta`, con el detalle de sus cálculos.
+
+    Si el archivo ya supera `max_mb` se rota antes de escribir: pasa a
+    `ruta.1` (reemplazando la rotación anterior) y se empieza uno nuevo, así
+    que el log nunca ocupa más de unas 2 * `max_mb`.
+    """
+    if os.path.exists(ruta) and os.path.getsize(ruta) > max_mb * 1e6:
+        os.replace(ruta, ruta + '.1')
+    with open(ruta, 'a', encoding='utf-8') as f:
+        for medicion in mediciones:
+            fila = {**medicion.resumen(), 'calculos': [asdict(c) for c in medicion.calculos]}
+            f.write(json.dumps(fila, ensure_ascii=False) + '\n')
+
+
+def summarize_log(ruta):
+    """Resume un log JSONL por nombre de medición: ejecuciones, tiempos y tasa de aciertos."""
+    with open(ruta, encoding='utf-8') as f:
+        filas = pd.DataFrame([json.loads(linea) for linea in f if linea.strip()])
+    if filas.empty:
+        return filas
+    # Logs anteriores llamaban 'filas' al tamaño de la entrada
+    if 'filas_entrada' not in filas:
+        filas = filas.rename(columns={'filas': 'filas_entrada'})
+    por_nombre = filas.groupby('nombre')
+    resumen = pd.DataFrame({
+        'ejecuciones': por_nombre.size(),
+        'tiempo_medio_s': por_nombre['tiempo_s'].mean(),
+        'tiempo_p95_s': por_nombre['tiempo_s'].quantile(0.95),
+        'tiempo_max_s': por_nombre['tiempo_s'].max(),
+        'filas_entrada_medias': por_nombre['filas_entrada'].mean(),
+        'memoria_media_mb': por_nombre['memoria_mb'].mean(),
+    })
+    llamadas = por_nombre['aciertos'].sum() + por_nombre['fallos'].sum()
+    resumen['pct_aciertos'] = (por_nombre['aciertos'].sum() / llamadas.where(llamadas > 0) * 100)
+    return resumen.sort_values('tiempo_medio_s', ascending=False)
@@ -0,0 +1,192 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+import numpy as np
+from analytics.snapshot import load_snapshot
+from analytics.aggregates import RESULTADOS, merge_aggregates, results_aggregates
+from analytics.continents import Continents, add_continent_columns
+from analytics.elo import EloRatings, load_elo
+from analytics.match_index import MatchIndex, build_match_index, lookup_match_ids
+from analytics.scorelines import ScorelineTensor, build_scoreline_tensor
+from analytics.team_matches import TeamMatches, build_team_matches
+from analytics.year_cube import YearCube, build_year_cube
+
+
+# Columnas que guardan nombres de selecciones en cada dataset. Todas comparten
+# el mismo diccionario de categorías, así que un código identifica al mismo
+# equipo en cualquiera de los cuatro DataFrames.
+TEAM_COLUMNS = {
+    'results': ['home_team', 'away_team'],
+    'goalscorers': ['home_team', 'away_team', 'team'],
+    'shootouts': ['home_team', 'away_team', 'winner', 'first_shooter'],
+    'countries': ['country'],
+}
+
+
+@dataclass(frozen=True, eq=False)
+class DataBundle:
+    """Los cuatro datasets del proyecto ya parseados."""
+    results: pd.DataFrame
+    goalscorers: pd.DataFrame
+    shootouts: pd.DataFrame
+    countries: pd.DataFrame
+    teams: pd.Index
+    matches: MatchIndex
+    team_matches: TeamMatches
+    continents: Continents
+    scorelines: ScorelineTensor
+    years: YearCube
+    elo: EloRatings
+    aggregates: dict
+
+
+def _preparar_resultados(ruta_csv):
+    """Lee results.csv y agrega las columnas derivadas."""
+    df = pd.read_csv(ruta_csv, dtype={
+        'home_team': 'category', 'away_team': 'category', 'tournament': 'category',
+        'city': 'category', 'country': 'category',
+        'home_score': 'int8', 'away_score': 'int8',
+    })
+    df['date'] = pd.to_datetime(df['date'])
+    df['year'] = df['date'].dt.year.astype('int16')
+    df['decade'] = (df['year'] // 10) * 10
+    df['resultado'] = pd.Categorical(
+        np.where(df['home_score'] > df['away_score'], 'Victoria Local',
+                 np.where(df['home_score'] == df['away_score'], 'Empate',
+                          'Victoria Visitante')),
+        categories=RESULTADOS
+    )
+    return df
+
+
+def _preparar_goleadores(ruta_csv):
+    """Lee goalscorers.csv con fechas y booleanos ya convertidos."""
+    df = pd.read_csv(ruta_csv, true_values=['TRUE'], false_values=['FALSE'], dtype={
+        'home_team': 'category', 'away_team': 'category', 'team': 'category',
+        'scorer': 'category',
+    })
+    df['date'] = pd.to_datetime(df['date'])
+    df['year'] = df['date'].dt.year.astype('int16')
+    df['own_goal'] = df['own_goal'].astype(bool)
+    df['penalty'] = df['penalty'].astype(bool)
+    return df
+
+
+def _preparar_penales(ruta_csv):
+    """Lee shootouts.csv con la fecha ya convertida."""
+    df = pd.read_csv(ruta_csv, dtype={
+        'home_team': 'category', 'away_team': 'category',
+        'winner': 'category', 'first_shooter': 'category',
+    })
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def _preparar_paises(ruta_csv):
+    """Lee countries.csv (sin encabezado y en cp1252)."""
+    return pd.read_csv(ruta_csv, encoding='cp1252', header=None, names=['country', 'continent'],
+                       dtype={'country': 'category'})
+
+
+# Carpeta con los CSV; los snapshots van en su subcarpeta .cache
+DATA_DIR = os.path.join('.', 'data')
+
+# Nombre del snapshot -> (archivo CSV, función que lo prepara, agregados incrementales)
+DATASETS = {
+    'results': ('results.csv', _preparar_resultados, results_aggregates),
+    'goalscorers': ('goalscorers.csv', _preparar_goleadores, None),
+    'shootouts': ('shootouts.csv', _preparar_penales, None),
+    'countries': ('countries.csv', _preparar_paises, None),
+}
+
+# Datasets cuyo CSV no tiene fila de encabezado
+SIN_ENCABEZADO = {'countries'}
+
+
+def _compartir_diccionario_equipos(frames):
+    """Unifica las categorías de todas las columnas de equipos.
+
+    Cada snapshot guarda su propio diccionario; aquí solo se recodifican los
+    códigos contra la unión ordenada, sin tocar los textos fila por fila.
+    """
+    nombres = set()
+    for nombre, columnas in TEAM_COLUMNS.items():
+        for col in columnas:
+            nombres.update(frames[nombre][col].cat.categories)
+    teams = pd.Index(sorted(nombres))
+
+    for nombre, columnas in TEAM_COLUMNS.items():
+        for col in columnas:
+            frames[nombre][col] = frames[nombre][col].cat.set_categories(teams)
+    return teams
+
+
+def _asignar_match_ids(frames, n_equipos):
+    """Agrega la columna match_id (posición en results) a los tres datasets de partidos."""
+    results = frames['results']
+    results['match_id'] = np.arange(len(results), dtype=np.int32)
+    for nombre in ('goalscorers', 'shootouts'):
+        frames[nombre]['match_id'] = lookup_match_ids(results, frames[nombre], n_equipos)
+    return build_match_index(len(results), frames['goalscorers'])
+
+
+def memory_report(datos):
+    """Memoria ocupada por cada DataFrame del bundle, en MB."""
+    filas = []
+    for nombre in DATASETS:
+        frame = getattr(datos, nombre)
+        filas.append({
+            'dataset': nombre,
+            'filas': len(frame),
+            'memoria_mb': frame.memory_usage(deep=True).sum() / 1e6,
+        })
+    return pd.DataFrame(filas).set_index('dataset')
+
+
+def _cargar_dataset(nombre, data_dir, cache_dir):
+    archivo, preparar, agregar = DATASETS[nombre]
+    return load_snapshot(nombre, os.path.join(data_dir, archivo), preparar, agregar, merge_aggregates,
+                         cache_dir=cache_dir, encabezado=nombre not in SIN_ENCABEZADO)
+
+
+def csv_signatures(data_dir=DATA_DIR):
+    """Tamaño y mtime de cada CSV; cambian cuando llegan datos nuevos."""
+    firmas = []
+    for archivo, _, _ in DATASETS.values():
+        st_csv = os.stat(os.path.join(data_dir, archivo))
+        firmas.append((st_csv.st_size, st_csv.st_mtime_ns))
+    return tuple(firmas)
+
+
+def build_bundle(data_dir=DATA_DIR, cache_dir=None):
+    """Carga los cuatro datasets de `data_dir` y arma el DataBundle, sin caché en memoria.
+
+    En un arranque en frío los CSV se parsean en paralelo; después se leen de
+    los snapshots (ver analytics.snapshot.load_snapshot), que se guardan en
+    `cache_dir` (por defecto `data_dir/.cache`). Sirve tanto para la app como
+    para scripts o la CLI (`python -m analytics`).
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(data_dir, '.cache')
+    with ThreadPoolExecutor(max_workers=len(DATASETS)) as pool:
+        futuros = {nombre: pool.submit(_cargar_dataset, nombre, data_dir, cache_dir) for nombre in DATASETS}
+        cargados = {nombre: f.result() for nombre, f in futuros.items()}
+
+    frames = {nombre: df for nombre, (df, _) in cargados.items()}
+    agregados = cargados['results'][1]
+    teams = _compartir_diccionario_equipos(frames)
+    matches = _asignar_match_ids(frames, len(teams))
+    continents = add_continent_columns(frames['results'], frames['countries'], len(teams))
+    return DataBundle(
+        teams=teams,
+        matches=matches,
+        continents=continents,
+        team_matches=build_team_matches(frames['results']),
+        scorelines=build_scoreline_tensor(agregados['scoreline_cells']),
+        years=build_year_cube(agregados['scoreline_cells'], agregados['team_year'], teams),
+        elo=load_elo(frames['results'], cache_dir=cache_dir),
+        aggregates=agregados,
+        **frames,
+    )
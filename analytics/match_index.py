@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class MatchIndex:
+    """Relación entre cada partido de results y sus goles.
+
+    El `match_id` de un partido es su posición en results. Los goles del
+    partido `m` son las filas `goal_order[goal_offsets[m]:goal_offsets[m + 1]]`
+    de goalscorers, ordenadas por minuto.
+    """
+    goal_order: np.ndarray
+    goal_offsets: np.ndarray
+
+    def first_goal_rows(self):
+        """(match_ids, filas) del primer gol de cada partido que tuvo goles."""
+        con_goles = np.flatnonzero(np.diff(self.goal_offsets) > 0)
+        return con_goles, self.goal_order[self.goal_offsets[con_goles]]
+
+
+def _claves(df, n_equipos):
+    """Clave entera (fecha, local, visitante) de cada fila."""
+    dias = df['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    local = df['home_team'].cat.codes.to_numpy().astype(np.int64)
+    visitante = df['away_team'].cat.codes.to_numpy().astype(np.int64)
+    return (dias * n_equipos + local) * n_equipos + visitante
+
+
+def lookup_match_ids(results, df, n_equipos):
+    """match_id de cada fila de `df` buscando su (fecha, local, visitante) en results.
+
+    Si la clave está repetida en results se toma el primer partido; las filas
+    sin partido correspondiente reciben -1.
+    """
+    claves_resultados = _claves(results, n_equipos)
+    orden = np.argsort(claves_resultados, kind='stable')
+    ordenadas = claves_resultados[orden]
+
+    claves = _claves(df, n_equipos)
+    pos = np.searchsorted(ordenadas, claves)
+    pos_valida = np.minimum(pos, len(ordenadas) - 1)
+    encontrado = (pos < len(ordenadas)) & (ordenadas[pos_valida] == claves)
+    return np.where(encontrado, orden[pos_valida], -1).astype(np.int32)
+
+
+def build_match_index(n_partidos, goalscorers):
+    """Construye el MatchIndex a partir de las columnas match_id ya asignadas."""
+    ids_goles = goalscorers['match_id'].to_numpy()
+    minutos = goalscorers['minute'].to_numpy()
+    # lexsort ordena por la última clave primero; los minutos NaN quedan al final
+    goal_order = np.lexsort((minutos, ids_goles))
+    goal_order = goal_order[ids_goles[goal_order] >= 0]
+
+    conteo = np.bincount(ids_goles[goal_order], minlength=n_partidos)
+    goal_offsets = np.zeros(n_partidos + 1, dtype=np.int64)
+    np.cumsum(conteo, out=goal_offsets[1:])
+
+    return MatchIndex(goal_order, goal_offsets)
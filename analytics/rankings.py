@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from analytics.cache import memoize_per_data
+from analytics.instrumentation import instrumentar
+from analytics.team_matches import VICTORIA, EMPATE, DERROTA
+
+LADOS = ['local', 'visitante', 'total']
+METRICAS_RANKING = ['partidos', 'victorias', 'empates', 'derrotas', 'goles_favor', 'goles_contra',
+                    'diferencia_goles', 'puntos', 'rendimiento']
+
+# Partidos mínimos para entrar al ranking de mejores equipos
+MIN_PARTIDOS = 200
+
+# Partidos mínimos cuando el ranking se limita a un torneo (ninguna selección llega a 200 de local)
+MIN_PARTIDOS_TORNEO = 20
+
+
+@memoize_per_data(maxsize=16, tabla='table')
+def team_rankings(team_matches, torneo=None):
+    """Récord de todos los equipos como local, visitante y en total.
+
+    Un bincount por métrica sobre (equipo, lado) de la tabla larga, sin
+    groupby ni recorrer equipos. Las columnas son `{métrica}_{lado}` con las
+    métricas de METRICAS_RANKING; `rendimiento` es el porcentaje de puntos
+    obtenidos (3 por victoria, 1 por empate) sobre los posibles. El índice
+    tiene todos los equipos del diccionario, en su orden; con `torneo` solo
+    se cuentan los partidos de ese torneo. Se memoiza por torneo.
+    """
+    tabla = team_matches.table
+    if torneo is not None:
+        # Filtro por código de la categoría, sin comparar textos
+        codigo = tabla['tournament'].cat.categories.get_indexer([torneo])[0]
+        tabla = tabla[tabla['tournament'].cat.codes.to_numpy() == codigo]
+    teams = tabla['team'].cat.categories
+    n_equipos = len(teams)
+
+    # Celda = equipo * 2 + lado (0 local, 1 visitante)
+    celda = tabla['team'].cat.codes.to_numpy().astype(np.int64) * 2 + (~tabla['is_home'].to_numpy())
+    resultado = tabla['result'].to_numpy()
+
+    def contar(pesos=None):
+        return np.bincount(celda, weights=pesos, minlength=2 * n_equipos).astype(np.int64).reshape(n_equipos, 2)
+
+    base = {
+        'partidos': contar(),
+        'victorias': contar(resultado == VICTORIA),
+        'empates': contar(resultado == EMPATE),
+        'derrotas': contar(resultado == DERROTA),
+        'goles_favor': contar(tabla['goals_for'].to_numpy()),
+        'goles_contra': contar(tabla['goals_against'].to_numpy()),
+    }
+
+    columnas = {}
+    for i, lado in enumerate(LADOS):
+        valores = {m: (v[:, i] if i < 2 else v.sum(axis=1)) for m, v in base.items()}
+        valores['diferencia_goles'] = valores['goles_favor'] - valores['goles_contra']
+        valores['puntos'] = valores['victorias'] * 3 + valores['empates']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            valores['rendimiento'] = valores['puntos'] / (valores['partidos'] * 3) * 100
+        for m in METRICAS_RANKING:
+            columnas[f'{m}_{lado}'] = valores[m]
+
+    return pd.DataFrame(columnas, index=pd.Index(teams, name='equipo'))
+
+
+@instrumentar(tabla='table')
+def best_teams(team_matches, lado, equipos=None, min_matches=MIN_PARTIDOS, top_n=10, torneo=None):
+    """Los `top_n` equipos con mejor rendimiento en `lado` ('local', 'visitante' o 'total').
+
+    `equipos` es una máscara booleana por código de equipo (por ejemplo los de
+    un continente); solo entran los que jugaron al menos `min_matches`
+    partidos en ese lado (del `torneo`, si se indica). Los empates se
+    resuelven en orden alfabético.
+    """
+    ranking = team_rankings(team_matches, torneo)
+    elegibles = ranking[f'partidos_{lado}'].to_numpy() >= min_matches
+    if equipos is not None:
+        elegibles &= equipos
+    return ranking[elegibles].nlargest(top_n, f'rendimiento_{lado}').reset_index()
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.instrumentation import instrumentar
+
+# Grupos de torneos del tensor de marcadores, en el orden de su eje
+GRUPOS_TORNEO = ['Amistosos', 'Mundial', 'Eliminatorias Mundial', 'Copas continentales',
+                 'Otras eliminatorias', 'Nations League', 'Otros torneos']
+
+_COPAS_CONTINENTALES = {'UEFA Euro', 'Copa América', 'African Cup of Nations', 'AFC Asian Cup',
+                        'Gold Cup', 'CONCACAF Championship', 'Oceania Nations Cup'}
+
+# Goles por equipo del tensor: la última posición acumula los partidos con MAX_GOLES o más
+MAX_GOLES = 10
+
+
+def tournament_group(torneo):
+    """Grupo de GRUPOS_TORNEO al que pertenece el torneo."""
+    if torneo == 'Friendly':
+        return 'Amistosos'
+    if torneo == 'FIFA World Cup':
+        return 'Mundial'
+    if torneo == 'FIFA World Cup qualification':
+        return 'Eliminatorias Mundial'
+    if torneo in _COPAS_CONTINENTALES:
+        return 'Copas continentales'
+    if torneo.endswith(' qualification'):
+        return 'Otras eliminatorias'
+    if 'Nations League' in torneo:
+        return 'Nations League'
+    return 'Otros torneos'
+
+
+@dataclass(frozen=True, eq=False)
+class ScorelineTensor:
+    """Partidos por año x grupo de torneo x sede neutral x goles local x goles visitante.
+
+    `conteos[a, g, n, l, v]` cuenta los partidos del año `años[a]`, del
+    grupo `GRUPOS_TORNEO[g]`, en sede neutral si `n` es 1, que terminaron
+    `l`-`v` (con los goles topados en MAX_GOLES). Los años son consecutivos,
+    así que un rango de años es un corte del primer eje y cualquier filtro se
+    resuelve con una suma sobre ejes, sin recorrer los partidos.
+    """
+    años: np.ndarray
+    conteos: np.ndarray
+
+    def matrix(self, desde=None, hasta=None, grupos=None, neutral=None):
+        """Matriz goles local x goles visitante de los partidos que cumplen los filtros.
+
+        `grupos` es una lista de nombres de GRUPOS_TORNEO (None: todos) y
+        `neutral` True, False o None (ambos).
+        """
+        inicio = 0 if desde is None else np.searchsorted(self.años, desde)
+        fin = len(self.años) if hasta is None else np.searchsorted(self.años, hasta, side='right')
+        corte = self.conteos[inicio:fin]
+        if grupos is not None:
+            corte = corte[:, [GRUPOS_TORNEO.index(g) for g in grupos]]
+        if neutral is not None:
+            corte = corte[:, :, [int(neutral)]]
+        return corte.sum(axis=(0, 1, 2))
+
+
+def build_scoreline_tensor(celdas):
+    """Arma el tensor a partir del agregado 'scoreline_cells' (ver analytics.aggregates)."""
+    años_celdas = celdas.index.get_level_values('year').to_numpy()
+    años = np.arange(años_celdas.min(), años_celdas.max() + 1) if len(celdas) else np.array([], dtype=np.int64)
+    conteos = np.zeros((len(años), len(GRUPOS_TORNEO), 2, MAX_GOLES + 1, MAX_GOLES + 1), dtype=np.int32)
+    np.add.at(conteos, (
+        años_celdas - (años[0] if len(años) else 0),
+        pd.Index(GRUPOS_TORNEO).get_indexer(celdas.index.get_level_values('grupo')),
+        celdas.index.get_level_values('neutral').to_numpy().astype(np.int64),
+        np.minimum(celdas.index.get_level_values('home_score').to_numpy(), MAX_GOLES),
+        np.minimum(celdas.index.get_level_values('away_score').to_numpy(), MAX_GOLES),
+    ), celdas['partidos'].to_numpy())
+    return ScorelineTensor(años, conteos)
+
+
+@instrumentar()
+def scoreline_matrix(tensor, max_goles=7, desde=None, hasta=None, grupos=None, neutral=None):
+    """Matriz goles local x goles visitante (0..max_goles) con el número de partidos.
+
+    Los filtros son los de ScorelineTensor.matrix.
+    """
+    matriz = tensor.matrix(desde, hasta, grupos, neutral)[:max_goles + 1, :max_goles + 1]
+    return pd.DataFrame(matriz, index=pd.RangeIndex(len(matriz)), columns=pd.RangeIndex(len(matriz)))
+
+
+@instrumentar()
+def scoreline_stats(tensor, desde=None, hasta=None, grupos=None, neutral=None):
+    """Partidos, marcador más común y porcentajes de valla invicta de los partidos filtrados.
+
+    Devuelve un dict con partidos, marcador_mas_comun ((local, visitante,
+    partidos), None si no hay partidos), pct_valla_invicta (al menos un
+    equipo sin recibir goles) y pct_sin_goles (0-0).
+    """
+    matriz = tensor.matrix(desde, hasta, grupos, neutral)
+    partidos = int(matriz.sum())
+    if partidos == 0:
+        return {'partidos': 0, 'marcador_mas_comun': None, 'pct_valla_invicta': np.nan, 'pct_sin_goles': np.nan}
+    local, visitante = np.unravel_index(np.argmax(matriz), matriz.shape)
+    invictas = matriz[0].sum() + matriz[:, 0].sum() - matriz[0, 0]
+    return {
+        'partidos': partidos,
+        'marcador_mas_comun': (int(local), int(visitante), int(matriz[local, visitante])),
+        'pct_valla_invicta': invictas / partidos * 100,
+        'pct_sin_goles': matriz[0, 0] / partidos * 100,
+    }
+
+
+@instrumentar()
+def goal_records(results):
+    """Récords y promedios de goles de todos los partidos.
+
+    Devuelve un dict con max_goles_local, partido_max_goles (primera fila de
+    results con ese número de goles del local), promedio_goles,
+    partidos_sin_goles y pct_sin_goles.
+    """
+    max_goles = results['home_score'].max()
+    sin_goles = int(((results['home_score'] == 0) & (results['away_score'] == 0)).sum())
+    return {
+        'max_goles_local': max_goles,
+        'partido_max_goles': results[results['home_score'] == max_goles].iloc[0],
+        'promedio_goles': (results['home_score'] + results['away_score']).mean(),
+        'partidos_sin_goles': sin_goles,
+        'pct_sin_goles': sin_goles / len(results) * 100,
+    }
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from analytics.cache import memoize_per_data
+
+# Desgloses disponibles en shootout_breakdown
+DESGLOSES = ['continent', 'tournament', 'decade', 'team']
+COLUMNAS_DESGLOSE = ['tandas', 'con_primer_tirador', 'gana_primero', 'porcentaje', 'ic_inferior', 'ic_superior']
+
+
+@memoize_per_data(maxsize=1, tabla='shootouts')
+def shootout_table(datos):
+    """Tandas de penales con el contexto de su partido en results.
+
+    Una fila por tanda, en el orden de shootouts. El torneo y si fue en cancha
+    neutral salen del partido (por match_id); las pocas tandas sin partido en
+    results quedan sin torneo. results no tiene la fase del torneo, así que no
+    hay columna de ronda. `first_shooter_known` indica si se sabe quién tiró
+    primero: solo esas filas cuentan para `first_shooter_won`.
+    """
+    tandas = datos.shootouts
+    results = datos.results
+    match_id = tandas['match_id'].to_numpy()
+    con_partido = match_id >= 0
+    fila = np.where(con_partido, match_id, 0)
+
+    torneos = results['tournament']
+    codigo_torneo = np.where(con_partido, torneos.cat.codes.to_numpy()[fila], -1)
+    year = tandas['date'].dt.year.to_numpy().astype(np.int16)
+
+    ganador = tandas['winner'].cat.codes.to_numpy()
+    primero = tandas['first_shooter'].cat.codes.to_numpy()
+    conocido = primero >= 0
+
+    return pd.DataFrame({
+        'match_id': match_id,
+        'year': year,
+        'decade': (year // 10) * 10,
+        'tournament': pd.Categorical.from_codes(codigo_torneo, categories=torneos.cat.categories),
+        'neutral': np.where(con_partido, results['neutral'].to_numpy()[fila], False),
+        'home_team': tandas['home_team'],
+        'away_team': tandas['away_team'],
+        'winner': tandas['winner'],
+        'first_shooter': tandas['first_shooter'],
+        'continents': datos.continents.of_teams(tandas['home_team']) | datos.continents.of_teams(tandas['away_team']),
+        'winner_is_home': ganador == tandas['home_team'].cat.codes.to_numpy(),
+        'first_shooter_known': conocido,
+        'first_shooter_won': conocido & (primero == ganador),
+    })
+
+
+def _grupos(tabla, por, continents):
+    """(filas de la tabla, id de grupo de cada una, etiquetas de los grupos).
+
+    Una tanda puede caer en más de un grupo: por equipo cuenta para los dos y
+    por continente para cada continente de sus equipos.
+    """
+    n = len(tabla)
+    if por == 'tournament':
+        return np.arange(n), tabla['tournament'].cat.codes.to_numpy(), tabla['tournament'].cat.categories
+    if por == 'decade':
+        decadas, ids = np.unique(tabla['decade'].to_numpy(), return_inverse=True)
+        return np.arange(n), ids, pd.Index(decadas)
+    if por == 'team':
+        filas = np.concatenate([np.arange(n), np.arange(n)])
+        ids = np.concatenate([tabla['home_team'].cat.codes.to_numpy(), tabla['away_team'].cat.codes.to_numpy()])
+        return filas, ids, tabla['home_team'].cat.categories
+    if por == 'continent':
+        continentes = tabla['continents'].to_numpy()
+        filas = [np.flatnonzero(continents.mask(continentes, nombre)) for nombre in continents.names]
+        ids = [np.full(len(f), c) for c, f in enumerate(filas)]
+        return np.concatenate(filas), np.concatenate(ids), continents.names
+    raise ValueError(f"Desglose desconocido: {por}")
+
+
+def _intervalo_bootstrap(ganadas, n, n_boot, seed):
+    """Intervalo percentil del 95% (en %) de la proporción ganadas / n de cada grupo.
+
+    Remuestrear con reemplazo n resultados de los que k son victorias equivale
+    a sacar Binomial(n, k / n), así que el bootstrap de todos los grupos se
+    genera de una vez sin repetir los datos.
+    """
+    rng = np.random.default_rng(seed)
+    p = np.divide(ganadas, n, out=np.zeros(len(n)), where=n > 0)
+    muestras = rng.binomial(n[:, None], p[:, None], size=(len(n), n_boot)) / np.maximum(n, 1)[:, None]
+    inferior, superior = np.percentile(muestras, [2.5, 97.5], axis=1) * 100
+    return inferior, superior
+
+
+@memoize_per_data(maxsize=16)
+def shootout_breakdown(datos, por, n_boot=1000, seed=0):
+    """Ventaja de tirar primero en la tanda agrupando por `por` (uno de DESGLOSES).
+
+    Columnas: tandas (todas las del grupo), con_primer_tirador (las que tienen
+    el dato), gana_primero, porcentaje (sobre las que tienen el dato) y el
+    intervalo bootstrap del 95% de ese porcentaje. Solo grupos con tandas.
+    """
+    tabla = shootout_table(datos)
+    filas, ids, etiquetas = _grupos(tabla, por, datos.continents)
+    validos = ids >= 0
+    filas, ids = filas[validos], ids[validos]
+
+    def contar(columna=None):
+        pesos = None if columna is None else tabla[columna].to_numpy()[filas]
+        return np.bincount(ids, weights=pesos, minlength=len(etiquetas)).astype(np.int64)
+
+    total = contar()
+    conocidas = contar('first_shooter_known')
+    ganadas = contar('first_shooter_won')
+    inferior, superior = _intervalo_bootstrap(ganadas, conocidas, n_boot, seed)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        porcentaje = ganadas / conocidas * 100
+
+    resumen = pd.DataFrame({
+        'tandas': total,
+        'con_primer_tirador': conocidas,
+        'gana_primero': ganadas,
+        'porcentaje': porcentaje,
+        'ic_inferior': np.where(conocidas > 0, inferior, np.nan),
+        'ic_superior': np.where(conocidas > 0, superior, np.nan),
+    }, index=pd.Index(etiquetas, name=por), columns=COLUMNAS_DESGLOSE)
+    return resumen[resumen['tandas'] > 0]
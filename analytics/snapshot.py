@@ -0,0 +1,196 @@
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+import pyarrow.feather as feather
+from pandas.api.types import union_categoricals
+
+# Carpeta donde se guardan los snapshots columnares de los CSV
+CACHE_DIR = os.path.join('data', '.cache')
+
+# Subir este número cuando cambie la forma de construir las columnas derivadas
+SNAPSHOT_VERSION = 7
+
+
+def _rutas(cache_dir, nombre):
+    base = os.path.join(cache_dir, nombre)
+    return base + '.arrow', base + '.json'
+
+
+def _ruta_agregado(cache_dir, nombre, tabla):
+    return os.path.join(cache_dir, f'{nombre}.{tabla}.arrow')
+
+
+def _hash_archivo(ruta, prefijo=None):
+    """Calcula el sha1 del contenido del archivo.
+
+    Si se indica `prefijo` devuelve también el sha1 de los primeros `prefijo`
+    bytes, calculado en la misma pasada: `(sha1_prefijo, sha1_total)`.
+    """
+    h = hashlib.sha1()
+    h_prefijo = None
+    leidos = 0
+    with open(ruta, 'rb') as f:
+        if prefijo is not None:
+            while leidos < prefijo:
+                bloque = f.read(min(1 << 20, prefijo - leidos))
+                if not bloque:
+                    break
+                h.update(bloque)
+                leidos += len(bloque)
+            h_prefijo = h.hexdigest()
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    if prefijo is None:
+        return h.hexdigest()
+    return h_prefijo, h.hexdigest()
+
+
+def _firma(ruta):
+    st_csv = os.stat(ruta)
+    return {'size': st_csv.st_size, 'mtime_ns': st_csv.st_mtime_ns}
+
+
+def _leer_meta(ruta_meta):
+    try:
+        with open(ruta_meta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _escribir_meta(ruta_meta, meta):
+    tmp = ruta_meta + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp, ruta_meta)
+
+
+def _escribir_arrow(df, ruta):
+    tmp = ruta + '.tmp'
+    feather.write_feather(df, tmp, compression='uncompressed')
+    os.replace(tmp, ruta)
+
+
+def _leer_arrow(ruta):
+    return feather.read_table(ruta, memory_map=True).to_pandas()
+
+
+def _estado_snapshot(ruta_csv, meta):
+    """Compara el CSV actual con el snapshot descrito por `meta`.
+
+    Devuelve `(estado, sha1)` con estado 'valido', 'append' (el CSV solo
+    creció al final) o 'invalido'. Si coinciden tamaño y mtime no se lee el
+    CSV. Si cambia alguno de los dos se compara el hash del contenido, así un
+    checkout que solo toca el mtime no obliga a reconstruir.
+    """
+    if meta is None or meta.get('version') != SNAPSHOT_VERSION:
+        return 'invalido', None
+
+    firma = _firma(ruta_csv)
+    if firma == {'size': meta['size'], 'mtime_ns': meta['mtime_ns']}:
+        return 'valido', None
+
+    if firma['size'] == meta['size']:
+        sha1 = _hash_archivo(ruta_csv)
+        return ('valido' if sha1 == meta['sha1'] else 'invalido'), sha1
+
+    if firma['size'] > meta['size']:
+        sha1_prefijo, sha1 = _hash_archivo(ruta_csv, prefijo=meta['size'])
+        if sha1_prefijo == meta['sha1']:
+            return 'append', sha1
+
+    return 'invalido', None
+
+
+def _leer_cola(ruta_csv, desde, encabezado=True):
+    """Devuelve el encabezado del CSV (si tiene) seguido solo de los bytes a partir de `desde`."""
+    with open(ruta_csv, 'rb') as f:
+        encabezado = f.readline() if encabezado else b''
+        f.seek(desde)
+        cola = f.read()
+    return io.BytesIO(encabezado + cola)
+
+
+def _concatenar(viejo, nuevo):
+    """Concatena dos DataFrames conservando las columnas categóricas."""
+    columnas = {}
+    for col in viejo.columns:
+        if isinstance(viejo[col].dtype, pd.CategoricalDtype):
+            columnas[col] = pd.Series(union_categoricals([viejo[col], nuevo[col]]))
+        else:
+            columnas[col] = pd.concat([viejo[col], nuevo[col]], ignore_index=True)
+    return pd.DataFrame(columnas)
+
+
+def _guardar(cache_dir, nombre, df, agregados, meta):
+    """Escribe el snapshot, sus agregados y el json de metadatos."""
+    ruta_datos, ruta_meta = _rutas(cache_dir, nombre)
+    os.makedirs(cache_dir, exist_ok=True)
+    _escribir_arrow(df, ruta_datos)
+    for tabla, valores in agregados.items():
+        _escribir_arrow(valores.reset_index(), _ruta_agregado(cache_dir, nombre, tabla))
+    meta['agregados'] = {tabla: list(valores.index.names) for tabla, valores in agregados.items()}
+    _escribir_meta(ruta_meta, meta)
+
+
+def _cargar_agregados(cache_dir, nombre, meta):
+    return {
+        tabla: _leer_arrow(_ruta_agregado(cache_dir, nombre, tabla)).set_index(indice)
+        for tabla, indice in meta.get('agregados', {}).items()
+    }
+
+
+def load_snapshot(nombre, ruta_csv, construir, agregar=None, combinar=None, cache_dir=CACHE_DIR,
+                  encabezado=True):
+    """Devuelve `(df, agregados)` para el CSV `ruta_csv` ya procesado por `construir`.
+
+    La primera vez se parsea el CSV y se guarda un snapshot Arrow sin comprimir
+    con las columnas derivadas; en los siguientes arranques se lee con memory
+    map sin volver a parsear el CSV. El snapshot se invalida solo cuando cambia
+    el tamaño, el mtime o el hash del CSV de origen.
+
+    Si el CSV solo creció agregando filas al final (el hash de los bytes ya
+    conocidos no cambió) se parsea solo la cola, se agrega al snapshot y los
+    agregados se actualizan con `combinar(viejos, agregar(cola))` en lugar de
+    recalcularse sobre todo el histórico.
+
+    `agregar(df)` devuelve un dict de DataFrames derivados; sin `agregar` el
+    dict de agregados queda vacío. Los archivos se guardan en `cache_dir`.
+    Con `encabezado=False` (CSV sin fila de encabezado) la cola se parsea sola.
+    """
+    ruta_datos, ruta_meta = _rutas(cache_dir, nombre)
+    meta = _leer_meta(ruta_meta) if os.path.exists(ruta_datos) else None
+    estado, sha1 = _estado_snapshot(ruta_csv, meta)
+
+    if estado == 'valido':
+        df = _leer_arrow(ruta_datos)
+        agregados = _cargar_agregados(cache_dir, nombre, meta)
+        if sha1 is not None:
+            try:
+                _escribir_meta(ruta_meta, {**meta, **_firma(ruta_csv)})
+            except OSError:
+                pass
+        return df, agregados
+
+    firma = _firma(ruta_csv)
+    if estado == 'append':
+        cola = construir(_leer_cola(ruta_csv, meta['size'], encabezado))
+        df = _concatenar(_leer_arrow(ruta_datos), cola)
+        agregados = _cargar_agregados(cache_dir, nombre, meta)
+        if agregar is not None:
+            agregados = combinar(agregados, agregar(cola))
+    else:
+        sha1 = _hash_archivo(ruta_csv)
+        df = construir(ruta_csv)
+        agregados = agregar(df) if agregar is not None else {}
+
+    # Si no se puede escribir (disco de solo lectura, etc.) seguimos sin snapshot
+    try:
+        _guardar(cache_dir, nombre, df, agregados, {'version': SNAPSHOT_VERSION, 'sha1': sha1, **firma})
+    except OSError:
+        pass
+
+    return df, agregados
@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Código de resultado desde el punto de vista del equipo
+VICTORIA, EMPATE, DERROTA = 1, 0, -1
+
+
+@dataclass(frozen=True, eq=False)
+class TeamMatches:
+    """Tabla larga con una fila por equipo y partido.
+
+    `table` está ordenada por código de equipo y luego por match_id, así que
+    los partidos del equipo `t` son el bloque `offsets[t]:offsets[t + 1]`.
+    Se compara por identidad para poder usarla como clave de caché.
+    """
+    table: pd.DataFrame
+    offsets: np.ndarray
+
+    def of(self, team_id):
+        """Partidos del equipo (en orden cronológico), sin recorrer la tabla."""
+        if team_id < 0:
+            return self.table.iloc[0:0]
+        return self.table.iloc[self.offsets[team_id]:self.offsets[team_id + 1]]
+
+    def of_team(self, nombre):
+        """Igual que `of` pero recibiendo el nombre del equipo."""
+        return self.of(self.table['team'].cat.categories.get_indexer([nombre])[0])
+
+
+def build_team_matches(results):
+    """Construye la tabla larga a partir de results, de forma vectorizada.
+
+    Cada partido aporta dos filas: la del local (is_home=True) y la del
+    visitante, con los goles intercambiados. `continents` es la máscara de
+    continentes del equipo (ver analytics.continents).
+    """
+    n = len(results)
+    local = results['home_team'].cat.codes.to_numpy()
+    visitante = results['away_team'].cat.codes.to_numpy()
+    goles_local = results['home_score'].to_numpy()
+    goles_visitante = results['away_score'].to_numpy()
+
+    equipo = np.concatenate([local, visitante])
+    match_id = np.tile(results['match_id'].to_numpy(), 2)
+    orden = np.lexsort((match_id, equipo))
+
+    def lados(a, b):
+        return np.concatenate([a, b])[orden]
+
+    def doble(valores):
+        return np.tile(valores, 2)[orden]
+
+    equipos = results['home_team'].cat.categories
+    goals_for = lados(goles_local, goles_visitante)
+    goals_against = lados(goles_visitante, goles_local)
+    result = np.sign(goals_for.astype(np.int16) - goals_against).astype(np.int8)
+    torneos = results['tournament']
+
+    table = pd.DataFrame({
+        'match_id': match_id[orden],
+        'date': doble(results['date'].to_numpy()),
+        'year': doble(results['year'].to_numpy()),
+        'team': pd.Categorical.from_codes(equipo[orden], categories=equipos),
+        'opponent': pd.Categorical.from_codes(lados(visitante, local), categories=equipos),
+        'continents': lados(results['home_continents'].to_numpy(), results['away_continents'].to_numpy()),
+        'is_home': np.repeat([True, False], n)[orden],
+        'neutral': doble(results['neutral'].to_numpy()),
+        'tournament': pd.Categorical.from_codes(doble(torneos.cat.codes.to_numpy()),
+                                                categories=torneos.cat.categories),
+        'goals_for': goals_for,
+        'goals_against': goals_against,
+        'result': result,
+        'points': np.select([result == VICTORIA, result == EMPATE], [3, 1], 0).astype(np.int8),
+    })
+
+    offsets = np.zeros(len(equipos) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(equipo, minlength=len(equipos)), out=offsets[1:])
+    return TeamMatches(table, offsets)
@@ -0,0 +1,79 @@
+import pandas as pd
+
+from analytics.head_to_head import rivals_table
+from analytics.instrumentation import instrumentar
+from analytics.team_matches import VICTORIA, EMPATE, DERROTA
+from analytics.team_summary import team_summary, top_teams
+
+
+def team_periods(cubo):
+    """Años que se pueden elegir en el selector de período (`cubo` es DataBundle.years)."""
+    return cubo.años_con_partidos()
+
+
+@instrumentar()
+def teams_in_period(cubo, start_year, end_year):
+    """Equipos que jugaron en el período, en orden alfabético."""
+    return team_summary(cubo, start_year, end_year).index.tolist()
+
+
+def team_period_matches(team_matches, equipo, start_year, end_year):
+    """Partidos del equipo en el período: bloque contiguo de la tabla larga filtrado por año."""
+    partidos = team_matches.of_team(equipo)
+    return partidos[(partidos['year'] >= start_year) & (partidos['year'] <= end_year)]
+
+
+@instrumentar(tabla='table')
+def team_record(team_matches, equipo, start_year, end_year):
+    """Rendimiento general del equipo en el período.
+
+    Devuelve un dict con local y visitante (Series Victoria/Empate/Derrota),
+    partidos, pct_victorias y promedio_goles (goles a favor por partido).
+    """
+    partidos = team_period_matches(team_matches, equipo, start_year, end_year)
+    es_local = partidos['is_home'].to_numpy()
+    resultado = partidos['result'].to_numpy()
+
+    def conteo(lado):
+        return pd.Series({
+            'Victoria': int(((resultado == VICTORIA) & lado).sum()),
+            'Empate': int(((resultado == EMPATE) & lado).sum()),
+            'Derrota': int(((resultado == DERROTA) & lado).sum()),
+        })
+
+    total = len(partidos)
+    victorias = int((resultado == VICTORIA).sum())
+    goles_favor = int(partidos['goals_for'].sum())
+    return {
+        'local': conteo(es_local),
+        'visitante': conteo(~es_local),
+        'partidos': total,
+        'pct_victorias': (victorias / total * 100) if total > 0 else 0,
+        'promedio_goles': goles_favor / total if total > 0 else 0,
+    }
+
+
+@instrumentar(tabla='table')
+def team_goals(team_matches, equipo, start_year, end_year):
+    """Goles a favor por partido del equipo en el período: (como local, como visitante)."""
+    partidos = team_period_matches(team_matches, equipo, start_year, end_year)
+    es_local = partidos['is_home'].to_numpy()
+    return partidos['goals_for'][es_local], partidos['goals_for'][~es_local]
+
+
+@instrumentar(tabla='table')
+def top_rivals(team_matches, equipo, start_year, end_year, n=10):
+    """Los `n` rivales más frecuentes con victorias, % de victoria y goles promedio."""
+    rivales = rivals_table(team_matches, equipo, start_year, end_year)
+    rivales = rivales.sort_values('total_matches', ascending=False, kind='stable').head(n)
+    return rivales.assign(
+        avg_goals_favor=rivales['goals_favor'] / rivales['total_matches'],
+        avg_goals_against=rivales['goals_against'] / rivales['total_matches'],
+    )
+
+
+@instrumentar()
+def teams_overview(cubo, start_year, end_year, n=10):
+    """Totales de todos los equipos del período y el top `n` por partidos jugados."""
+    return (team_summary(cubo, start_year, end_year).reset_index(),
+            top_teams(cubo, start_year, end_year, 'partidos', n).reset_index())
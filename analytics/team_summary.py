@@ -0,0 +1,17 @@
+from analytics.cache import memoize_per_data
+
+
+@memoize_per_data(maxsize=64)
+def team_summary(cubo, start_year, end_year):
+    """Partidos, V/E/D y goles de todos los equipos en el período.
+
+    Sale del cubo acumulado por año (DataBundle.years; diferencia de dos filas), así que no
+    depende del tamaño del dataset. Devuelve un DataFrame indexado por equipo
+    (orden alfabético) con solo los equipos que jugaron en el período.
+    """
+    return cubo.equipos(start_year, end_year)
+
+
+def top_teams(cubo, start_year, end_year, columna, n=10):
+    """Los `n` equipos con mayor `columna` en el período (empates: orden alfabético)."""
+    return team_summary(cubo, start_year, end_year).nlargest(n, columna)
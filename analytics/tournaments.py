@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from analytics.aggregates import RESULTADOS
+from analytics.box_summary import box_summary_counts
+from analytics.instrumentation import instrumentar
+
+
+def tournament_names(results):
+    """Torneos en el orden en que aparecen por primera vez en results."""
+    return results['tournament'].unique()
+
+
+def _filas(tabla, torneos):
+    """Filas de los `torneos` en un agregado indexado por (tournament, ...)."""
+    return tabla[tabla.index.get_level_values('tournament').isin(list(torneos))]
+
+
+@instrumentar()
+def tournament_stats(tabla, torneos):
+    """Partidos, promedio y máximo de goles, porterías imbatidas y goles totales por torneo.
+
+    `tabla` es el agregado por torneo y año (aggregates['tournament_year']).
+    Devuelve un DataFrame con la columna Torneo y una fila por torneo de
+    `torneos`, en ese orden.
+    """
+    por_torneo = _filas(tabla, torneos).groupby(level='tournament').agg(
+        {'partidos': 'sum', 'goles': 'sum', 'max_goles': 'max', 'porterias_imbatidas': 'sum'}
+    ).reindex(list(torneos))
+    return pd.DataFrame({
+        'Torneo': list(torneos),
+        'Partidos': por_torneo['partidos'].fillna(0).astype(np.int64).to_numpy(),
+        'Promedio Goles': (por_torneo['goles'] / por_torneo['partidos']).round(2).to_numpy(),
+        'Máximo Goles': por_torneo['max_goles'].to_numpy(),
+        'Porterías Imbatidas': por_torneo['porterias_imbatidas'].fillna(0).astype(np.int64).to_numpy(),
+        'Goles Totales': por_torneo['goles'].fillna(0).astype(np.int64).to_numpy(),
+    })
+
+
+@instrumentar()
+def tournament_results(tabla, torneos):
+    """Porcentaje de victorias locales, empates y victorias visitantes por torneo (índice Torneo)."""
+    conteos = _filas(tabla, torneos)[RESULTADOS].groupby(level='tournament').sum().reindex(list(torneos))
+    return (conteos.div(conteos.sum(axis=1), axis=0) * 100).rename_axis('Torneo')
+
+
+@instrumentar()
+def tournament_goals_summary(tabla, torneo):
+    """Resumen de box plot de los goles por partido del torneo.
+
+    `tabla` es el histograma aggregates['tournament_goals']; el resumen se
+    arma sin expandirlo a un valor por partido. None si el torneo no tiene partidos.
+    """
+    goles = _filas(tabla, [torneo])
+    return box_summary_counts(goles.index.get_level_values('goles'), goles['partidos'])
+
+
+@instrumentar()
+def tournament_yearly_goals(tabla, torneos):
+    """Goles totales por torneo y año (columnas tournament, year y total_goals)."""
+    goles = _filas(tabla, torneos)['goles']
+    return goles.rename('total_goals').reset_index()
@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analytics.aggregates import RESULTADOS
+
+METRICAS_EQUIPO = ['partidos', 'victorias', 'empates', 'derrotas', 'goles', 'goles_contra']
+
+
+@dataclass(frozen=True, eq=False)
+class YearCube:
+    """Sumas acumuladas por año para consultar cualquier período en tiempo constante.
+
+    Todos los arreglos tienen una fila por año desde `primer_año` más una fila
+    inicial de ceros, de modo que el total de [inicio, fin] es
+    `acumulado[fin - primer_año + 1] - acumulado[inicio - primer_año]`.
+    """
+    primer_año: int
+    años: np.ndarray
+    teams: pd.Index
+    por_resultado: np.ndarray      # (años + 1, 3) partidos por RESULTADOS
+    goles: np.ndarray              # (años + 1,) goles totales
+    goles_local: np.ndarray        # (años + 1, máx + 1) partidos por goles del local
+    goles_visitante: np.ndarray    # (años + 1, máx + 1) partidos por goles del visitante
+    por_equipo: dict               # métrica -> (años + 1, equipos)
+
+    def _filas(self, start_year, end_year):
+        inicio = int(np.clip(start_year - self.primer_año, 0, len(self.años)))
+        fin = int(np.clip(end_year - self.primer_año + 1, 0, len(self.años)))
+        return inicio, max(fin, inicio)
+
+    def periodo(self, acumulado, start_year, end_year):
+        """Total de `acumulado` en [start_year, end_year]: diferencia de dos filas."""
+        inicio, fin = self._filas(start_year, end_year)
+        return acumulado[fin] - acumulado[inicio]
+
+    def por_año(self, acumulado, start_year, end_year):
+        """Valores año por año en el período (diferencias consecutivas)."""
+        inicio, fin = self._filas(start_year, end_year)
+        return pd.DataFrame(np.diff(acumulado[inicio:fin + 1], axis=0),
+                            index=pd.Index(self.años[inicio:fin], name='year'))
+
+    def años_con_partidos(self):
+        """Años en los que hubo al menos un partido."""
+        return self.años[np.diff(self.por_resultado.sum(axis=1)) > 0]
+
+    def resumen_partidos(self, start_year, end_year):
+        """Partidos, goles y resultados del período."""
+        resultados = self.periodo(self.por_resultado, start_year, end_year)
+        return {
+            'partidos': int(resultados.sum()),
+            'goles': int(self.periodo(self.goles, start_year, end_year)),
+            **{nombre: int(n) for nombre, n in zip(RESULTADOS, resultados)},
+        }
+
+    def marcador_mas_comun(self, start_year, end_year):
+        """Moda de los goles del local y del visitante en el período."""
+        local = self.periodo(self.goles_local, start_year, end_year)
+        visitante = self.periodo(self.goles_visitante, start_year, end_year)
+        return int(local.argmax()), int(visitante.argmax())
+
+    def equipos(self, start_year, end_year):
+        """Totales por equipo en el período (solo equipos que jugaron)."""
+        tabla = pd.DataFrame(
+            {m: self.periodo(self.por_equipo[m], start_year, end_year) for m in METRICAS_EQUIPO},
+            index=pd.Index(self.teams, name='equipo'),
+        )
+        return tabla[tabla['partidos'] > 0]
+
+
+def _acumular(años_idx, n_años, pesos=None, columnas=None, n_columnas=1):
+    """Suma por (año, columna) y acumula sobre los años, con la fila de ceros inicial."""
+    if columnas is None:
+        conteo = np.bincount(años_idx, weights=pesos, minlength=n_años)
+    else:
+        celda = años_idx * n_columnas + columnas
+        conteo = np.bincount(celda, weights=pesos, minlength=n_años * n_columnas)
+        conteo = conteo.reshape(n_años, n_columnas)
+    conteo = conteo.astype(np.int64)
+    return np.concatenate([np.zeros((1,) + conteo.shape[1:], dtype=np.int64),
+                           np.cumsum(conteo, axis=0)])
+
+
+def build_year_cube(celdas, equipos_año, teams):
+    """Arma el cubo a partir de los agregados 'scoreline_cells' y 'team_year' (ver analytics.aggregates).
+
+    Los agregados se actualizan por delta cuando results crece, así que el
+    cubo no vuelve a recorrer los partidos. `teams` es el diccionario
+    compartido de equipos, que define el orden de las columnas por equipo.
+    """
+    años_celdas = celdas.index.get_level_values('year').to_numpy().astype(np.int64)
+    primer_año = int(años_celdas.min())
+    n_años = int(años_celdas.max()) - primer_año + 1
+    idx = años_celdas - primer_año
+
+    # Por partido: una celda por (año, marcador) con su número de partidos
+    partidos = celdas['partidos'].to_numpy()
+    gl = celdas.index.get_level_values('home_score').to_numpy().astype(np.int64)
+    gv = celdas.index.get_level_values('away_score').to_numpy().astype(np.int64)
+    # Victoria del local -> 0, empate -> 1, victoria del visitante -> 2 (orden de RESULTADOS)
+    tipo = 1 - np.sign(gl - gv)
+    max_goles = int(max(gl.max(), gv.max()))
+
+    # Por (equipo, año)
+    idx_equipo = equipos_año.index.get_level_values('year').to_numpy().astype(np.int64) - primer_año
+    codigos = teams.get_indexer(equipos_año.index.get_level_values('team'))
+
+    return YearCube(
+        primer_año=primer_año,
+        años=np.arange(primer_año, primer_año + n_años),
+        teams=teams,
+        por_resultado=_acumular(idx, n_años, partidos, columnas=tipo, n_columnas=3),
+        goles=_acumular(idx, n_años, pesos=partidos * (gl + gv)),
+        goles_local=_acumular(idx, n_años, partidos, columnas=gl, n_columnas=max_goles + 1),
+        goles_visitante=_acumular(idx, n_años, partidos, columnas=gv, n_columnas=max_goles + 1),
+        por_equipo={m: _acumular(idx_equipo, n_años, equipos_año[m].to_numpy(), codigos, len(teams))
+                    for m in METRICAS_EQUIPO},
+    )
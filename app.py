@@ -1,7 +1,7 @@
 import streamlit as st
 from config import setup_page
-import pandas as pd
-from data_loader import load_data
+import debug_panel
+from data_loader import load_bundle
 from tabs import (
     team_presentation,
     historical_results,
@@ -14,49 +14,36 @@ from tabs import (
 
 # Configuración inicial
 setup_page()
-df = load_data()
+with debug_panel.medir("carga"):
+    datos = load_bundle()
 
-df_countries = pd.read_csv('data/countries.csv', encoding='cp1252')  # Especificando la codificación correcta
-df_shootouts = pd.read_csv('data/shootouts.csv')
-df_goalscorers = pd.read_csv('data/goalscorers.csv')
+# Título
+st.title("⚽ Análisis Interactivo del Fútbol Internacional")
 
-# Crear una columna 'year' si no existe
-if 'year' not in df.columns:
-    df['year'] = pd.to_datetime(df['date']).dt.year
+# Secciones: título -> (nombre para las mediciones, función que dibuja la sección)
+SECCIONES = {
+    "👥 Presentación del Grupo": ("team_presentation", lambda datos: team_presentation.show()),
+    "📈 Resultados Históricos": ("historical_results", historical_results.show),
+    "🔰 Análisis por Equipo": ("team_analysis", team_analysis.show),
+    "🏆 Comparativa de Torneos": ("tournament_comparison", tournament_comparison.show),
+    "⚽ Patrones de Goles": ("goal_patterns", goal_patterns.show),
+    "🌎 Comparativa de Continentes": ("continents_analysts", continents_analysts.show),
+    "💡 Otros Análisis": ("other_analysis", other_analysis.show),
+}
 
-# Crear columna 'resultado' si no existe
-if 'resultado' not in df.columns:
-    df['resultado'] = df.apply(lambda row: 
-        'Victoria Local' if row['home_score'] > row['away_score']
-        else 'Victoria Visitante' if row['home_score'] < row['away_score']
-        else 'Empate', axis=1)
 
-# Título
-st.title("⚽ Análisis Interactivo del Fútbol Internacional")
+@st.fragment
+def mostrar_seccion(titulo, datos):
+    """Dibuja la sección elegida; sus widgets vuelven a ejecutar solo esta función."""
+    nombre, mostrar = SECCIONES[titulo]
+    with debug_panel.medir(nombre):
+        mostrar(datos)
+
+
+# Solo se calcula la sección visible (st.tabs ejecutaría las siete en cada interacción)
+seccion = st.radio("Sección", list(SECCIONES), horizontal=True, key="seccion",
+                   label_visibility="collapsed")
+mostrar_seccion(seccion, datos)
 
-# Definición de tabs
-tab0, tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-    "👥 Presentación del Grupo",
-    "📈 Resultados Históricos",
-    "🔰 Análisis por Equipo",
-    "🏆 Comparativa de Torneos",
-    "⚽ Patrones de Goles",
-    "🌎 Comparativa de Continentes",
-    "💡 Otros Análisis"
-])
-
-# Contenido de cada tab
-with tab0:
-    team_presentation.show()
-with tab1:
-    historical_results.show(df)
-with tab2:
-    team_analysis.show(df)
-with tab3:
-    tournament_comparison.show(df)
-with tab4:
-    goal_patterns.show(df)
-with tab5:
-    continents_analysts.show(df, df_countries, df_shootouts)
-with tab6:
-    other_analysis.show(df, df_countries, df_goalscorers)
\ No newline at end of file
+# Tiempos y cachés de esta ejecución (log y barra lateral opcional)
+debug_panel.show()
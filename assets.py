@@ -0,0 +1,38 @@
+import base64
+import io
+import os
+
+import streamlit as st
+from PIL import Image
+
+# Ancho con el que se muestran las fotos del equipo
+ANCHO_MINIATURA = 150
+
+
+@st.cache_resource(max_entries=32)
+def _miniatura(ruta, ancho, firma):
+    with open(ruta, 'rb') as f:
+        original = f.read()
+    with Image.open(io.BytesIO(original)) as imagen:
+        if imagen.width <= ancho and imagen.format == 'WEBP':
+            datos = original
+        else:
+            alto = round(imagen.height * ancho / imagen.width)
+            salida = io.BytesIO()
+            imagen.resize((ancho, alto), Image.Resampling.LANCZOS).save(
+                salida, format='WEBP', quality=80, method=6)
+            datos = salida.getvalue()
+    return 'data:image/webp;base64,' + base64.b64encode(datos).decode('utf-8')
+
+
+def thumbnail_data_uri(ruta, ancho=ANCHO_MINIATURA):
+    """Miniatura de `ruta` con `ancho` píxeles, como data URI WebP listo para un <img>.
+
+    Se lee, reduce y codifica una sola vez por proceso y se comparte entre
+    sesiones; si el archivo cambia (tamaño o fecha) se vuelve a generar.
+    Devuelve "" si el archivo no existe.
+    """
+    if not os.path.exists(ruta):
+        return ""
+    estado = os.stat(ruta)
+    return _miniatura(ruta, ancho, (estado.st_size, estado.st_mtime_ns))
@@ -0,0 +1 @@
+"""Benchmarks de los cálculos de cada tab (ver `python -m benchmarks --help`)."""
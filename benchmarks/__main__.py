@@ -0,0 +1,120 @@
+"""Mide tiempo y pico de memoria de los cálculos de cada tab y detecta regresiones.
+
+    python -m benchmarks                         # escalas de la línea base, compara con ella
+    python -m benchmarks --escalas 1 10 100      # escalas explícitas (por defecto 1, 10 y 100 sin línea base)
+    python -m benchmarks --escalas 1 10 --guardar   # guarda las mediciones como nueva línea base
+    python -m benchmarks --umbral 0.5            # regresión si algo tarda un 50% más
+    python -m benchmarks --escalas 1 --sintetico 1000000   # además, un millón de partidos sintéticos
+
+Sale con código 1 si alguna medición supera a la línea base en más del umbral
+y con código 2 si no hay línea base (salvo con --guardar, que la crea).
+No necesita red: las escalas 10x y 100x y los datasets sintéticos (ver
+benchmarks.sintetico) se generan a partir de los CSV locales.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+
+import pandas as pd
+
+from benchmarks.escalar import scaled_data_dir
+from benchmarks.sintetico import synthetic_data_dir
+from benchmarks.suite import BENCHMARKS, run_suite
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Regresión: medición > línea base * (1 + umbral)
+UMBRAL_TIEMPO = 0.25
+UMBRAL_MEMORIA = 0.25
+
+# Por debajo de esto las diferencias de tiempo son ruido de medición
+TIEMPO_MINIMO_S = 0.02
+
+# Escalas que se miden si no se indican y la línea base no tiene ninguna
+ESCALAS = [1, 10, 100]
+
+
+def _regresiones(mediciones, base, umbral_tiempo, umbral_memoria):
+    """Lista de (escala, benchmark, métrica, base, actual) que superan el umbral."""
+    encontradas = []
+    for escala, por_nombre in mediciones.items():
+        for nombre, actual in por_nombre.items():
+            previa = base.get(escala, {}).get(nombre)
+            if previa is None:
+                continue
+            if (actual['tiempo_s'] > max(previa['tiempo_s'], TIEMPO_MINIMO_S) * (1 + umbral_tiempo)):
+                encontradas.append((escala, nombre, 'tiempo_s', previa['tiempo_s'], actual['tiempo_s']))
+            if actual['memoria_mb'] > previa['memoria_mb'] * (1 + umbral_memoria):
+                encontradas.append((escala, nombre, 'memoria_mb', previa['memoria_mb'], actual['memoria_mb']))
+    return encontradas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+',
+                        help=f'por defecto las de la línea base, o {ESCALAS} si no hay')
+    parser.add_argument('--sintetico', type=int, nargs='*', default=[], metavar='PARTIDOS',
+                        help='medir también datasets sintéticos con estas cantidades de partidos')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--solo', nargs='+', choices=list(BENCHMARKS), help='medir solo estos tabs')
+    parser.add_argument('--baseline', default=BASELINE, help='archivo JSON de la línea base')
+    parser.add_argument('--guardar', action='store_true', help='guardar las mediciones como línea base')
+    parser.add_argument('--umbral', type=float, help=f'umbral de tiempo (por defecto {UMBRAL_TIEMPO})')
+    parser.add_argument('--umbral-memoria', type=float, help=f'umbral de memoria (por defecto {UMBRAL_MEMORIA})')
+    args = parser.parse_args(argv)
+
+    base = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            base = json.load(f)
+    escalas = args.escalas or sorted(int(k[1:]) for k in base if k.startswith('x')) or ESCALAS
+
+    mediciones = {}
+    for escala in escalas:
+        data_dir = scaled_data_dir(escala)
+        print(f"Escala {escala}x ({data_dir})", file=sys.stderr)
+        mediciones[f'x{escala}'] = run_suite(data_dir, args.repeticiones, args.solo)
+    for partidos in args.sintetico:
+        data_dir = synthetic_data_dir(partidos)
+        print(f"Sintético {partidos} partidos ({data_dir})", file=sys.stderr)
+        mediciones[f'sintetico_{partidos}'] = run_suite(data_dir, args.repeticiones, args.solo)
+
+    tabla = pd.DataFrame([
+        {'escala': escala, 'benchmark': nombre, **valores}
+        for escala, por_nombre in mediciones.items() for nombre, valores in por_nombre.items()
+    ]).set_index(['escala', 'benchmark'])
+    print(tabla.round({'tiempo_s': 4, 'memoria_mb': 1}).to_string())
+
+    umbral_tiempo = args.umbral if args.umbral is not None else base.get('umbral_tiempo', UMBRAL_TIEMPO)
+    umbral_memoria = (args.umbral_memoria if args.umbral_memoria is not None
+                      else base.get('umbral_memoria', UMBRAL_MEMORIA))
+
+    if args.guardar:
+        # Se conservan las escalas que no se midieron en esta corrida
+        nueva = {**base, 'umbral_tiempo': umbral_tiempo, 'umbral_memoria': umbral_memoria,
+                 'maquina': platform.platform(), 'python': platform.python_version()}
+        for escala, por_nombre in mediciones.items():
+            nueva[escala] = {**base.get(escala, {}), **por_nombre}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(nueva, f, indent=2, sort_keys=True)
+        print(f"\nLínea base guardada en {args.baseline}")
+        return 0
+
+    if not base:
+        print(f"\nNo hay línea base en {args.baseline}; usar --guardar para crearla", file=sys.stderr)
+        return 2
+
+    regresiones = _regresiones(mediciones, base, umbral_tiempo, umbral_memoria)
+    if not regresiones:
+        print(f"\nSin regresiones (umbral tiempo {umbral_tiempo:.0%}, memoria {umbral_memoria:.0%})")
+        return 0
+    print("\nRegresiones:")
+    for escala, nombre, metrica, previa, actual in regresiones:
+        print(f"- {escala} {nombre} {metrica}: {previa:.4g} -> {actual:.4g} (+{actual / previa - 1:.0%})")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
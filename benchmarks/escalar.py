@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+
+from analytics.loading import DATA_DIR, DATASETS
+
+# Columnas con nombres de selecciones en cada CSV (countries no tiene encabezado: columna 0)
+_COLUMNAS_EQUIPO = {
+    'results': ['home_team', 'away_team'],
+    'goalscorers': ['home_team', 'away_team', 'team'],
+    'shootouts': ['home_team', 'away_team', 'winner', 'first_shooter'],
+    'countries': [0],
+}
+
+
+def _leer(nombre, ruta):
+    if nombre == 'countries':
+        return pd.read_csv(ruta, header=None, encoding='cp1252', dtype=str, keep_default_na=False)
+    return pd.read_csv(ruta, dtype=str, keep_default_na=False)
+
+
+def _escribir(nombre, df, ruta):
+    if nombre == 'countries':
+        df.to_csv(ruta, header=False, index=False, encoding='cp1252')
+    else:
+        df.to_csv(ruta, index=False)
+
+
+def _replicar(df, columnas, factor):
+    """Concatena `factor` copias; en la copia k > 0 los equipos se llaman 'Nombre k'."""
+    copias = [df]
+    for k in range(1, factor):
+        copia = df.copy()
+        for col in columnas:
+            copia[col] = copia[col].where(copia[col] == '', copia[col] + f' {k}')
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def scaled_data_dir(factor, origen=DATA_DIR, regenerar=False):
+    """Carpeta con los CSV de `origen` multiplicados por `factor`.
+
+    Cada copia renombra las selecciones, así que los partidos siguen siendo
+    únicos por (fecha, local, visitante) y crecen también la cantidad de
+    equipos y los países por continente. Con factor 1 devuelve `origen`.
+    Los CSV se generan una vez en `origen/.bench/x{factor}` y se reutilizan.
+    """
+    if factor == 1:
+        return origen
+    destino = os.path.join(origen, '.bench', f'x{factor}')
+    rutas = {nombre: os.path.join(destino, archivo) for nombre, (archivo, _, _) in DATASETS.items()}
+    if not regenerar and all(os.path.exists(r) for r in rutas.values()):
+        return destino
+
+    os.makedirs(destino, exist_ok=True)
+    for nombre, (archivo, _, _) in DATASETS.items():
+        df = _leer(nombre, os.path.join(origen, archivo))
+        _escribir(nombre, _replicar(df, _COLUMNAS_EQUIPO[nombre], factor), rutas[nombre])
+    return destino
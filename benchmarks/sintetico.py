@@ -0,0 +1,230 @@
+"""Genera datasets sintéticos con el mismo esquema que los CSV de data/.
+
+    python -m benchmarks.sintetico 1000000                  # un millón de partidos
+    python -m benchmarks.sintetico 5000000 --equipos 20000 --semilla 7 --destino /tmp/clubes
+
+Las distribuciones salen de los CSV reales: cada partido sintético toma un
+partido real al azar (fecha, torneo, sede y marcador) y le asigna una copia
+de sus equipos; los goles toman minuto, penal y gol en contra de goles reales
+al azar. Con la misma semilla se generan exactamente los mismos archivos.
+"""
+import argparse
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analytics.loading import DATA_DIR, DATASETS
+from benchmarks.escalar import _escribir, _leer
+
+_CLAVE = ['date', 'home_team', 'away_team']
+
+# Máximo corrimiento (en días) de la fecha del partido real tomado como modelo
+_DESVIO_DIAS = 15
+
+
+def _copia(nombres, k):
+    """Nombre de la copia k de cada equipo ('Nombre k'; la copia 0 conserva el nombre)."""
+    nombres = pd.Series(nombres)
+    return nombres.where(k == 0, nombres + ' ' + pd.Series(k).astype(str)).to_numpy()
+
+
+def _lado(df, columna):
+    """1 si `columna` es el local, 0 si es el visitante y -1 si está vacía o no coincide."""
+    return np.select([df[columna] == df['home_team'], df[columna] == df['away_team']], [1, 0], -1)
+
+
+def _modelos(origen):
+    """Lee los CSV reales y arma lo necesario para muestrear."""
+    reales = {nombre: _leer(nombre, os.path.join(origen, archivo))
+              for nombre, (archivo, _, _) in DATASETS.items()}
+    results = reales['results']
+
+    # Para cada partido real: si tiene goleadores y, si hubo tanda, de qué lado
+    # fueron el ganador y el primer tirador
+    con_goles = results.set_index(_CLAVE).index.isin(
+        reales['goalscorers'].set_index(_CLAVE).index)
+    tandas = results[_CLAVE].merge(reales['shootouts'].drop_duplicates(_CLAVE), how='left', on=_CLAVE)
+    tandas = tandas.fillna('')
+
+    goles = reales['goalscorers']
+    # Probabilidad de cada puesto en la tabla de goleadores de su equipo
+    por_goleador = goles[goles['own_goal'] != 'TRUE'].groupby(['team', 'scorer']).size()
+    puesto = por_goleador.groupby(level='team').rank(method='first', ascending=False).astype(int) - 1
+    frecuencia_puesto = np.bincount(puesto.to_numpy(), weights=por_goleador.to_numpy())
+
+    return {
+        'results': results,
+        'con_goles': con_goles,
+        'ganador': _lado(tandas, 'winner'),
+        'primer_tirador': _lado(tandas, 'first_shooter'),
+        'goles': goles[['minute', 'own_goal', 'penalty']].reset_index(drop=True),
+        'puestos': frecuencia_puesto / frecuencia_puesto.sum(),
+        'countries': reales['countries'],
+    }
+
+
+def _partidos(modelos, n, copias, rng):
+    """Elige `n` partidos modelo y les asigna fecha y copia de los equipos.
+
+    Devuelve los índices de los partidos reales usados como modelo y el
+    DataFrame de results, ordenado por fecha y sin claves repetidas.
+    """
+    results = modelos['results']
+    fechas = pd.to_datetime(results['date']).to_numpy()
+    elegidos, partidos, faltan = [], [], n
+    while faltan > 0:
+        # Se pide un poco de más porque algunas claves (fecha, local, visitante) se repiten
+        m = int(faltan * 1.05) + 16
+        modelo = rng.integers(len(results), size=m)
+        k = rng.integers(copias, size=m)
+        desvio = rng.integers(-_DESVIO_DIAS, _DESVIO_DIAS + 1, size=m).astype('timedelta64[D]')
+        lote = pd.DataFrame({
+            'date': fechas[modelo] + desvio,
+            'home_team': _copia(results['home_team'].to_numpy()[modelo], k),
+            'away_team': _copia(results['away_team'].to_numpy()[modelo], k),
+        })
+        nuevos = ~lote.duplicated(_CLAVE).to_numpy()
+        if partidos:
+            previas = pd.concat(partidos).set_index(_CLAVE).index
+            nuevos &= ~lote.set_index(_CLAVE).index.isin(previas)
+        nuevos &= np.cumsum(nuevos) <= faltan
+        elegidos.append(modelo[nuevos])
+        partidos.append(lote[nuevos])
+        faltan -= int(nuevos.sum())
+
+    modelo = np.concatenate(elegidos)
+    partidos = pd.concat(partidos, ignore_index=True)
+    orden = np.argsort(partidos['date'].to_numpy(), kind='stable')
+    modelo, partidos = modelo[orden], partidos.iloc[orden].reset_index(drop=True)
+
+    for columna in ['home_score', 'away_score', 'tournament', 'city', 'country', 'neutral']:
+        partidos[columna] = results[columna].to_numpy()[modelo]
+    partidos['date'] = partidos['date'].dt.strftime('%Y-%m-%d')
+    return modelo, partidos
+
+
+def _goleadores(modelos, modelo, partidos, rng):
+    """Un registro por gol de los partidos cuyo modelo real tiene goleadores."""
+    con_goles = np.flatnonzero(modelos['con_goles'][modelo])
+    locales = partidos['home_score'].to_numpy()[con_goles].astype(np.int64)
+    total = locales + partidos['away_score'].to_numpy()[con_goles].astype(np.int64)
+
+    partido = np.repeat(con_goles, total)
+    # Posición del gol dentro del partido: los primeros `locales` son del local
+    posicion = np.arange(len(partido)) - np.repeat(np.cumsum(total) - total, total)
+    es_local = posicion < np.repeat(locales, total)
+
+    muestra = modelos['goles'].iloc[rng.integers(len(modelos['goles']), size=len(partido))]
+    en_contra = muestra['own_goal'].to_numpy() == 'TRUE'
+    local = partidos['home_team'].to_numpy()[partido]
+    visitante = partidos['away_team'].to_numpy()[partido]
+    # En los goles en contra el goleador es del equipo rival
+    del_goleador = np.where(es_local != en_contra, local, visitante)
+    puesto = rng.choice(len(modelos['puestos']), size=len(partido), p=modelos['puestos'])
+
+    goles = pd.DataFrame({
+        'date': partidos['date'].to_numpy()[partido],
+        'home_team': local,
+        'away_team': visitante,
+        'team': np.where(es_local, local, visitante),
+        'scorer': pd.Series(del_goleador) + ' #' + pd.Series(puesto + 1).astype(str),
+        'minute': muestra['minute'].to_numpy(),
+        'own_goal': muestra['own_goal'].to_numpy(),
+        'penalty': muestra['penalty'].to_numpy(),
+    })
+    # Dentro de cada partido, por minuto (los goles sin minuto al final)
+    minuto = pd.to_numeric(goles['minute'], errors='coerce').fillna(np.inf).to_numpy()
+    return goles.iloc[np.lexsort((minuto, partido))].reset_index(drop=True)
+
+
+def _tandas(modelos, modelo, partidos):
+    """Tandas de los partidos cuyo modelo real tuvo una, con ganador y primer tirador del mismo lado."""
+    ganador = modelos['ganador'][modelo]
+    con_tanda = ganador >= 0
+    tandas = partidos.loc[con_tanda, _CLAVE].reset_index(drop=True)
+    local, visitante = tandas['home_team'].to_numpy(), tandas['away_team'].to_numpy()
+    primero = modelos['primer_tirador'][modelo][con_tanda]
+    tandas['winner'] = np.where(ganador[con_tanda] == 1, local, visitante)
+    tandas['first_shooter'] = np.select([primero == 1, primero == 0], [local, visitante], '')
+    return tandas
+
+
+def _paises(modelos, copias):
+    """countries con cada copia de las selecciones en el continente de la original."""
+    paises = modelos['countries']
+    copias_paises = []
+    for k in range(copias):
+        copia = paises.copy()
+        copia[0] = _copia(paises[0].to_numpy(), np.full(len(paises), k))
+        copias_paises.append(copia)
+    return pd.concat(copias_paises, ignore_index=True)
+
+
+def generate(destino, partidos, equipos=None, semilla=0, origen=DATA_DIR):
+    """Escribe en `destino` los cuatro CSV sintéticos con `partidos` partidos.
+
+    `equipos` es la cantidad aproximada de equipos: se redondea a un múltiplo
+    de las selecciones reales, porque cada equipo sintético es una copia
+    ('Nombre k') de una selección real y juega sus mismos torneos. Por defecto
+    crece en proporción a los partidos. Devuelve {dataset: filas escritas}.
+    """
+    modelos = _modelos(origen)
+    reales = modelos['results']
+    if equipos is None:
+        copias = math.ceil(partidos / len(reales))
+    else:
+        n_reales = pd.unique(reales[['home_team', 'away_team']].to_numpy().ravel()).size
+        copias = math.ceil(equipos / n_reales)
+    copias = max(copias, 1)
+
+    rng = np.random.default_rng(semilla)
+    modelo, results = _partidos(modelos, partidos, copias, rng)
+    tablas = {
+        'results': results,
+        'goalscorers': _goleadores(modelos, modelo, results, rng),
+        'shootouts': _tandas(modelos, modelo, results),
+        'countries': _paises(modelos, copias),
+    }
+
+    os.makedirs(destino, exist_ok=True)
+    for nombre, (archivo, _, _) in DATASETS.items():
+        _escribir(nombre, tablas[nombre], os.path.join(destino, archivo))
+    return {nombre: len(df) for nombre, df in tablas.items()}
+
+
+def synthetic_data_dir(partidos, equipos=None, semilla=0, origen=DATA_DIR, regenerar=False):
+    """Carpeta con un dataset sintético; se genera una vez en `origen/.bench` y se reutiliza."""
+    sufijo = '' if equipos is None else f'_e{equipos}'
+    destino = os.path.join(origen, '.bench', f'sintetico_{partidos}{sufijo}_s{semilla}')
+    rutas = [os.path.join(destino, archivo) for archivo, _, _ in DATASETS.values()]
+    if regenerar or not all(os.path.exists(r) for r in rutas):
+        generate(destino, partidos, equipos, semilla, origen)
+    return destino
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.sintetico',
+                                     description=__doc__.splitlines()[0])
+    parser.add_argument('partidos', type=int)
+    parser.add_argument('--equipos', type=int, help='cantidad aproximada de equipos')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--destino', help='carpeta de salida (por defecto data/.bench/sintetico_...)')
+    parser.add_argument('--origen', default=DATA_DIR, help='CSV reales de los que salen las distribuciones')
+    args = parser.parse_args(argv)
+
+    if args.destino is None:
+        destino = synthetic_data_dir(args.partidos, args.equipos, args.semilla, args.origen, regenerar=True)
+    else:
+        destino = args.destino
+        generate(destino, args.partidos, args.equipos, args.semilla, args.origen)
+    for archivo, _, _ in DATASETS.values():
+        ruta = os.path.join(destino, archivo)
+        print(f"{ruta}: {os.path.getsize(ruta) / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import gc
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from analytics.cache import clear_all_caches
+from analytics.first_goal import first_goal_by_continent, first_goal_by_team, first_goal_years
+from analytics.goal_minutes import goal_minute_distribution, goal_minute_filters
+from analytics.elo import team_rating_series
+from analytics.historical import historical_periods, historical_summary
+from analytics.loading import build_bundle
+from analytics.rankings import best_teams
+from analytics.scorelines import goal_records, scoreline_matrix, scoreline_stats
+from analytics.shootouts import DESGLOSES, shootout_breakdown
+from analytics.team_profile import (
+    team_goals, team_periods, team_record, teams_in_period, teams_overview, top_rivals,
+)
+from analytics.tournaments import (
+    tournament_goals_summary, tournament_results, tournament_stats, tournament_yearly_goals,
+)
+
+# Selecciones por defecto de los tabs
+EQUIPO = 'Ecuador'
+TORNEOS = ['FIFA World Cup', 'UEFA Euro', 'Copa América']
+CONTINENTES = ('Sudamérica', 'Europa')
+TORNEO_CONTINENTES = 'FIFA World Cup qualification'
+
+
+def _todo_el_periodo(años):
+    return int(años.min()), int(años.max())
+
+
+def historical_results(datos):
+    start_year, end_year = _todo_el_periodo(historical_periods(datos.years))
+    historical_summary(datos.years, start_year, end_year)
+
+
+def team_analysis(datos):
+    team_matches = datos.team_matches
+    start_year, end_year = _todo_el_periodo(team_periods(datos.years))
+    teams_in_period(datos.years, start_year, end_year)
+    team_record(team_matches, EQUIPO, start_year, end_year)
+    team_goals(team_matches, EQUIPO, start_year, end_year)
+    top_rivals(team_matches, EQUIPO, start_year, end_year, 10)
+    team_rating_series(datos.elo, team_matches, EQUIPO, start_year, end_year)
+    teams_overview(datos.years, start_year, end_year, 10)
+
+
+def tournament_comparison(datos):
+    por_año = datos.aggregates['tournament_year']
+    tournament_stats(por_año, TORNEOS)
+    tournament_results(por_año, TORNEOS)
+    tournament_yearly_goals(por_año, TORNEOS)
+    for torneo in TORNEOS:
+        tournament_goals_summary(datos.aggregates['tournament_goals'], torneo)
+
+
+def goal_patterns(datos):
+    scoreline_matrix(datos.scorelines, 7)
+    scoreline_stats(datos.scorelines)
+    goal_records(datos.results)
+    goal_minute_filters(datos)
+    goal_minute_distribution(datos, None, None, None, None, None, None, 5)
+
+
+def continents_analysts(datos):
+    continents = datos.continents
+    for continente in CONTINENTES:
+        continents.summary(continente, TORNEO_CONTINENTES)
+        miembros = continents.mask(continents.membership, continente)
+        for lado in ('local', 'visitante'):
+            best_teams(datos.team_matches, lado, miembros, 200, 1)
+    continents.common_tournaments(*CONTINENTES)
+    for por in DESGLOSES:
+        shootout_breakdown(datos, por)
+
+
+def other_analysis(datos):
+    start_year, end_year = first_goal_years(datos)
+    for continente in CONTINENTES:
+        first_goal_by_continent(datos, continente, start_year, end_year)
+    first_goal_by_team(datos, EQUIPO)
+
+
+# Nombre del benchmark -> función que hace los cálculos del tab con sus valores por defecto
+BENCHMARKS = {
+    'historical_results': historical_results,
+    'team_analysis': team_analysis,
+    'tournament_comparison': tournament_comparison,
+    'goal_patterns': goal_patterns,
+    'continents_analysts': continents_analysts,
+    'other_analysis': other_analysis,
+}
+
+
+def _medir(f, repeticiones, preparar=None):
+    """Mejor tiempo (s) de `repeticiones` corridas y pico de memoria (MB) de una corrida más.
+
+    El pico se mide aparte con tracemalloc, que hace más lenta la ejecución.
+    `preparar` se llama antes de cada corrida, fuera de la medición.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        gc.collect()
+        inicio = time.perf_counter()
+        f()
+        tiempos.append(time.perf_counter() - inicio)
+
+    if preparar is not None:
+        preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        f()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'tiempo_s': min(tiempos), 'memoria_mb': pico / 1e6}
+
+
+def run_suite(data_dir, repeticiones=3, nombres=None):
+    """Corre los benchmarks sobre los CSV de `data_dir`.
+
+    Además de los tabs mide la carga: 'carga_csv' parsea los CSV sin
+    snapshots y 'carga_snapshot' lee los snapshots ya generados. Los
+    snapshots van a una carpeta temporal que se borra al terminar, así que
+    nunca se toca la caché de la app (`data_dir/.cache`). Cada tab se mide
+    con las cachés vacías (primer render tras cargar los datos).
+    Devuelve {nombre: {'tiempo_s': ..., 'memoria_mb': ...}}.
+    """
+    cache_dir = tempfile.mkdtemp(prefix='benchmarks_cache_')
+    try:
+        resultados = {
+            'carga_csv': _medir(lambda: build_bundle(data_dir, cache_dir), repeticiones,
+                                preparar=lambda: shutil.rmtree(cache_dir, ignore_errors=True)),
+            'carga_snapshot': _medir(lambda: build_bundle(data_dir, cache_dir), repeticiones),
+        }
+
+        datos = build_bundle(data_dir, cache_dir)
+        for nombre, f in BENCHMARKS.items():
+            if nombres and nombre not in nombres:
+                continue
+            resultados[nombre] = _medir(lambda: f(datos), repeticiones, preparar=clear_all_caches)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return resultados
@@ -1,14 +1,41 @@
-import pandas as pd
-import numpy as np
+import threading
+import time
+
 import streamlit as st
+from analytics import instrumentation
+from analytics.loading import build_bundle, csv_signatures
+
+# Marca, por hilo, si la última llamada a load_bundle tuvo que cargar los datos
+_carga = threading.local()
+
+
+@st.cache_resource(max_entries=1)
+def _load_bundle(firmas):
+    _carga.fallo = True
+    return build_bundle()
+
+
+def load_bundle():
+    """Carga los cuatro datasets una sola vez por proceso.
+
+    El resultado se comparte entre todas las sesiones, por eso los tabs no
+    deben modificar los DataFrames que reciben. La caché se indexa con la
+    firma de los CSV: si se agregan partidos al final de un archivo, la
+    siguiente ejecución solo parsea las filas nuevas (ver
+    analytics.snapshot.load_snapshot).
+    """
+    _carga.fallo = False
+    inicio = time.perf_counter()
+    datos = _load_bundle(csv_signatures())
+    if instrumentation.activa():
+        if _carga.fallo:
+            instrumentation.registrar('load_bundle', 'miss', time.perf_counter() - inicio,
+                                      len(datos.results), datos)
+        else:
+            instrumentation.registrar('load_bundle', 'hit', time.perf_counter() - inicio)
+    return datos
+
 
-@st.cache_data
 def load_data():
-    df = pd.read_csv('./data/results.csv')
-    df['date'] = pd.to_datetime(df['date'])
-    df['year'] = df['date'].dt.year
-    df['decade'] = (df['year'] // 10) * 10
-    df['resultado'] = np.where(df['home_score'] > df['away_score'], 'Victoria Local',
-                             np.where(df['home_score'] == df['away_score'], 'Empate', 
-                                    'Victoria Visitante'))
-    return df
\ No newline at end of file
+    """Devuelve solo el DataFrame de resultados."""
+    return load_bundle().results
@@ -0,0 +1,82 @@
+import os
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import figure_cache
+from analytics import instrumentation
+
+# Log JSONL explícito (una línea por bloque medido y ejecución); RENDER_LOG='' lo desactiva.
+# Sin RENDER_LOG solo se registra mientras el panel está activo, en instrumentation.LOG_PATH.
+RENDER_LOG = os.environ.get('RENDER_LOG')
+
+_CLAVE = '_mediciones'
+_CLAVE_PANEL = 'panel_depuracion'
+
+
+def _ruta_log():
+    """Ruta donde se escriben las mediciones de esta sesión, o None si no se registran."""
+    if RENDER_LOG is not None:
+        return RENDER_LOG or None
+    return instrumentation.LOG_PATH if st.session_state.get(_CLAVE_PANEL, False) else None
+
+
+@contextmanager
+def medir(nombre):
+    """Mide un bloque (una sección, la carga de datos) para el panel y el log.
+
+    La medición se escribe en el log al terminar el bloque, así que también
+    quedan registradas las ejecuciones parciales de los fragmentos.
+    """
+    ctx = get_script_run_ctx()
+    sesion = ctx.session_id if ctx is not None else None
+    with instrumentation.medir(nombre, sesion=sesion) as medicion:
+        try:
+            yield medicion
+        finally:
+            st.session_state.setdefault(_CLAVE, []).append(medicion)
+            ruta = _ruta_log()
+            if ruta:
+                os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+                instrumentation.append_log([medicion], ruta)
+
+
+def _tabla(mediciones):
+    tabla = pd.DataFrame([m.resumen() for m in mediciones]).set_index('nombre')
+    return tabla[['tiempo_s', 'aciertos', 'fallos', 'filas_entrada', 'memoria_mb']]
+
+
+def show():
+    """Muestra en la barra lateral (si se pide) lo medido desde la última ejecución completa.
+
+    Incluye las ejecuciones parciales de fragmentos que hubo entre medio.
+    """
+    mediciones = st.session_state.pop(_CLAVE, [])
+    if not st.sidebar.checkbox("🔧 Panel de depuración", key=_CLAVE_PANEL):
+        return
+    # La caché de figuras es del proceso: sus contadores suman todas las sesiones
+    st.sidebar.subheader("Caché de figuras")
+    st.sidebar.dataframe(pd.Series(figure_cache.CACHE.stats(), name='valor').round(2))
+
+    st.sidebar.subheader("Desde la última ejecución completa")
+    if not mediciones:
+        st.sidebar.write("Sin mediciones.")
+        return
+    tabla = _tabla(mediciones)
+    st.sidebar.metric("Tiempo total", f"{tabla['tiempo_s'].sum():.3f} s")
+    st.sidebar.dataframe(tabla.round({'tiempo_s': 3, 'memoria_mb': 2}))
+
+    for medicion in mediciones:
+        if not medicion.calculos:
+            continue
+        with st.sidebar.expander(f"Cálculos de {medicion.nombre}"):
+            calculos = pd.DataFrame([vars(c) for c in medicion.calculos])
+            st.dataframe(calculos.round({'tiempo_s': 4, 'memoria_mb': 2}), hide_index=True)
+
+    ruta = _ruta_log()
+    if ruta and os.path.exists(ruta):
+        with st.sidebar.expander("Historial del log"):
+            st.caption(ruta)
+            st.dataframe(instrumentation.summarize_log(ruta).round(3))
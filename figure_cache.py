@@ -0,0 +1,159 @@
+import itertools
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from analytics import instrumentation
+
+# Tope de memoria de las figuras guardadas (tamaño del JSON), compartido por todas las sesiones
+MAX_MB = 64
+
+
+class SerializedFigure(go.Figure):
+    """Figura guardada como el dict JSON ya armado.
+
+    st.plotly_chart no reconstruye ni valida las trazas: solo codifica el
+    dict a JSON una vez por render. El dict es compartido por todas las
+    sesiones, así que no se debe modificar. Solo sirve para mostrarla;
+    modificarla (update_layout, add_trace...) no cambia lo que se dibuja.
+    """
+
+    def __init__(self, figura):
+        super().__init__()
+        self._figura = figura
+
+    def to_dict(self):
+        return self._figura
+
+    to_plotly_json = to_dict
+
+
+class FigureCache:
+    """LRU de figuras (dicts JSON) con tope por tamaño del JSON y estadísticas de uso."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._figuras = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = self.fallos = self.desalojos = 0
+
+    def get(self, clave):
+        with self._lock:
+            guardada = self._figuras.get(clave)
+            if guardada is None:
+                self.fallos += 1
+                return None
+            self._figuras.move_to_end(clave)
+            self.aciertos += 1
+            return guardada[0]
+
+    def put(self, clave, figura, tamaño):
+        """Guarda `figura` (`tamaño` bytes de JSON) y desaloja las menos usadas hasta quedar bajo el tope."""
+        if tamaño > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._figuras.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._figuras[clave] = (figura, tamaño)
+            self._bytes += tamaño
+            while self._bytes > self.max_bytes:
+                _, (_, desalojada) = self._figuras.popitem(last=False)
+                self._bytes -= desalojada
+                self.desalojos += 1
+
+    def discard(self, token):
+        """Descarta las figuras de un objeto de datos que ya no existe."""
+        with self._lock:
+            for clave in [c for c in self._figuras if c[0] == token]:
+                self._bytes -= self._figuras.pop(clave)[1]
+
+    def clear(self):
+        with self._lock:
+            self._figuras.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {
+            'figuras': len(self._figuras),
+            'memoria_mb': self._bytes / 1e6,
+            'tope_mb': self.max_bytes / 1e6,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+        }
+
+
+CACHE = FigureCache(MAX_MB * 1_000_000)
+
+# Identificador de cada objeto de datos vivo, por id() porque los DataFrames no
+# son hasheables; al liberarse el objeto se descartan sus figuras
+_tokens = {}
+_contador = itertools.count()
+_lock_tokens = threading.Lock()
+
+
+def _olvidar(id_datos, token):
+    with _lock_tokens:
+        _tokens.pop(id_datos, None)
+    CACHE.discard(token)
+
+
+def _token(datos):
+    with _lock_tokens:
+        token = _tokens.get(id(datos))
+        if token is None:
+            token = _tokens[id(datos)] = next(_contador)
+            weakref.finalize(datos, _olvidar, id(datos), token)
+        return token
+
+
+def normalize(valor):
+    """Convierte un filtro en una clave hasheable y estable (tipos de numpy, listas, sets, dicts)."""
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, pd.Timestamp):
+        return valor.isoformat()
+    if isinstance(valor, (list, tuple, np.ndarray, pd.Index)):
+        return tuple(normalize(v) for v in valor)
+    if isinstance(valor, (set, frozenset)):
+        return tuple(sorted(normalize(v) for v in valor))
+    if isinstance(valor, dict):
+        return tuple(sorted((k, normalize(v)) for k, v in valor.items()))
+    raise TypeError(f"Filtro no normalizable para la caché de figuras: {type(valor).__name__}")
+
+
+def cached_figure(f):
+    """Guarda la figura de `f(datos, *filtros)` como dict JSON, por datos y estado de los filtros.
+
+    En un acierto no se llama a `f`: se evitan la agregación, la construcción
+    de la figura y su validación; solo queda la codificación a JSON que hace
+    st.plotly_chart. La caché es del proceso, así que la comparten todas las
+    sesiones.
+    """
+    @wraps(f)
+    def wrapper(datos, *filtros):
+        clave = (_token(datos), f.__qualname__, normalize(filtros))
+        inicio = time.perf_counter()
+        figura = CACHE.get(clave)
+        if figura is not None:
+            instrumentation.registrar(f.__qualname__, 'hit', time.perf_counter() - inicio)
+            return SerializedFigure(figura)
+        spec = pio.to_json(f(datos, *filtros), validate=False)
+        figura = json.loads(spec)
+        CACHE.put(clave, figura, len(spec))
+        instrumentation.registrar(f.__qualname__, 'miss', time.perf_counter() - inicio,
+                                  instrumentation.filas_de(datos), spec)
+        return SerializedFigure(figura)
+    return wrapper
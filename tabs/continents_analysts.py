@@ -1,43 +1,38 @@
 import streamlit as st
 import plotly.graph_objects as go
-import pandas as pd
+from analytics.rankings import MIN_PARTIDOS, best_teams
+from analytics.shootouts import shootout_breakdown
+from figure_cache import cached_figure
 
-def show(df, df_countries, df_shootouts):
+def show(datos):
     st.header("🌎 Comparativa de Continentes")
     
-    # Crear un diccionario de países por continente
-    continentes = df_countries.groupby(df_countries.columns[1])[df_countries.columns[0]].agg(list).to_dict()
+    # Continentes y agregados por torneo calculados al cargar los datos
+    continents = datos.continents
+    nombres_continentes = list(continents.names)
     
     # Selector de continentes con valores por defecto
     col1, col2, col3 = st.columns(3)
     with col1:
         continente1 = st.selectbox(
             "Selecciona el primer continente",
-            options=sorted(continentes.keys()),
-            index=sorted(continentes.keys()).index("Sudamérica"),  # Valor por defecto: Sudamerica
+            options=nombres_continentes,
+            index=nombres_continentes.index("Sudamérica"),  # Valor por defecto: Sudamerica
             key="cont1"
         )
     with col2:
         # Filtrar el segundo continente para no poder seleccionar el mismo
-        continentes_disponibles = [c for c in continentes.keys() if c != continente1]
+        continentes_disponibles = [c for c in nombres_continentes if c != continente1]
         default_index = continentes_disponibles.index("Europa") if "Europa" in continentes_disponibles else 0
         continente2 = st.selectbox(
             "Selecciona el segundo continente",
-            options=sorted(continentes_disponibles),
+            options=continentes_disponibles,
             index=default_index,  # Valor por defecto: Europa
             key="cont2"
         )
     
-    # Obtener países de los continentes seleccionados
-    paises_cont1 = set(continentes[continente1])
-    paises_cont2 = set(continentes[continente2])
-    
-    # Filtrar torneos por continente
-    torneos_cont1 = df[df['home_team'].isin(paises_cont1)]['tournament'].unique()
-    torneos_cont2 = df[df['home_team'].isin(paises_cont2)]['tournament'].unique()
-    
-    # Encontrar torneos comunes y específicos
-    torneos_comunes = sorted(set(torneos_cont1) & set(torneos_cont2))
+    # Torneos comunes: los dos continentes jugaron como local
+    torneos_comunes = continents.common_tournaments(continente1, continente2)
     
     # Selector de torneo con valor por defecto para FIFA World Cup qualification
     with col3:
@@ -50,46 +45,24 @@ def show(df, df_countries, df_shootouts):
         )
     
     if torneo:
-        # Filtrar datos por torneo y continentes
-        df_torneo = df[df['tournament'] == torneo]
-        
-        #Obtiene los partidos de cada continente        
-        partidos_cont1 = df_torneo[
-                (df_torneo['home_team'].isin(paises_cont1)) | 
-                (df_torneo['away_team'].isin(paises_cont1))
-        ]
-        partidos_cont2 = df_torneo[
-                (df_torneo['home_team'].isin(paises_cont2)) | 
-                (df_torneo['away_team'].isin(paises_cont2))
-        ]
-        
-        # Gráfico comparativo
-        mostrar_comparativa(partidos_cont1, partidos_cont2, continente1, continente2,paises_cont1,paises_cont2) 
+        # Gráfico comparativo (totales ya agregados por continente y torneo)
+        mostrar_comparativa(datos, torneo, continente1, continente2)
         
       
         # Después de analizar_penaltis
-        mostrar_mejores_equipos(df, paises_cont1, paises_cont2, continente1, continente2)   
-        analizar_penaltis(df_shootouts, paises_cont1, paises_cont2, continente1, continente2)
+        mostrar_mejores_equipos(datos.team_matches, continents, continente1, continente2)   
+        analizar_penaltis(datos, continente1, continente2)
 
-def mostrar_estadisticas(df_partidos, paises):
-    total_partidos = len(df_partidos)
+def mostrar_estadisticas(stats):
+    total_partidos = int(stats['partidos'])
       
     if total_partidos > 0:
-
-        # Calcular victorias como local
-        victorias_local = sum(
-            (df_partidos['home_team'].isin(paises)) & 
-            (df_partidos['home_score'] > df_partidos['away_score'])
-        )
-        
-        # Calcular victorias como visitante
-        victorias_visitante = sum(
-            (df_partidos['away_team'].isin(paises)) & 
-            (df_partidos['away_score'] > df_partidos['home_score'])
-        )
+        # Victorias de los equipos del continente como local y como visitante
+        victorias_local = int(stats['victorias_local_propias'])
+        victorias_visitante = int(stats['victorias_visitante_propias'])
     
         # Calcular empates
-        empates = sum(df_partidos['home_score'] == df_partidos['away_score'])
+        empates = int(stats['empates'])
             
         # Métricas
 
@@ -100,240 +73,112 @@ def mostrar_estadisticas(df_partidos, paises):
         
         
         # Calcular promedio de goles
-        goles_favor = sum(
-            df_partidos[df_partidos['home_team'].isin(paises)]['home_score']
-        ) + sum(
-            df_partidos[df_partidos['away_team'].isin(paises)]['away_score']
-        )
+        goles_favor = int(stats['goles_favor'])
         
         st.metric("Promedio de Goles por Partido", f"{goles_favor/total_partidos:.2f}")
     else:
         st.warning("No hay datos disponibles para el período seleccionado")
-def mostrar_estadisticas1(df_partidos, paises):
-    total_partidos = len(df_partidos)
-    col1_1, col1_2 = st.columns([1, 1])
-   
-    if total_partidos > 0:
 
-        # Calcular victorias como local
-        victorias_local = sum(
-            (df_partidos['home_team'].isin(paises)) & 
-            (df_partidos['home_score'] > df_partidos['away_score'])
-        )
-        
-        # Calcular victorias como visitante
-        victorias_visitante = sum(
-            (df_partidos['away_team'].isin(paises)) & 
-            (df_partidos['away_score'] > df_partidos['home_score'])
-        )
+def mostrar_comparativa(datos, torneo, continente1, continente2):
     
-        # Calcular empates
-        empates = sum(df_partidos['home_score'] == df_partidos['away_score'])
-            
-            # Métricas
-        with col1_1:
-            st.metric("Victorias como Local", victorias_local)
-            st.metric("Empates", empates)
-        with col1_2:
-            st.metric("Victorias como Visitante", victorias_visitante)
-            
-            
-            # Calcular promedio de goles
-            goles_favor = sum(
-                df_partidos[df_partidos['home_team'].isin(paises)]['home_score']
-            ) + sum(
-                df_partidos[df_partidos['away_team'].isin(paises)]['away_score']
-            )
+    # Crear gráficos de pastel para cada continente
+    columnas = st.columns(2)
+    
+    for col, continente in zip(columnas, [continente1, continente2]):
+        with col:
+            st.subheader(f"Estadísticas de Resultados - {continente}")
+            col_1, col_2 = st.columns([1, 1])
+            # Solo se busca la fila del continente y torneo
+            stats = datos.continents.summary(continente, torneo)
             
-            st.metric("Promedio de Goles por Partido", f"{goles_favor/total_partidos:.2f}")
-    else:
-        st.warning("No hay datos disponibles para el período seleccionado")
+            with col_1:
+                if int(stats['partidos']) > 0:
+                    st.plotly_chart(figura_resultados_continente(datos, continente, torneo),
+                                    use_container_width=True)
+            with col_2:
+                # Crear métricas y visualizaciones
+                mostrar_estadisticas(stats)
 
-def mostrar_comparativa(df_cont1, df_cont2, continente1, continente2, paises_cont1, paises_cont2):
-    
-    # Crear gráficos de pastel para cada continente
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader(f"Estadísticas de Resultados - {continente1}")
-        col1_1, col1_2 = st.columns([1, 1])
-        # Gráfico para el primer continente
-        fig_cont1 = go.Figure()
-        total_cont1 = len(df_cont1)
-        
-        with col1_1:
-            if total_cont1 > 0:
-                victorias_local_1 = sum((df_cont1['home_team'].isin(set(df_cont1['home_team']))) & 
-                                    (df_cont1['home_score'] > df_cont1['away_score']))
-                victorias_visit_1 = sum((df_cont1['away_team'].isin(set(df_cont1['home_team']))) & 
-                                    (df_cont1['away_score'] > df_cont1['home_score']))
-                empates_1 = sum(df_cont1['home_score'] == df_cont1['away_score'])
-                
-                valores_1 = [victorias_local_1, victorias_visit_1, empates_1]
-                porcentajes_1 = [v/total_cont1*100 for v in valores_1]
-                
-                fig_cont1.add_trace(go.Pie(
-                    labels=['Victorias Local', 'Victorias Visitante', 'Empates'],
-                    values=porcentajes_1,
-                    textinfo='percent+label',
-                    marker=dict(colors=["#2085ec" , "#cea9bc ", "#72b4eb"]),
-                    hovertemplate="<b>%{label}</b><br>" +
-                                "Porcentaje: %{percent}<br>" +
-                                "Cantidad: %{value:.0f}<br>"
-                                
-                ))
-                
-                #fig_cont1.update_layout(
-                #    title=f"Estadisticas - {continente1}",
-                #    height=400
-                #)
-                
-                st.plotly_chart(fig_cont1, use_container_width=True)
-        with col1_2:
-            # Crear métricas y visualizaciones
-            mostrar_estadisticas(df_cont1, paises_cont1)
-    
-    with col2:
-        st.subheader(f"Estadísticas de Resultados - {continente2}")
-        
-        col2_1, col2_2 = st.columns([1, 1])
-        # Gráfico para el segundo continente
-        fig_cont2 = go.Figure()
-        total_cont2 = len(df_cont2)
-        with col2_1:
-            if total_cont2 > 0:
-                victorias_local_2 = sum((df_cont2['home_team'].isin(set(df_cont2['home_team']))) & 
-                                    (df_cont2['home_score'] > df_cont2['away_score']))
-                victorias_visit_2 = sum((df_cont2['away_team'].isin(set(df_cont2['home_team']))) & 
-                                    (df_cont2['away_score'] > df_cont2['home_score']))
-                empates_2 = sum(df_cont2['home_score'] == df_cont2['away_score'])
-                
-                valores_2 = [victorias_local_2, victorias_visit_2, empates_2]
-                porcentajes_2 = [v/total_cont2*100 for v in valores_2]
-                
-                fig_cont2.add_trace(go.Pie(
-                    labels=['Victorias Local', 'Victorias Visitante', 'Empates'],
-                    values=porcentajes_2,
-                    textinfo='percent+label',
-                    marker=dict(colors=["#2085ec" , "#cea9bc ", "#72b4eb"]),
-                    hovertemplate="<b>%{label}</b><br>" +
-                                "Porcentaje: %{percent}<br>" +
-                                "Cantidad: %{value:.0f}<br>"
-                ))
-                
-                #fig_cont2.update_layout(
-                #    title=f"Distribución de Resultados - {continente2}",
-                #    height=400
-                #)
-                
-                st.plotly_chart(fig_cont2, use_container_width=True)
-        with col2_2:
-            # Crear métricas y visualizaciones
-            mostrar_estadisticas(df_cont2, paises_cont2)
+@cached_figure
+def figura_resultados_continente(datos, continente, torneo):
+    """Pastel de victorias locales, visitantes y empates del continente en el torneo."""
+    stats = datos.continents.summary(continente, torneo)
+    total = int(stats['partidos'])
+    valores = [int(stats['victorias_local']), int(stats['victorias_visitante']), int(stats['empates'])]
+    porcentajes = [v/total*100 for v in valores]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Pie(
+        labels=['Victorias Local', 'Victorias Visitante', 'Empates'],
+        values=porcentajes,
+        textinfo='percent+label',
+        marker=dict(colors=["#2085ec" , "#cea9bc ", "#72b4eb"]),
+        hovertemplate="<b>%{label}</b><br>" +
+                    "Porcentaje: %{percent}<br>" +
+                    "Cantidad: %{value:.0f}<br>"
+    ))
+    return fig
 
-def analizar_penaltis(df_shootouts, paises_cont1, paises_cont2, continente1, continente2):
+def analizar_penaltis(datos, continente1, continente2):
     st.subheader("Análisis de Penaltis")
     
-    # Filtrar penaltis por continente
-    penaltis_cont1 = df_shootouts[
-        (df_shootouts['home_team'].isin(paises_cont1)) | 
-        (df_shootouts['away_team'].isin(paises_cont1))
-    ]
-    
-
-    penaltis_cont2 = df_shootouts[
-        (df_shootouts['home_team'].isin(paises_cont2)) | 
-        (df_shootouts['away_team'].isin(paises_cont2))
-    ]
+    # Desglose por continente ya calculado (en caché por carga de datos)
+    por_continente = shootout_breakdown(datos, 'continent')
+    
+    def mostrar_primer_tirador(continente):
+        if continente not in por_continente.index:
+            return
+        fila = por_continente.loc[continente]
+        sin_dato = int(fila['tandas'] - fila['con_primer_tirador'])
+        if fila['con_primer_tirador'] == 0:
+            st.write(f"No se registró quién tiró primero en sus {int(fila['tandas'])} tandas")
+            return
+        # Analizar resultados cuando tira primero (solo tandas con el dato)
+        st.write(f"Cuando tira primero:")
+        st.write(f"- Gana: {fila['porcentaje']:.1f}% (IC 95%: {fila['ic_inferior']:.1f}% - {fila['ic_superior']:.1f}%)")
+        st.write(f"- Pierde: {100 - fila['porcentaje']:.1f}%")
+        st.write(f"- {int(fila['con_primer_tirador'])} tandas con dato, {sin_dato} sin registrar quién tiró primero")
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.write(f"### {continente1}")
-        if len(penaltis_cont1) > 0:
-            # Analizar resultados cuando tira primero
-            primero_gana = sum(penaltis_cont1['first_shooter'] == penaltis_cont1['winner'])
-            total_penaltis = len(penaltis_cont1)
-            
-            st.write(f"Cuando tira primero:")
-            st.write(f"- Gana: {(primero_gana/total_penaltis*100):.1f}%")
-            st.write(f"- Pierde: {((total_penaltis-primero_gana)/total_penaltis*100):.1f}%")
+        mostrar_primer_tirador(continente1)
     
     with col2:
         st.write(f"### {continente2}")
-        if len(penaltis_cont2) > 0:
-            # Analizar resultados cuando tira primero
-            primero_gana = sum(penaltis_cont2['first_shooter'] == penaltis_cont2['winner'])
-            total_penaltis = len(penaltis_cont2)
-            
-            st.write(f"Cuando tira primero:")
-            st.write(f"- Gana: {(primero_gana/total_penaltis*100):.1f}%")
-            st.write(f"- Pierde: {((total_penaltis-primero_gana)/total_penaltis*100):.1f}%")
+        mostrar_primer_tirador(continente2)
+    
+    mostrar_desglose_penales(datos)
 
-def mostrar_mejores_equipos(df, paises_cont1, paises_cont2, continente1, continente2):
+
+@st.fragment
+def mostrar_desglose_penales(datos):
+    """Otros desgloses de la ventaja de tirar primero (fragmento: el selector solo recalcula esta tabla)."""
+    desgloses = {'Torneo': 'tournament', 'Década': 'decade', 'Equipo': 'team'}
+    desglose = st.selectbox("Ver la ventaja de tirar primero por", list(desgloses), key="desglose_penales")
+    tabla = shootout_breakdown(datos, desgloses[desglose])
+    tabla = tabla[tabla['con_primer_tirador'] > 0].sort_values('tandas', ascending=False, kind='stable')
+    st.dataframe(
+        tabla.rename_axis(desglose).rename(columns={
+            'tandas': 'Tandas', 'con_primer_tirador': 'Con dato', 'gana_primero': 'Gana el primero',
+            'porcentaje': '% Gana', 'ic_inferior': 'IC 95% inf.', 'ic_superior': 'IC 95% sup.',
+        }).round(1),
+        use_container_width=True,
+    )
+
+def mostrar_mejores_equipos(team_matches, continents, continente1, continente2, min_partidos=MIN_PARTIDOS):
     st.subheader("Mejores Equipos por Continente🥇")
     
     col1, col2 = st.columns(2)
     
-    # Función auxiliar para calcular mejores equipos
-    def calcular_mejores_equipos(df_cont, paises):
-        equipos_stats = []
-        for equipo in paises:
-            # Partidos como local
-            matches_local = df_cont[df_cont['home_team'] == equipo]
-            total_local = len(matches_local)
-            if total_local >= 200:
-                victorias_local = sum(matches_local['home_score'] > matches_local['away_score'])
-                empates_local = sum(matches_local['home_score'] == matches_local['away_score'])
-                goles_favor_local = matches_local['home_score'].sum()
-                goles_contra_local = matches_local['away_score'].sum()
-                
-                # Puntos: 3 por victoria, 1 por empate
-                puntos_local = (victorias_local * 3) + (empates_local * 1)
-                max_puntos_local = total_local * 3  # Máximo de puntos posibles
-                rendimiento_local = (puntos_local / max_puntos_local * 100)
-                
-                equipos_stats.append({
-                    'equipo': equipo,
-                    'rendimiento_local': rendimiento_local,
-                    'puntos_local': puntos_local,
-                    'partidos_local': total_local,
-                    'victorias_local': victorias_local,
-                    'empates_local': empates_local,
-                    'goles_favor_local': goles_favor_local,
-                    'goles_contra_local': goles_contra_local,
-                    'diferencia_goles_local': goles_favor_local - goles_contra_local
-                })
-            
-            # Partidos como visitante
-            matches_visitante = df_cont[df_cont['away_team'] == equipo]
-            total_visitante = len(matches_visitante)
-            if total_visitante >= 200:
-                victorias_visitante = sum(matches_visitante['away_score'] > matches_visitante['home_score'])
-                empates_visitante = sum(matches_visitante['away_score'] == matches_visitante['home_score'])
-                goles_favor_visitante = matches_visitante['away_score'].sum()
-                goles_contra_visitante = matches_visitante['home_score'].sum()
-                
-                puntos_visitante = (victorias_visitante * 3) + (empates_visitante * 1)
-                max_puntos_visitante = total_visitante * 3
-                rendimiento_visitante = (puntos_visitante / max_puntos_visitante * 100)
-                
-                equipos_stats.append({
-                    'equipo': equipo,
-                    'rendimiento_visitante': rendimiento_visitante,
-                    'puntos_visitante': puntos_visitante,
-                    'partidos_visitante': total_visitante,
-                    'victorias_visitante': victorias_visitante,
-                    'empates_visitante': empates_visitante,
-                    'goles_favor_visitante': goles_favor_visitante,
-                    'goles_contra_visitante': goles_contra_visitante,
-                    'diferencia_goles_visitante': goles_favor_visitante - goles_contra_visitante
-                })
-        
-        return pd.DataFrame(equipos_stats)
-    
-    def mostrar_info_equipo(stats, tipo):
-        mejor = stats.nlargest(1, f'rendimiento_{tipo}').iloc[0]
+    def mostrar_info_equipo(continente, tipo):
+        # El ranking de todos los equipos está en caché; aquí solo se filtra el continente
+        miembros = continents.mask(continents.membership, continente)
+        mejores = best_teams(team_matches, tipo, miembros, min_partidos, 1)
+        if mejores.empty:
+            return
+        mejor = mejores.iloc[0]
         st.metric(
             f"Mejor Equipo {tipo.title()}",
             mejor['equipo'],
@@ -341,47 +186,27 @@ def mostrar_mejores_equipos(df, paises_cont1, paises_cont2, continente1, contine
         )
         
         # Detalles adicionales
-        st.write(f"- Puntos: {mejor[f'puntos_{tipo}']} de {mejor[f'partidos_{tipo}'] * 3} posibles")
-        st.write(f"- Victorias: {mejor[f'victorias_{tipo}']} de {mejor[f'partidos_{tipo}']} partidos")
-        st.write(f"- Goles: {mejor[f'goles_favor_{tipo}']} a favor, {mejor[f'goles_contra_{tipo}']} en contra")
-        st.write(f"- Diferencia: {mejor[f'diferencia_goles_{tipo}']} goles")
+        st.write(f"- Puntos: {int(mejor[f'puntos_{tipo}'])} de {int(mejor[f'partidos_{tipo}']) * 3} posibles")
+        st.write(f"- Victorias: {int(mejor[f'victorias_{tipo}'])} de {int(mejor[f'partidos_{tipo}'])} partidos")
+        st.write(f"- Goles: {int(mejor[f'goles_favor_{tipo}'])} a favor, {int(mejor[f'goles_contra_{tipo}'])} en contra")
+        st.write(f"- Diferencia: {int(mejor[f'diferencia_goles_{tipo}'])} goles")
     
     # Análisis para el primer continente
     with col1:
         st.write(f"### {continente1}")
         col1_1, col1_2 = st.columns([1, 1])
-        
-        
-        df_cont1 = df[
-            (df['home_team'].isin(paises_cont1)) | 
-            (df['away_team'].isin(paises_cont1))
-        ]
-        stats_cont1 = calcular_mejores_equipos(df_cont1, paises_cont1)
-        
-        if not stats_cont1.empty:
-            with col1_1:
-                if 'rendimiento_local' in stats_cont1.columns:
-                    mostrar_info_equipo(stats_cont1, 'local')
-            with col1_2:
-                if 'rendimiento_visitante' in stats_cont1.columns:
-                    #st.markdown("---")  # Separador
-                    mostrar_info_equipo(stats_cont1, 'visitante')
+        with col1_1:
+            mostrar_info_equipo(continente1, 'local')
+        with col1_2:
+            #st.markdown("---")  # Separador
+            mostrar_info_equipo(continente1, 'visitante')
     
     # Análisis para el segundo continente
     with col2:
         st.write(f"### {continente2}")
         col2_1, col2_2 = st.columns([1, 1])
-        df_cont2 = df[
-            (df['home_team'].isin(paises_cont2)) | 
-            (df['away_team'].isin(paises_cont2))
-        ]
-        stats_cont2 = calcular_mejores_equipos(df_cont2, paises_cont2)
-        
-        if not stats_cont2.empty:
-            with col2_1:
-                if 'rendimiento_local' in stats_cont2.columns:
-                    mostrar_info_equipo(stats_cont2, 'local')
-            with col2_2:
-                if 'rendimiento_visitante' in stats_cont2.columns:
-                    #st.markdown("---")  # Separador
-                    mostrar_info_equipo(stats_cont2, 'visitante')
\ No newline at end of file
+        with col2_1:
+            mostrar_info_equipo(continente2, 'local')
+        with col2_2:
+            #st.markdown("---")  # Separador
+            mostrar_info_equipo(continente2, 'visitante')
@@ -1,10 +1,47 @@
 import streamlit as st
 import plotly.graph_objects as go
-import pandas as pd
-import numpy as np
-def show(df):
+from plotly.subplots import make_subplots
+from analytics.goal_minutes import goal_minute_filters, goal_minute_distribution, half_goals_minute
+from analytics.scorelines import GRUPOS_TORNEO, scoreline_matrix, scoreline_stats, goal_records
+from figure_cache import cached_figure
+
+def show(datos):
     st.header("⚽ Patrones de Goles")
 
+    mostrar_marcadores(datos)
+
+    # Estadísticas adicionales
+    st.markdown("### Estadísticas de Goles")
+    
+    col3, col4, col5 = st.columns(3)
+    records = goal_records(datos.results)
+    
+    with col3:
+        max_goles = records['max_goles_local']
+        st.metric("Máximo de Goles en un Partido (Local)", max_goles)
+        partido_max_goles = records['partido_max_goles']
+        st.write(f"{partido_max_goles['home_team']} {int(partido_max_goles['home_score'])} - "
+                 f"{int(partido_max_goles['away_score'])} {partido_max_goles['away_team']}")
+    
+    with col4:
+        promedio_goles = records['promedio_goles']
+        st.metric("Promedio de Goles por Partido", f"{promedio_goles:.2f}")
+    
+    with col5:
+        partidos_sin_goles = records['partidos_sin_goles']
+        porcentaje_sin_goles = records['pct_sin_goles']
+        st.metric("Partidos Sin Goles", f"{partidos_sin_goles} ({porcentaje_sin_goles:.1f}%)")
+
+    mostrar_minutos_goles(datos)
+
+
+@st.fragment
+def mostrar_marcadores(datos):
+    """Sección "Frecuencia de Resultados" con filtros de años, torneos y sede.
+
+    Es un fragmento y todo sale del tensor de marcadores precalculado al
+    cargar: cambiar un filtro es una suma sobre sus ejes.
+    """
     # Explicación del heatmap
     st.markdown("""
         ### Frecuencia de Resultados
@@ -15,11 +52,49 @@ def show(df):
         - Cada celda muestra el número de veces que ocurrió ese resultado
     """)
 
-    # Crear heatmap de goles mejorado
-    goles_matrix = pd.crosstab(df['home_score'], df['away_score'])
+    tensor = datos.scorelines
+    primer_año, ultimo_año = int(tensor.años[0]), int(tensor.años[-1])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        desde, hasta = st.slider("Años", primer_año, ultimo_año, (primer_año, ultimo_año), key="marcadores_años")
+    with col2:
+        grupos = st.multiselect("Torneos", GRUPOS_TORNEO, default=GRUPOS_TORNEO, key="marcadores_torneos")
+    with col3:
+        sede = st.selectbox("Sede", ["Todas", "Con localía", "Neutral"], key="marcadores_sede")
+    neutral = {"Todas": None, "Con localía": False, "Neutral": True}[sede]
+    filtros = (desde, hasta, grupos, neutral)
 
-    # Limitamos a resultados más comunes (0-7 goles) para mejor visualización
-    goles_matrix = goles_matrix.loc[0:7, 0:7]
+    estadisticas = scoreline_stats(tensor, *filtros)
+    if estadisticas['partidos'] == 0:
+        st.info("No hay partidos con esos filtros.")
+        return
+
+    # Heatmap de goles (figura en caché por estado de los filtros)
+    goles_matrix = scoreline_matrix(tensor, 7, *filtros)
+    st.plotly_chart(figura_marcadores(tensor, *filtros), use_container_width=True)
+
+    # Ejemplos de interpretación
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Ejemplos de interpretación:")
+        resultado_ejemplo = goles_matrix.loc[1,0]
+        st.write(f"• El resultado 1-0 (victoria local) ocurrió {resultado_ejemplo} veces")
+        resultado_ejemplo_2 = goles_matrix.loc[2,1]
+        st.write(f"• El resultado 2-1 (victoria local) ocurrió {resultado_ejemplo_2} veces")
+
+    with col2:
+        # Resultado más común y vallas invictas de los partidos filtrados
+        max_home, max_away, max_val = estadisticas['marcador_mas_comun']
+        st.markdown("#### Resultado más común:")
+        st.write(f"• El marcador {max_home}-{max_away} es el más frecuente con {max_val} partidos")
+        st.write(f"• En el {estadisticas['pct_valla_invicta']:.1f}% de los {estadisticas['partidos']:,} "
+                 f"partidos al menos un equipo no recibió goles")
+
+
+@cached_figure
+def figura_marcadores(tensor, desde, hasta, grupos, neutral):
+    """Mapa de calor de los marcadores más comunes (0-7 goles por equipo) con los filtros dados."""
+    goles_matrix = scoreline_matrix(tensor, 7, desde, hasta, grupos, neutral)
 
     fig_heatmap = go.Figure(
         data=go.Heatmap(
@@ -48,45 +123,75 @@ def show(df):
         width=800,
         height=600
     )
+    return fig_heatmap
 
-    # Añadir ejemplos de cómo interpretar
-    st.plotly_chart(fig_heatmap, use_container_width=True)
 
-    # Ejemplos de interpretación
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("#### Ejemplos de interpretación:")
-        resultado_ejemplo = goles_matrix.loc[1,0]
-        st.write(f"• El resultado 1-0 (victoria local) ocurrió {resultado_ejemplo} veces")
-        resultado_ejemplo_2 = goles_matrix.loc[2,1]
-        st.write(f"• El resultado 2-1 (victoria local) ocurrió {resultado_ejemplo_2} veces")
+@st.fragment
+def mostrar_minutos_goles(datos):
+    """Sección "¿Cuándo se marcan los goles?" con filtros sobre los goles con minuto.
+
+    Es un fragmento: cambiar un filtro vuelve a ejecutar solo esta sección.
+    """
+    st.markdown("### ¿Cuándo se marcan los goles?")
+    opciones = goal_minute_filters(datos)
 
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        equipo = st.selectbox("Equipo", ["Todos"] + opciones['equipos'], key="minutos_equipo")
+        lado = st.selectbox("Condición", ["Todos", "Local", "Visitante"], key="minutos_lado")
     with col2:
-        # Encontrar el resultado más común
-        max_val = goles_matrix.max().max()
-        max_idx = np.where(goles_matrix == max_val)
-        max_home = max_idx[0][0]
-        max_away = max_idx[1][0]
-        st.markdown("#### Resultado más común:")
-        st.write(f"• El marcador {max_home}-{max_away} es el más frecuente con {max_val} partidos")
-    
-    # Estadísticas adicionales
-    st.markdown("### Estadísticas de Goles")
-    
-    col3, col4, col5 = st.columns(3)
-    
+        torneo = st.selectbox("Torneo", ["Todos"] + opciones['torneos'], key="minutos_torneo")
+        tipo = st.selectbox("Tipo de gol", ["Todos", "Jugada", "Penal", "En contra"], key="minutos_tipo")
     with col3:
-        max_goles = df['home_score'].max()
-        st.metric("Máximo de Goles en un Partido (Local)", max_goles)
-        partido_max_goles = df[df['home_score'] == max_goles].iloc[0]
-        st.write(f"{partido_max_goles['home_team']} {int(partido_max_goles['home_score'])} - "
-                 f"{int(partido_max_goles['away_score'])} {partido_max_goles['away_team']}")
-    
-    with col4:
-        promedio_goles = (df['home_score'] + df['away_score']).mean()
-        st.metric("Promedio de Goles por Partido", f"{promedio_goles:.2f}")
-    
-    with col5:
-        partidos_sin_goles = len(df[(df['home_score'] == 0) & (df['away_score'] == 0)])
-        porcentaje_sin_goles = (partidos_sin_goles / len(df)) * 100
-        st.metric("Partidos Sin Goles", f"{partidos_sin_goles} ({porcentaje_sin_goles:.1f}%)")
\ No newline at end of file
+        decada = st.selectbox("Década", ["Todas"] + opciones['decadas'], key="minutos_decada")
+        ancho = st.select_slider("Minutos por barra", options=[1, 5, 15], value=5, key="minutos_ancho")
+
+    # Tipo de gol -> (penal, en contra)
+    penal, en_contra = {
+        "Todos": (None, None), "Jugada": (False, False), "Penal": (True, None), "En contra": (None, True),
+    }[tipo]
+    distribucion = goal_minute_distribution(
+        datos,
+        None if equipo == "Todos" else equipo,
+        None if torneo == "Todos" else torneo,
+        None if decada == "Todas" else decada,
+        {"Todos": None, "Local": True, "Visitante": False}[lado],
+        penal,
+        en_contra,
+        ancho,
+    )
+
+    total = int(distribucion['goles'].sum())
+    if total == 0:
+        st.warning("No hay goles con minuto registrado para esta selección")
+        return
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_trace(go.Bar(
+        x=distribucion.index,
+        y=distribucion['porcentaje'],
+        name="% de goles",
+        marker_color="#2085ec",
+        customdata=distribucion['goles'],
+        hovertemplate="Desde el minuto %{x}<br>%{y:.1f}% de los goles (%{customdata})<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        x=distribucion.index + ancho - 1,
+        y=distribucion['acumulado'],
+        name="% acumulado",
+        mode="lines",
+        line=dict(color="#cea9bc"),
+        hovertemplate="Hasta el minuto %{x}: %{y:.1f}%<extra></extra>",
+    ), secondary_y=True)
+    fig.update_layout(
+        title={'text': f"Distribución de {total} goles por minuto", 'x': 0.5, 'xanchor': 'center'},
+        xaxis_title="Minuto",
+        height=450,
+    )
+    fig.update_yaxes(title_text="% de goles", secondary_y=False)
+    fig.update_yaxes(title_text="% acumulado", range=[0, 100], secondary_y=True)
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Minuto en el que se llega a la mitad de los goles
+    mediana = half_goals_minute(distribucion)
+    st.write(f"• La mitad de los goles se marca hasta el minuto {mediana}")
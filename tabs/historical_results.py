@@ -1,46 +1,57 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
+from analytics.aggregates import RESULTADOS
+from analytics.historical import historical_periods, historical_summary
+from figure_cache import cached_figure
 
-def show(df):
+def show(datos):
     st.header("📈 Evolución Histórica de Resultados")
 
     # Selector de periodo
-    años = df['year'].unique()
+    años = historical_periods(datos.years)
     start_year, end_year = st.select_slider(
         'Selecciona el período de análisis',
         options=años,
         value=(años.min(), años.max())
     )
 
-    # Filtrar datos por período
-    mask = (df['year'] >= start_year) & (df['year'] <= end_year)
-    df_filtered = df[mask]
+    # Totales del período (del cubo acumulado por año, cada consulta es O(1))
+    resumen = historical_summary(datos.years, start_year, end_year)
 
     # Métricas generales
     st.markdown("### 📊 Métricas Generales")
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_matches = len(df_filtered)
+        total_matches = resumen['partidos']
         st.metric("Total de Partidos", f"{total_matches:,}")
     
     with col2:
-        avg_goals = (df_filtered['home_score'] + df_filtered['away_score']).mean()
+        avg_goals = resumen['promedio_goles']
         st.metric("Promedio de Goles por Partido", f"{avg_goals:.2f}")
     
     with col3:
-        home_wins = (df_filtered['resultado'] == 'Victoria Local').mean() * 100
+        home_wins = resumen['pct_victorias_local']
         st.metric("% Victorias Locales", f"{home_wins:.1f}%")
     
     with col4:
-        most_common_score = f"{df_filtered['home_score'].mode().iloc[0]}-{df_filtered['away_score'].mode().iloc[0]}"
+        local, visitante = resumen['marcador_mas_comun']
+        most_common_score = f"{local}-{visitante}"
         st.metric("Resultado más Común", most_common_score)
 
-    # Gráfico interactivo de evolución
+    # Gráficos interactivos (en caché por período, ver figure_cache)
+    st.plotly_chart(figura_evolucion(datos.years, start_year, end_year), use_container_width=True)
+    st.plotly_chart(figura_partidos(datos.years, start_year, end_year), use_container_width=True)
+
+
+@cached_figure
+def figura_evolucion(cubo, start_year, end_year):
+    """Partidos por año y resultado (victoria local, empate, victoria visitante)."""
+    partidos_año = historical_summary(cubo, start_year, end_year)['por_año']
     fig_evolution = go.Figure()
-    for resultado in ['Victoria Local', 'Empate', 'Victoria Visitante']:
-        yearly_stats = df_filtered[df_filtered['resultado'] == resultado].groupby('year').size()
+    for resultado in RESULTADOS:
+        yearly_stats = partidos_año[resultado]
+        yearly_stats = yearly_stats[yearly_stats > 0]
         fig_evolution.add_trace(
             go.Scatter(
                 x=yearly_stats.index,
@@ -60,10 +71,15 @@ def show(df):
         hovermode='x unified',
         showlegend=True
     )
-    st.plotly_chart(fig_evolution, use_container_width=True)
+    return fig_evolution
 
-    # Gráfico de número de partidos por año
-    partidos_por_año = df_filtered.groupby('year').size()
+
+@cached_figure
+def figura_partidos(cubo, start_year, end_year):
+    """Número total de partidos por año."""
+    partidos_año = historical_summary(cubo, start_year, end_year)['por_año']
+    partidos_por_año = partidos_año.sum(axis=1)
+    partidos_por_año = partidos_por_año[partidos_por_año > 0]
     fig_partidos = go.Figure()
 
     fig_partidos.add_trace(
@@ -87,5 +103,4 @@ def show(df):
         hovermode='x unified',
         showlegend=True
     )
-
-    st.plotly_chart(fig_partidos, use_container_width=True)
\ No newline at end of file
+    return fig_partidos
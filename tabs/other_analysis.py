@@ -1,75 +1,23 @@
 import streamlit as st
 import plotly.express as px
-import pandas as pd
+from analytics.first_goal import (
+    first_goal_years, first_goal_teams, first_goal_by_continent, first_goal_by_team,
+)
 
-def load_data(df, df_countries, df_goalscorers):
-    """Carga y prepara los datos."""
-    continentes = df_countries.groupby(df_countries.columns[1])[df_countries.columns[0]].agg(list).to_dict()
-    
-    # Convertir df_goalscorers a DataFrame
-    columns = ['date', 'home_team', 'away_team', 'team', 'scorer', 'minute', 'own_goal', 'penalty']
-    df_goalscorers = pd.DataFrame(df_goalscorers, columns=columns)
-    df_goalscorers['date'] = pd.to_datetime(df_goalscorers['date'])
-    df_goalscorers['year'] = df_goalscorers['date'].dt.year
-    
-    # Crear columna 'resultado' si no existe
-    if 'resultado' not in df.columns:
-        df['resultado'] = df.apply(lambda row: 
-            'Victoria Local' if row['home_score'] > row['away_score']
-            else 'Victoria Visitante' if row['home_score'] < row['away_score']
-            else 'Empate', axis=1)
-    
-    return df, df_goalscorers, continentes
-
-def filter_data(df_goalscorers, continentes):
-    """Filtra los datos según el periodo de análisis y los continentes seleccionados."""
-    min_year = df_goalscorers['year'].min()
-    max_year = df_goalscorers['year'].max()
+def filter_data(datos):
+    """Selectores del periodo de análisis y de los dos continentes a comparar."""
+    min_year, max_year = first_goal_years(datos)
     selected_years = st.slider("Selecciona el periodo de análisis", min_year, max_year, (min_year, max_year))
-    df_goalscorers = df_goalscorers[(df_goalscorers['year'] >= selected_years[0]) & (df_goalscorers['year'] <= selected_years[1])]
 
     default_continents = ["Sudamérica", "Europa"]
-    selected_continents = st.multiselect("Selecciona dos continentes para comparar", list(continentes.keys()), default=default_continents)
+    selected_continents = st.multiselect("Selecciona dos continentes para comparar", list(datos.continents.names), default=default_continents)
 
     if len(selected_continents) != 2:
         st.error("Por favor selecciona exactamente dos continentes.")
-        return None, None, None, None
+        return None, None, None
 
     continent1, continent2 = selected_continents
-    countries_cont1 = continentes[continent1]
-    countries_cont2 = continentes[continent2]
-
-    df_cont1 = df_goalscorers[
-        (df_goalscorers['home_team'].isin(countries_cont1)) |
-        (df_goalscorers['away_team'].isin(countries_cont1))
-    ]
-    df_cont2 = df_goalscorers[
-        (df_goalscorers['home_team'].isin(countries_cont2)) |
-        (df_goalscorers['away_team'].isin(countries_cont2))
-    ]
-    
-    return df_cont1, df_cont2, continent1, continent2
-
-def analyze_first_goal(df, df_cont):
-    """Analiza el primer gol de los partidos."""
-    df_cont = df_cont.merge(df[['date', 'home_team', 'away_team', 'resultado']], on=['date', 'home_team', 'away_team'], how='left')
-    df_cont['game_id'] = df_cont.groupby(['date', 'home_team', 'away_team']).ngroup()
-    df_cont = df_cont.sort_values(by=['game_id', 'minute'])
-
-    first_goal = df_cont.groupby('game_id').first().reset_index()
-    first_goal['won'] = first_goal.apply(
-        lambda row: 'Ganado' if (row['team'] == row['home_team'] and row['resultado'] == 'Victoria Local') 
-        or (row['team'] == row['away_team'] and row['resultado'] == 'Victoria Visitante') 
-        else 'Perdido', axis=1
-    )
-    first_goal['home_or_away'] = first_goal.apply(lambda row: 'Local' if row['team'] == row['home_team'] else 'Visitante', axis=1)
-    
-    home_wins = first_goal[first_goal['home_or_away'] == 'Local']['won'].value_counts(normalize=True).mul(100).round(2).reset_index()
-    home_wins.columns = ['Resultado', 'Porcentaje']
-    away_wins = first_goal[first_goal['home_or_away'] == 'Visitante']['won'].value_counts(normalize=True).mul(100).round(2).reset_index()
-    away_wins.columns = ['Resultado', 'Porcentaje']
-    
-    return home_wins, away_wins
+    return selected_years, continent1, continent2
 
 def create_donut_chart(df, title):
     """Crea gráficos de dona."""
@@ -111,34 +59,33 @@ def show_visualization(home_wins_cont1, away_wins_cont1, home_wins_cont2, away_w
             fig4 = create_donut_chart(away_wins_cont2, "Equipos Visitantes")
             st.plotly_chart(fig4)
 
-def show(df, df_countries, df_goalscorers):
-    df, df_goalscorers, continentes = load_data(df, df_countries, df_goalscorers)
-    df_cont1, df_cont2, continent1, continent2 = filter_data(df_goalscorers, continentes)
+def show(datos):
+    selected_years, continent1, continent2 = filter_data(datos)
 
-    if df_cont1 is not None and df_cont2 is not None:
-        home_wins_cont1, away_wins_cont1 = analyze_first_goal(df, df_cont1)
-        home_wins_cont2, away_wins_cont2 = analyze_first_goal(df, df_cont2)
+    if selected_years is not None:
+        # Partidos del período con algún equipo de cada continente (tabla de primeros goles en caché)
+        home_wins_cont1, away_wins_cont1 = first_goal_by_continent(datos, continent1, *selected_years)
+        home_wins_cont2, away_wins_cont2 = first_goal_by_continent(datos, continent2, *selected_years)
         show_visualization(home_wins_cont1, away_wins_cont1, home_wins_cont2, away_wins_cont2, continent1, continent2)
-    analyze_team(df, df_goalscorers)
+    analyze_team(datos)
     #analyze_penalty_goals(df,df_goalscorers)
 
 
-def analyze_team(df, df_goalscorers):
-    """Realiza el análisis de un equipo seleccionado."""
-    teams = df_goalscorers['team'].unique().tolist()
+@st.fragment
+def analyze_team(datos):
+    """Realiza el análisis de un equipo seleccionado (fragmento: el selector solo recalcula esta parte)."""
+    df_goalscorers = datos.goalscorers
+    teams = first_goal_teams(datos)
     default_team = "Ecuador"
     selected_team = st.selectbox("Selecciona un equipo para el análisis", teams, index=teams.index(default_team))
 
-    df_team = df_goalscorers[
-        (df_goalscorers['home_team'] == selected_team) | 
-        (df_goalscorers['away_team'] == selected_team)
-    ]
+    resultados_equipo = first_goal_by_team(datos, selected_team)
 
-    if df_team.empty:
+    if resultados_equipo is None:
         st.warning(f"No hay datos disponibles para el equipo: {selected_team}")
         return
 
-    home_wins, away_wins = analyze_first_goal(df, df_team)
+    home_wins, away_wins = resultados_equipo
     st.subheader(f"Análisis de Ventaja al Marcar el Primer Gol - Equipo {selected_team}")
     col1, col2 = st.columns([1, 1])
     
@@ -1,13 +1,20 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
+from analytics.team_profile import (
+    team_periods, teams_in_period, team_record, team_goals, top_rivals, teams_overview,
+)
+from analytics.box_summary import box_summary
+from analytics.elo import team_rating_series
+from figure_cache import cached_figure
+from utils import summary_box_figure
 
-def show(df):
+def show(datos):
     st.header("🏆 Análisis por Equipo")
+    team_matches = datos.team_matches
     
     # Selector de periodo en la parte superior
-    años = df['year'].unique()
+    años = team_periods(datos.years)
     start_year, end_year = st.select_slider(
         'Selecciona el período de análisis',
         options=años,
@@ -15,11 +22,9 @@ def show(df):
         key="team_analysis_period"
     )
     
-    # Filtrar datos por período
-    df_filtered = df[(df['year'] >= start_year) & (df['year'] <= end_year)]
-    
-    # Obtener lista de equipos y asegurar que Ecuador esté como valor por defecto
-    equipos = sorted(df_filtered['home_team'].unique())
+    # Obtener lista de equipos del período (del cubo por año, sin filtrar el DataFrame)
+    # y asegurar que Ecuador esté como valor por defecto
+    equipos = teams_in_period(datos.years, start_year, end_year)
     index_ecuador = equipos.index('Ecuador') if 'Ecuador' in equipos else 0
     
     # Selectores de equipo y tipo de análisis en una fila separada
@@ -33,26 +38,19 @@ def show(df):
     with col2:
         analysis_type = st.selectbox(
             "Tipo de análisis",
-            ["Rendimiento General", "Goles", "Rivales Frecuentes"]
+            ["Rendimiento General", "Goles", "Rivales Frecuentes", "Rating Elo"]
         )
     
-    # Filtrar datos del equipo
-    team_matches = df_filtered[
-        (df_filtered['home_team'] == selected_team) | 
-        (df_filtered['away_team'] == selected_team)
-    ]
     if analysis_type == "Rendimiento General":
+        # Récord del equipo en el período (bloque contiguo de la tabla larga)
+        record = team_record(team_matches, selected_team, start_year, end_year)
+        
         # Crear dos columnas para los gráficos
         col_local, col_visitante = st.columns(2)
         
         with col_local:
             # Resultados como local
-            local_matches = team_matches[team_matches['home_team'] == selected_team]
-            local_results = pd.Series({
-                'Victoria': sum(local_matches['home_score'] > local_matches['away_score']),
-                'Empate': sum(local_matches['home_score'] == local_matches['away_score']),
-                'Derrota': sum(local_matches['home_score'] < local_matches['away_score'])
-            })
+            local_results = record['local']
             
             fig_home = px.pie(
                 values=local_results.values,
@@ -65,12 +63,7 @@ def show(df):
         
         with col_visitante:
             # Resultados como visitante
-            away_matches = team_matches[team_matches['away_team'] == selected_team]
-            away_results = pd.Series({
-                'Victoria': sum(away_matches['away_score'] > away_matches['home_score']),
-                'Empate': sum(away_matches['away_score'] == away_matches['home_score']),
-                'Derrota': sum(away_matches['away_score'] < away_matches['home_score'])
-            })
+            away_results = record['visitante']
             
             fig_away = px.pie(
                 labels=['Victoria', 'Empate', 'Derrota'],
@@ -87,114 +80,56 @@ def show(df):
         stats_col1, stats_col2, stats_col3 = st.columns(3)
         
         with stats_col1:
-            total_matches = len(team_matches)
+            total_matches = record['partidos']
             st.metric("Total de Partidos", total_matches)
         
         with stats_col2:
-            # Calcular victorias totales (local + visitante)
-            victorias_local = sum((team_matches['home_team'] == selected_team) & 
-                                (team_matches['home_score'] > team_matches['away_score']))
-            victorias_visitante = sum((team_matches['away_team'] == selected_team) & 
-                                    (team_matches['away_score'] > team_matches['home_score']))
-            total_wins = victorias_local + victorias_visitante
-            win_rate = (total_wins / total_matches * 100) if total_matches > 0 else 0
+            # Victorias totales (local + visitante)
+            win_rate = record['pct_victorias']
             st.metric("Porcentaje de Victorias", f"{win_rate:.1f}%")
         
         with stats_col3:
-            # Calcular promedio de goles a favor
-            goles_favor = (
-                team_matches[team_matches['home_team'] == selected_team]['home_score'].sum() +
-                team_matches[team_matches['away_team'] == selected_team]['away_score'].sum()
-            )
-            avg_goals = goles_favor / total_matches if total_matches > 0 else 0
+            # Promedio de goles a favor
+            avg_goals = record['promedio_goles']
             st.metric("Promedio de Goles por Partido", f"{avg_goals:.2f}")
     
     elif analysis_type == "Goles":
-        # Gráfico de goles
-        fig_goals = go.Figure()
-        
-        # Goles como local
-        home_goals = team_matches[team_matches['home_team'] == selected_team]['home_score']
-        away_goals = team_matches[team_matches['away_team'] == selected_team]['away_score']
-        
-        fig_goals.add_trace(
-            go.Box(
-                y=home_goals,
-                name="Goles como Local",
-                boxpoints='all',
-                jitter=0.3,
-                pointpos=-1.8
-            )
-        )
-        
-        fig_goals.add_trace(
-            go.Box(
-                y=away_goals,
-                name="Goles como Visitante",
-                boxpoints='all',
-                jitter=0.3,
-                pointpos=-1.8
-            )
-        )
-        
-        fig_goals.update_layout(
-            title=f"Distribución de Goles de {selected_team} ({start_year}-{end_year})",
-            yaxis_title="Goles por Partido",
-            showlegend=True
-        )
+        # Goles como local y como visitante: cajas resumidas en el servidor y una muestra acotada
+        mostrar_puntos = st.toggle("Mostrar muestra de partidos", value=True, key="equipo_puntos")
+        fig_goals = figura_goles_equipo(team_matches, selected_team, start_year, end_year, mostrar_puntos)
         
         st.plotly_chart(fig_goals, use_container_width=True)
         
+    elif analysis_type == "Rating Elo":
+        # Rating después de cada partido, calculado una vez para todo el histórico al cargar
+        serie = team_rating_series(datos.elo, team_matches, selected_team, start_year, end_year)
+        if serie.empty:
+            st.warning(f"No hay partidos de {selected_team} en el período seleccionado.")
+        else:
+            elo_col1, elo_col2, elo_col3 = st.columns(3)
+            with elo_col1:
+                st.metric(f"Rating al final de {end_year}", f"{serie['rating'].iloc[-1]:.0f}",
+                          f"{serie['cambio'].sum():+.0f} en el período")
+            with elo_col2:
+                maximo = serie.loc[serie['rating'].idxmax()]
+                st.metric("Rating Máximo", f"{maximo['rating']:.0f}", maximo['date'].strftime('%Y-%m-%d'),
+                          delta_color="off")
+            with elo_col3:
+                minimo = serie.loc[serie['rating'].idxmin()]
+                st.metric("Rating Mínimo", f"{minimo['rating']:.0f}", minimo['date'].strftime('%Y-%m-%d'),
+                          delta_color="off")
+            st.plotly_chart(figura_elo_equipo(datos, selected_team, start_year, end_year),
+                            use_container_width=True)
+
     else:  # Rivales Frecuentes
         # Dividir en columnas para estadísticas y gráfico
         #st.markdown("Ya pana")
         st.markdown(f"### Estadísticas Detalladas")
         col_stats, col_graph = st.columns([1, 1])
         
-        # Calcular estadísticas completas de rivalidades
-        rival_stats = []
-        for rival in df_filtered['home_team'].unique():
-            if rival != selected_team:
-                # Partidos como local
-                local_matches = df_filtered[
-                    (df_filtered['home_team'] == selected_team) & 
-                    (df_filtered['away_team'] == rival)
-                ]
-                # Partidos como visitante
-                away_matches = df_filtered[
-                    (df_filtered['home_team'] == rival) & 
-                    (df_filtered['away_team'] == selected_team)
-                ]
-                
-                total_matches = len(local_matches) + len(away_matches)
-                if total_matches > 0:
-                    # Victorias como local
-                    wins_local = len(local_matches[local_matches['home_score'] > local_matches['away_score']])
-                    # Victorias como visitante
-                    wins_away = len(away_matches[away_matches['away_score'] > away_matches['home_score']])
-                    # Total victorias
-                    total_wins = wins_local + wins_away
-                    
-                    rival_stats.append({
-                        'rival': rival,
-                        'total_matches': total_matches,
-                        'victories': total_wins,
-                        'win_rate': (total_wins / total_matches) * 100,
-                        'goals_favor': (
-                            local_matches['home_score'].sum() + 
-                            away_matches['away_score'].sum()
-                        ),
-                        'goals_against': (
-                            local_matches['away_score'].sum() + 
-                            away_matches['home_score'].sum()
-                        )
-                    })
-        
-        # Convertir a DataFrame y ordenar
-        rivals_df = pd.DataFrame(rival_stats)
+        # Estadísticas de rivalidades desde el agregado equipo x rival precalculado
+        rivals_df = top_rivals(team_matches, selected_team, start_year, end_year, 10)
         if not rivals_df.empty:
-            rivals_df = rivals_df.sort_values('total_matches', ascending=False).head(10)
-            
             # Gráfico de barras mejorado
             with col_graph:
                 fig_rivals = go.Figure()
@@ -241,8 +176,8 @@ def show(df):
                         
                 # Formatear datos para la tabla
                 rivals_df['win_rate'] = rivals_df['win_rate'].round(1)
-                rivals_df['avg_goals_favor'] = (rivals_df['goals_favor'] / rivals_df['total_matches']).round(2)
-                rivals_df['avg_goals_against'] = (rivals_df['goals_against'] / rivals_df['total_matches']).round(2)
+                rivals_df['avg_goals_favor'] = rivals_df['avg_goals_favor'].round(2)
+                rivals_df['avg_goals_against'] = rivals_df['avg_goals_against'].round(2)
                 
                 # Mostrar tabla con estadísticas clave
                 st.dataframe(
@@ -265,41 +200,10 @@ def show(df):
     st.markdown("---")
     st.subheader("📊 Análisis General de Equipos")
     
-    # Crear métricas para todos los equipos
-    equipos_stats = []
-    for equipo in equipos:
-        matches = df_filtered[
-            (df_filtered['home_team'] == equipo) | 
-            (df_filtered['away_team'] == equipo)
-        ]
-        
-        if len(matches) > 0:
-            # Victorias como local
-            victorias_local = sum((matches['home_team'] == equipo) & 
-                                (matches['home_score'] > matches['away_score']))
-            # Victorias como visitante
-            victorias_visitante = sum((matches['away_team'] == equipo) & 
-                                    (matches['away_score'] > matches['home_score']))
-            
-            # Total victorias
-            total_victorias = victorias_local + victorias_visitante
-            
-            # Goles a favor
-            goles_favor = (
-                matches[matches['home_team'] == equipo]['home_score'].sum() +
-                matches[matches['away_team'] == equipo]['away_score'].sum()
-            )
-            
-            equipos_stats.append({
-                'equipo': equipo,
-                'partidos': len(matches),
-                'victorias': total_victorias,
-                'goles': goles_favor
-            })
+    # Métricas de todos los equipos en una sola pasada (cacheadas por período)
+    df_stats, top_partidos = teams_overview(datos.years, start_year, end_year, 10)
     
-    if equipos_stats:
-        df_stats = pd.DataFrame(equipos_stats)
-        
+    if not df_stats.empty:
         # Crear tres columnas para las métricas
         col1, col2, col3 = st.columns(3)
         
@@ -333,8 +237,7 @@ def show(df):
         # Gráfico comparativo de los mejores equipos
         fig_top = go.Figure()
         
-        # Top 5 equipos por partidos
-        top_partidos = df_stats.nlargest(10, 'partidos')
+        # Top 10 equipos por partidos
         fig_top.add_trace(go.Bar(
             name='Partidos Jugados',
             x=top_partidos['equipo'],
@@ -353,4 +256,41 @@ def show(df):
             
         )
         
-        st.plotly_chart(fig_top, use_container_width=False)
\ No newline at end of file
+        st.plotly_chart(fig_top, use_container_width=False)
+
+
+@cached_figure
+def figura_goles_equipo(team_matches, equipo, start_year, end_year, puntos):
+    """Box plot de los goles del equipo por partido, como local y como visitante."""
+    home_goals, away_goals = team_goals(team_matches, equipo, start_year, end_year)
+    fig_goals = summary_box_figure(
+        {"Goles como Local": box_summary(home_goals), "Goles como Visitante": box_summary(away_goals)},
+        ["#0068C9", "#FF2B2B"], puntos, "Goles",
+    )
+    fig_goals.update_layout(
+        title=f"Distribución de Goles de {equipo} ({start_year}-{end_year})",
+        yaxis_title="Goles por Partido",
+        showlegend=True
+    )
+    return fig_goals
+
+
+@cached_figure
+def figura_elo_equipo(datos, equipo, start_year, end_year):
+    """Evolución del rating Elo del equipo partido a partido en el período."""
+    serie = team_rating_series(datos.elo, datos.team_matches, equipo, start_year, end_year)
+    fig_elo = go.Figure(go.Scatter(
+        x=serie['date'],
+        y=serie['rating'].round(1),
+        customdata=list(zip(serie['opponent'].astype(str), serie['cambio'].round(1))),
+        mode='lines',
+        line=dict(color="#0068C9"),
+        name=equipo,
+        hovertemplate="%{x|%Y-%m-%d}<br>Rating: %{y}<br>vs %{customdata[0]} (%{customdata[1]:+})<extra></extra>",
+    ))
+    fig_elo.update_layout(
+        title=f"Rating Elo de {equipo} ({start_year}-{end_year})",
+        xaxis_title="Fecha",
+        yaxis_title="Rating Elo",
+    )
+    return fig_elo
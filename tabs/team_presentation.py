@@ -1,7 +1,6 @@
 import streamlit as st
 from utils import show_presentation
-import os
-import base64
+from assets import ANCHO_MINIATURA, thumbnail_data_uri
 def show():
     # Contenido SVG como HTML
     svg_content = """
@@ -91,22 +90,17 @@ def show():
             if index < len(team_members):
                 member = team_members[index]
 
-                # 1. Convertimos la imagen en Base64
-                if os.path.exists(member["image"]):
-                    with open(member["image"], "rb") as f:
-                        img_bytes = f.read()
-                    encoded_img = base64.b64encode(img_bytes).decode("utf-8")
-                else:
-                    encoded_img = ""
+                # 1. Miniatura en Base64 (generada una vez por proceso, ver assets)
+                img_src = thumbnail_data_uri(member["image"])
 
                 # 2. HTML sin indentación, con flexbox, todo en un solo bloque
                 html_code = f"""<div style="display: flex; flex-direction: column; 
                                      align-items: center; justify-content: center; 
                                      text-align: center; padding: 10px 0;">
     <img 
-        src="data:image/webp;base64,{encoded_img}" 
+        src="{img_src}" 
         alt="{member['name']}"
-        style="width:150px; border-radius:10px; margin-bottom:10px;"
+        style="width:{ANCHO_MINIATURA}px; border-radius:10px; margin-bottom:10px;"
     />
     <p style="margin: 0; font-weight: bold; font-size: 1.1rem;">
         {member['name']}
@@ -1,48 +1,38 @@
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
-import pandas as pd
-import numpy as np
+from figure_cache import cached_figure
+from utils import summary_box_figure
+from analytics.tournaments import (
+    tournament_names, tournament_stats, tournament_results, tournament_goals_summary,
+    tournament_yearly_goals,
+)
 
-def show(df):
+# Paleta de los torneos: los tres colores originales y después Dark24, para comparar muchos torneos
+COLORES = ["#72b4eb", "#2085ec", "#cea9bc"] + px.colors.qualitative.Dark24
+
+def show(datos):
     st.header("🏆 Comparativa de Torneos")
+    df = datos.results
+    por_año = datos.aggregates['tournament_year']
     
    
     # Selector de torneos
     selected_tournaments = st.multiselect(
         "Selecciona torneos para comparar",
-        df['tournament'].unique(),
+        tournament_names(df),
         default=['FIFA World Cup', 'UEFA Euro', 'Copa América']
     )
     
     if selected_tournaments:
-        tournament_data = df[df['tournament'].isin(selected_tournaments)]
-        
         # Análisis general por torneo
         st.subheader("📊 Estadísticas por Torneo")
         
         # Calcular estadísticas por torneo
-        tournament_stats = []
-        for torneo in selected_tournaments:
-            torneo_matches = tournament_data[tournament_data['tournament'] == torneo]
-            
-            # Estadísticas básicas
-            total_matches = len(torneo_matches)
-            avg_goals = (torneo_matches['home_score'] + torneo_matches['away_score']).mean()
-            max_goals = (torneo_matches['home_score'] + torneo_matches['away_score']).max()
-            clean_sheets = sum((torneo_matches['home_score'] == 0) | (torneo_matches['away_score'] == 0))
-            
-            tournament_stats.append({
-                'Torneo': torneo,
-                'Partidos': total_matches,
-                'Promedio Goles': round(avg_goals, 2),
-                'Máximo Goles': int(max_goals),
-                'Porterías Imbatidas': clean_sheets,
-                'Goles Totales': int(torneo_matches['home_score'].sum() + torneo_matches['away_score'].sum())
-            })
+        tournament_stats_df = tournament_stats(por_año, selected_tournaments)
         
         # Mostrar tabla de estadísticas
-        st.dataframe(pd.DataFrame(tournament_stats).set_index('Torneo'))
+        st.dataframe(tournament_stats_df.set_index('Torneo'))
         
         # Gráficos
         col1, col2 = st.columns(2)
@@ -50,73 +40,87 @@ def show(df):
         with col1:
             # Gráfico de promedio de goles
             fig_goals = px.bar(
-                tournament_stats,
+                tournament_stats_df,
                 x='Torneo',
                 y='Promedio Goles',
                 title="Promedio de Goles por Partido",
                 text='Promedio Goles',
                 color='Torneo',
-                color_discrete_sequence=["#72b4eb", "#2085ec" ,"#cea9bc"]
+                color_discrete_sequence=COLORES
                 
             )
             fig_goals.update_traces(texttemplate='%{text:.2f}', textposition='outside')
             st.plotly_chart(fig_goals, use_container_width=True)
         with col2:
-            # Distribución de goles
-            fig_dist = go.Figure()
-            colors = ["#72b4eb", "#2085ec" ,"#cea9bc"]  # Lista de colores
-
-            for i, torneo in enumerate(selected_tournaments):
-                torneo_data = tournament_data[tournament_data['tournament'] == torneo]
-                goles_partido = torneo_data['home_score'] + torneo_data['away_score']
-                
-                fig_dist.add_trace(go.Box(
-                    y=goles_partido,
-                    name=torneo,
-                    boxpoints='all',
-                    jitter=0.3,
-                    pointpos=-1.8,
-                    marker_color=colors[i % len(colors)]  # Asignar color
-                ))
-            
-            fig_dist.update_layout(
-                title="Distribución de Goles por Partido",
-                yaxis_title="Goles por Partido",
-                showlegend=True
-            )
+            # Distribución de goles: cajas resumidas en el servidor y una muestra acotada
+            mostrar_puntos = st.toggle("Mostrar muestra de partidos", value=True, key="torneos_puntos")
+            fig_dist = figura_distribucion_goles(datos.aggregates['tournament_goals'], selected_tournaments, mostrar_puntos)
             st.plotly_chart(fig_dist, use_container_width=True)
 
         
         
         # Análisis de tendencias temporales
-        if 'year' not in tournament_data.columns:
-            tournament_data['year'] = pd.to_datetime(tournament_data['date']).dt.year
-            
         st.subheader("📈 Evolución Histórica")
         
         # Gráfico de evolución de goles
-        fig_evolution = go.Figure()
+        fig_evolution = figura_evolucion_torneos(por_año, selected_tournaments)
         
-        for torneo in selected_tournaments:
-            torneo_data = tournament_data[tournament_data['tournament'] == torneo]
-            yearly_goals = torneo_data.groupby('year').agg({
-                'home_score': 'sum',
-                'away_score': 'sum'
-            }).reset_index()
-            yearly_goals['total_goals'] = yearly_goals['home_score'] + yearly_goals['away_score']
-            
-            fig_evolution.add_trace(go.Scatter(
-                x=yearly_goals['year'],
-                y=yearly_goals['total_goals'],
-                name=torneo,
-                mode='lines+markers'
-            ))
-        
-        fig_evolution.update_layout(
-            title="Evolución de Goles Totales por Año",
-            xaxis_title="Año",
-            yaxis_title="Goles Totales",
-            hovermode='x unified'
-        )
-        
-        st.plotly_chart(fig_evolution, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig_evolution, use_container_width=True)
+
+        # Reparto de resultados
+        st.subheader("⚖️ Reparto de Resultados")
+        st.plotly_chart(figura_resultados_torneos(por_año, selected_tournaments), use_container_width=True)
+
+
+@cached_figure
+def figura_distribucion_goles(goles, torneos, puntos):
+    """Box plot de goles por partido de cada torneo, a partir del histograma por torneo."""
+    resumenes = {torneo: tournament_goals_summary(goles, torneo) for torneo in torneos}
+    fig_dist = summary_box_figure(resumenes, COLORES, puntos, "Goles")
+    fig_dist.update_layout(
+        title="Distribución de Goles por Partido",
+        yaxis_title="Goles por Partido",
+        showlegend=True
+    )
+    return fig_dist
+
+
+@cached_figure
+def figura_evolucion_torneos(por_año, torneos):
+    """Goles totales por año de cada torneo."""
+    yearly_goals = tournament_yearly_goals(por_año, torneos)
+    fig_evolution = go.Figure()
+    for i, torneo in enumerate(torneos):
+        goles_torneo = yearly_goals[yearly_goals['tournament'] == torneo]
+        fig_evolution.add_trace(go.Scatter(
+            x=goles_torneo['year'],
+            y=goles_torneo['total_goals'],
+            name=torneo,
+            mode='lines+markers',
+            line=dict(color=COLORES[i % len(COLORES)])
+        ))
+    fig_evolution.update_layout(
+        title="Evolución de Goles Totales por Año",
+        xaxis_title="Año",
+        yaxis_title="Goles Totales",
+        hovermode='x unified'
+    )
+    return fig_evolution
+
+
+@cached_figure
+def figura_resultados_torneos(por_año, torneos):
+    """Barras apiladas con el porcentaje de cada resultado por torneo."""
+    resultados = tournament_results(por_año, torneos)
+    fig = go.Figure()
+    for resultado, color in zip(resultados.columns, ["#0068C9", "#83C9FF", "#FF2B2B"]):
+        fig.add_trace(go.Bar(
+            x=resultados.index, y=resultados[resultado], name=resultado,
+            marker_color=color, texttemplate='%{y:.1f}%',
+        ))
+    fig.update_layout(
+        barmode='stack',
+        title="Resultados por Torneo (%)",
+        yaxis_title="% de Partidos",
+    )
+    return fig
@@ -0,0 +1,43 @@
+import os
+import shutil
+
+import pytest
+
+from analytics.loading import build_bundle
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+# Filas de results.csv del corte inicial; el resto llega como filas agregadas al final
+FILAS_INICIALES = 45000
+
+
+def _lineas_results():
+    with open(os.path.join(DATA_DIR, 'results.csv'), 'rb') as f:
+        return f.readlines()
+
+
+@pytest.fixture(scope='session')
+def datos(tmp_path_factory):
+    """DataBundle de los CSV reales, con los snapshots en una carpeta temporal."""
+    return build_bundle(DATA_DIR, cache_dir=str(tmp_path_factory.mktemp('cache')))
+
+
+@pytest.fixture
+def datos_crecientes(tmp_path):
+    """Carpeta de datos con results.csv recortado y una función que le agrega las filas restantes.
+
+    Los demás CSV son los completos. Devuelve `(data_dir, completar)`.
+    """
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for archivo in ('goalscorers.csv', 'shootouts.csv', 'countries.csv'):
+        shutil.copy(os.path.join(DATA_DIR, archivo), data_dir / archivo)
+    lineas = _lineas_results()
+    ruta = data_dir / 'results.csv'
+    ruta.write_bytes(b''.join(lineas[:FILAS_INICIALES + 1]))
+
+    def completar():
+        with open(ruta, 'ab') as f:
+            f.writelines(lineas[FILAS_INICIALES + 1:])
+
+    return str(data_dir), completar
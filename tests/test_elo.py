@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from analytics import elo
+from analytics.loading import build_bundle
+
+
+def _comparar(obtenido, esperado):
+    np.testing.assert_allclose(obtenido.antes_local, esperado.antes_local)
+    np.testing.assert_allclose(obtenido.antes_visitante, esperado.antes_visitante)
+    np.testing.assert_allclose(obtenido.cambio, esperado.cambio)
+    pd.testing.assert_frame_equal(obtenido.por_año, esperado.por_año)
+    pd.testing.assert_series_equal(obtenido.actual, esperado.actual)
+
+
+def _espiar_compute_elo(monkeypatch):
+    """Reemplaza compute_elo por uno que anota el `previo` de cada llamada."""
+    previos = []
+    compute_elo = elo.compute_elo
+
+    def espia(results, previo=None):
+        previos.append(previo)
+        return compute_elo(results, previo)
+
+    monkeypatch.setattr(elo, 'compute_elo', espia)
+    return previos
+
+
+def test_continuar_desde_checkpoint_equivale_a_recalcular(datos_crecientes, monkeypatch):
+    data_dir, completar = datos_crecientes
+    build_bundle(data_dir)
+    completar()
+
+    previos = _espiar_compute_elo(monkeypatch)
+    datos = build_bundle(data_dir)
+    assert len(previos) == 1 and previos[0] is not None
+
+    _comparar(datos.elo, elo.compute_elo(datos.results))
+
+
+def test_checkpoint_completo_se_lee_sin_calcular(datos_crecientes, monkeypatch):
+    data_dir, _ = datos_crecientes
+    completo = build_bundle(data_dir).elo
+
+    previos = _espiar_compute_elo(monkeypatch)
+    datos = build_bundle(data_dir)
+    assert previos == []
+    _comparar(datos.elo, completo)
+
+
+def test_historia_cambiada_recalcula_todo(datos_crecientes, monkeypatch):
+    data_dir, _ = datos_crecientes
+    datos = build_bundle(data_dir)
+    results = datos.results.copy()
+    results.loc[0, 'home_score'] += 1
+
+    previos = _espiar_compute_elo(monkeypatch)
+    obtenido = elo.load_elo(results, cache_dir=f'{data_dir}/.cache')
+    assert previos == [None]
+    _comparar(obtenido, elo.compute_elo(results))
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from analytics.team_matches import VICTORIA
+from analytics.team_profile import top_rivals
+
+
+def _rivales_a_mano(team_matches, equipo, start_year, end_year):
+    """Los mismos totales que top_rivals, filtrando y agrupando la tabla larga."""
+    partidos = team_matches.of_team(equipo)
+    partidos = partidos[(partidos['year'] >= start_year) & (partidos['year'] <= end_year)]
+    por_rival = partidos.groupby(partidos['opponent'].astype(str)).agg(
+        total_matches=('match_id', 'size'),
+        victories=('result', lambda r: int((r == VICTORIA).sum())),
+        goals_favor=('goals_for', 'sum'),
+        goals_against=('goals_against', 'sum'),
+    )
+    return por_rival.rename_axis('rival').sort_index()
+
+
+@pytest.mark.parametrize('equipo, start_year, end_year', [
+    ('Brazil', 1800, 2100),
+    ('Brazil', 1990, 2010),
+    ('Andorra', 1800, 1990),
+    ('Scotland', 1872, 1872),
+    ('Ecuador', 2030, 2100),
+    ('Ecuador', 1700, 1800),
+])
+def test_top_rivals_coincide_con_filtrar_partidos(datos, equipo, start_year, end_year):
+    esperado = _rivales_a_mano(datos.team_matches, equipo, start_year, end_year)
+    obtenido = top_rivals(datos.team_matches, equipo, start_year, end_year, n=len(datos.teams))
+    obtenido = obtenido.assign(rival=obtenido['rival'].astype(str)).set_index('rival').sort_index()
+    pd.testing.assert_frame_equal(obtenido[esperado.columns], esperado, check_dtype=False)
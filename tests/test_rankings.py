@@ -0,0 +1,23 @@
+import pandas as pd
+import pytest
+
+from analytics.rankings import team_rankings
+from analytics.team_matches import VICTORIA
+
+
+@pytest.mark.parametrize('torneo', [None, 'FIFA World Cup qualification', 'Copa América'])
+def test_ranking_por_torneo_coincide_con_filtrar_partidos(datos, torneo):
+    tabla = datos.team_matches.table
+    if torneo is not None:
+        tabla = tabla[tabla['tournament'] == torneo]
+    local = tabla[tabla['is_home']]
+    esperado = pd.DataFrame({
+        'partidos_local': local.groupby('team', observed=False).size(),
+        'victorias_local': (local['result'] == VICTORIA).groupby(local['team'], observed=False).sum(),
+        'goles_favor_local': local.groupby('team', observed=False)['goals_for'].sum(),
+        'partidos_total': tabla.groupby('team', observed=False).size(),
+    }).rename_axis('equipo')
+    esperado.index = esperado.index.astype(object)
+
+    ranking = team_rankings(datos.team_matches, torneo)
+    pd.testing.assert_frame_equal(ranking[esperado.columns], esperado, check_dtype=False)
@@ -0,0 +1,66 @@
+import pandas as pd
+
+from analytics import snapshot
+from analytics.loading import DATASETS, _cargar_dataset
+
+
+def _cargar(data_dir, cache_dir, nombre='results'):
+    return _cargar_dataset(nombre, data_dir, cache_dir)
+
+
+def _espiar_colas(monkeypatch):
+    """Anota cada vez que load_snapshot parsea solo la cola de un CSV."""
+    colas = []
+    leer_cola = snapshot._leer_cola
+    monkeypatch.setattr(snapshot, '_leer_cola', lambda *args: colas.append(args) or leer_cola(*args))
+    return colas
+
+
+def test_agregar_filas_equivale_a_reconstruir(datos_crecientes, tmp_path, monkeypatch):
+    data_dir, completar = datos_crecientes
+    cache_dir = str(tmp_path / 'cache')
+    _cargar(data_dir, cache_dir)
+    completar()
+
+    colas = _espiar_colas(monkeypatch)
+    df, agregados = _cargar(data_dir, cache_dir)
+    assert len(colas) == 1
+
+    df_completo, agregados_completos = _cargar(data_dir, str(tmp_path / 'cache_completo'))
+    # Las categorías del snapshot crecido quedan en orden de aparición; build_bundle las unifica después
+    pd.testing.assert_frame_equal(df, df_completo, check_categorical=False)
+    assert agregados.keys() == agregados_completos.keys()
+    for nombre, tabla in agregados_completos.items():
+        pd.testing.assert_frame_equal(agregados[nombre].sort_index(), tabla.sort_index(), check_dtype=False)
+
+
+def test_snapshot_agregado_se_lee_sin_reparsear(datos_crecientes, tmp_path, monkeypatch):
+    data_dir, completar = datos_crecientes
+    cache_dir = str(tmp_path / 'cache')
+    _cargar(data_dir, cache_dir)
+    completar()
+    df, _ = _cargar(data_dir, cache_dir)
+
+    # Sin función para parsear: solo funciona si se lee el snapshot tal cual
+    archivo, _, agregar = DATASETS['results']
+    monkeypatch.setitem(DATASETS, 'results', (archivo, None, agregar))
+    releido, _ = _cargar(data_dir, cache_dir)
+    pd.testing.assert_frame_equal(releido, df)
+
+
+def test_agregar_filas_a_csv_sin_encabezado(datos_crecientes, tmp_path, monkeypatch):
+    data_dir, _ = datos_crecientes
+    ruta = tmp_path / 'data' / 'countries.csv'
+    lineas = ruta.read_bytes().splitlines(keepends=True)
+    ruta.write_bytes(b''.join(lineas[:-1]))
+    cache_dir = str(tmp_path / 'cache')
+    _cargar(data_dir, cache_dir, 'countries')
+    ruta.write_bytes(b''.join(lineas))
+
+    colas = _espiar_colas(monkeypatch)
+    df, _ = _cargar(data_dir, cache_dir, 'countries')
+    assert len(colas) == 1
+
+    df_completo, _ = _cargar(data_dir, str(tmp_path / 'cache_completo'), 'countries')
+    assert len(df) == len(lineas)
+    pd.testing.assert_frame_equal(df, df_completo, check_categorical=False)
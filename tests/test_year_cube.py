@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from analytics.loading import build_bundle
+from analytics.team_matches import VICTORIA
+from analytics.team_summary import team_summary
+
+
+def test_cubo_de_agregados_agregados_equivale_a_reconstruir(datos_crecientes, tmp_path):
+    data_dir, completar = datos_crecientes
+    build_bundle(data_dir)
+    completar()
+    cubo = build_bundle(data_dir).years
+    completo = build_bundle(data_dir, cache_dir=str(tmp_path / 'cache_completo')).years
+
+    assert cubo.primer_año == completo.primer_año
+    for campo in ('por_resultado', 'goles', 'goles_local', 'goles_visitante'):
+        np.testing.assert_array_equal(getattr(cubo, campo), getattr(completo, campo))
+    for metrica, acumulado in completo.por_equipo.items():
+        np.testing.assert_array_equal(cubo.por_equipo[metrica], acumulado)
+
+
+def test_resumen_por_equipo_coincide_con_filtrar_partidos(datos):
+    tabla = datos.team_matches.table
+    tabla = tabla[(tabla['year'] >= 1990) & (tabla['year'] <= 2010)]
+    por_equipo = tabla.groupby(tabla['team'].astype(str))
+    esperado = pd.DataFrame({
+        'partidos': por_equipo.size(),
+        'victorias': por_equipo['result'].agg(lambda r: int((r == VICTORIA).sum())),
+        'goles': por_equipo['goals_for'].sum(),
+        'goles_contra': por_equipo['goals_against'].sum(),
+    }).rename_axis('equipo')
+
+    obtenido = team_summary(datos.years, 1990, 2010)
+    pd.testing.assert_frame_equal(obtenido[esperado.columns], esperado, check_dtype=False)
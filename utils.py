@@ -1,4 +1,9 @@
 import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+# Muestras con más puntos que esto se dibujan con WebGL (Scattergl)
+PUNTOS_WEBGL = 300
 
 def show_general_metrics(df):
     # Métricas generales
@@ -35,4 +40,44 @@ def show_presentation():
     Python, Pandas, Streamlit, Numpy, Plotly, Github, Visual Studio Code
     ### 🫶🏻 Agradecimiento:
     Profe Andre, profe Cris, señor X, K-malogan, generación III de Análisis de Datos y Kruger IE
-    """)
\ No newline at end of file
+    """)
+
+def summary_box_figure(resumenes, colores, puntos=True, etiqueta="Goles"):
+    """Box plots armados con resúmenes calculados en el servidor (ver analytics.box_summary).
+
+    `resumenes` es un dict nombre -> resumen de box_summary o
+    box_summary_counts (None si no hay datos). Cada caja viaja como cuartiles y
+    bigotes precalculados, los atípicos agrupados por valor y, si `puntos`,
+    una muestra acotada de partidos a la izquierda de la caja; el tamaño de
+    la figura no depende de cuántos partidos tenga cada serie.
+    """
+    fig = go.Figure()
+    rng = np.random.default_rng(0)
+    nombres = list(resumenes)
+    for i, nombre in enumerate(nombres):
+        resumen = resumenes[nombre]
+        if resumen is None:
+            continue
+        color = colores[i % len(colores)]
+        fig.add_trace(go.Box(
+            x=[i], q1=[resumen['q1']], median=[resumen['mediana']], q3=[resumen['q3']],
+            lowerfence=[resumen['bigote_inf']], upperfence=[resumen['bigote_sup']],
+            name=nombre, legendgroup=nombre, marker_color=color, boxpoints=False,
+        ))
+        fig.add_trace(go.Scatter(
+            x=[i] * len(resumen['atipicos']), y=resumen['atipicos'], customdata=resumen['conteo_atipicos'],
+            mode='markers', marker=dict(color=color, symbol='circle-open'),
+            name=nombre, legendgroup=nombre, showlegend=False,
+            hovertemplate=f"{etiqueta}: %{{y}}<br>Partidos: %{{customdata}}<extra>{nombre}</extra>",
+        ))
+        if puntos:
+            muestra = resumen['muestra']
+            Puntos = go.Scattergl if len(muestra) > PUNTOS_WEBGL else go.Scatter
+            fig.add_trace(Puntos(
+                x=np.round(i - 0.45 + rng.uniform(-0.1, 0.1, len(muestra)), 3), y=muestra,
+                mode='markers', marker=dict(color=color, size=4, opacity=0.5),
+                name=nombre, legendgroup=nombre, showlegend=False,
+                hovertemplate=f"{etiqueta}: %{{y}}<extra>{nombre}</extra>",
+            ))
+    fig.update_xaxes(tickvals=list(range(len(nombres))), ticktext=nombres)
+    return fig